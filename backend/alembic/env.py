@@ -14,6 +14,7 @@ from app.db.base import Base
 from app.models.user import User, UserIntegration
 from app.models.task import Task
 from app.models.event import CalendarEvent
+from app.models.job import AIJob
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
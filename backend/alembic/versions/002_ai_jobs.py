@@ -0,0 +1,39 @@
+"""AI job queue table
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 12:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('ai_jobs',
+        sa.Column('id', sa.String(36), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('lane', sa.String(), nullable=False, server_default='free'),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False, server_default='queued'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='3'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('available_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_ai_jobs_claim', 'ai_jobs', ['status', 'lane', 'available_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ai_jobs_claim', table_name='ai_jobs')
+    op.drop_table('ai_jobs')
@@ -0,0 +1,41 @@
+"""Task listing indexes for keyset pagination
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+# SQLite compares DATETIME columns as text. CURRENT_TIMESTAMP (the old server
+# default) stores 'YYYY-MM-DD HH:MM:SS', which sorts before the equal
+# 'YYYY-MM-DD HH:MM:SS.ffffff' a keyset cursor binds, so pages would repeat.
+SQLITE_NORMALIZE_CREATED_AT = (
+    "UPDATE tasks SET created_at = STRFTIME('%Y-%m-%d %H:%M:%f', created_at) || '000' "
+    "WHERE LENGTH(created_at) = 19"
+)
+
+
+def upgrade() -> None:
+    # Rows written without a created_at would sort unpredictably in keyset pages
+    op.execute(sa.text("UPDATE tasks SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL"))
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute(sa.text(SQLITE_NORMALIZE_CREATED_AT))
+
+    op.create_index('idx_tasks_user_created', 'tasks', ['user_id', 'created_at', 'id'])
+    # Extend (user_id, status) so status-filtered pages are served in index order
+    op.drop_index('idx_tasks_status', table_name='tasks')
+    op.create_index('idx_tasks_status', 'tasks', ['user_id', 'status', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_tasks_status', table_name='tasks')
+    op.create_index('idx_tasks_status', 'tasks', ['user_id', 'status'])
+    op.drop_index('idx_tasks_user_created', table_name='tasks')
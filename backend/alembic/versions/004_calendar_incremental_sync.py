@@ -0,0 +1,35 @@
+"""Incremental calendar sync state
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('user_integrations', sa.Column('sync_token', sa.String(), nullable=True))
+    op.add_column('user_integrations', sa.Column('last_synced_at', sa.DateTime(timezone=True), nullable=True))
+
+    op.add_column('calendar_events', sa.Column('external_id', sa.String(), nullable=True))
+    op.create_index(
+        'uq_calendar_events_external', 'calendar_events',
+        ['user_id', 'source', 'external_id'], unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_calendar_events_external', table_name='calendar_events')
+    with op.batch_alter_table('calendar_events') as batch_op:
+        batch_op.drop_column('external_id')
+    with op.batch_alter_table('user_integrations') as batch_op:
+        batch_op.drop_column('last_synced_at')
+        batch_op.drop_column('sync_token')
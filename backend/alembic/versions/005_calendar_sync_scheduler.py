@@ -0,0 +1,33 @@
+"""Calendar sync scheduler state
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 20:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('user_integrations', sa.Column('next_sync_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column(
+        'user_integrations',
+        sa.Column('sync_failures', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.add_column('user_integrations', sa.Column('last_sync_error', sa.String(), nullable=True))
+    op.create_index('idx_integrations_next_sync', 'user_integrations', ['next_sync_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_integrations_next_sync', table_name='user_integrations')
+    with op.batch_alter_table('user_integrations') as batch_op:
+        batch_op.drop_column('last_sync_error')
+        batch_op.drop_column('sync_failures')
+        batch_op.drop_column('next_sync_at')
@@ -0,0 +1,26 @@
+"""AI job leases
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 23:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('ai_jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('ai_jobs', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('ai_jobs') as batch_op:
+        batch_op.drop_column('lease_expires_at')
+        batch_op.drop_column('heartbeat_at')
@@ -1,8 +1,3 @@
+from app.db.session import get_db
 
-from typing import Generator, AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import AsyncSessionLocal
-
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
-        yield session
+__all__ = ["get_db"]
@@ -1,12 +1,17 @@
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from app import crud, models, schemas
+from app import crud, schemas
 from app.api import deps
 from app.core import security
-from app.services.ai_pipeline.graph import process_task
+from app.core.config import settings
+from app.services.ai_pipeline.graph import process_task, scheduling_variant, stream_task
+from app.services.ai_pipeline.llm_factory import LLMUnavailableError
+from app.services.ai_pipeline.nodes.analyze import analyze_tasks
+from app.services.ai_pipeline.state import TaskAnalysisState
+from app.services.scheduling.freebusy import freebusy
 
 router = APIRouter()
 
@@ -21,6 +26,15 @@ class AIAnalysisResponse(BaseModel):
     suggested_tags: List[str]
     ai_reasoning: str
 
+class BatchAnalysisRequest(BaseModel):
+    """Request model for analyzing many tasks at once."""
+    task_ids: List[str] = Field(..., min_length=1, max_length=settings.AI_BATCH_MAX_TASKS)
+
+class BatchAnalysisResponse(BaseModel):
+    """Response model for batch task analysis."""
+    results: List[AIAnalysisResponse]
+    missing_task_ids: List[str] = []  # Not found or not owned by the caller
+
 class SchedulingRequest(BaseModel):
     """Request Model for AI scheduling."""
     task_id: str
@@ -38,15 +52,42 @@ class SchedulingResponse(BaseModel):
     task_id: str
     options: List[SchedulingOption]
 
+def _llm_unavailable(e: LLMUnavailableError) -> HTTPException:
+    """503 with a Retry-After matching the LLM pool's cool-down."""
+    return HTTPException(
+        status_code=503, detail=str(e), headers={"Retry-After": str(settings.LLM_RETRY_AFTER_SECONDS)}
+    )
+
+async def _save_analysis(db: AsyncSession, task: Any, result: dict) -> AIAnalysisResponse:
+    """Store the analysis on the task and build the endpoint's response from it."""
+    update_data = {
+        "estimated_duration_minutes": result.get("estimated_duration_minutes"),
+        "ai_reasoning": result.get("ai_reasoning")
+    }
+    # The response is built from `result`, so skip reading the row back
+    await crud.task.update(db=db, db_obj=task, obj_in=update_data, refresh=False)
+    
+    return AIAnalysisResponse(
+        task_id=str(task.id),
+        estimated_duration_minutes=result.get("estimated_duration_minutes", 30),
+        suggested_tags=result.get("suggested_tags", []),
+        ai_reasoning=result.get("ai_reasoning", "")
+    )
+
 @router.post("/analyze-task", response_model=AIAnalysisResponse)
 async def analyze_task_endpoint(
     *,
     db: AsyncSession = Depends(deps.get_db),
     request: AIAnalysisRequest,
-    current_user: models.User = Depends(security.get_current_user),
+    stream: bool = False,
+    current_user: security.Principal = Depends(security.get_current_principal),
 ) -> Any:
     """
     Analyze a task using AI to estimate duration and categorize.
+
+    With ``?stream=true`` the answer is a Server-Sent Events stream: one
+    ``token`` event per generated chunk as the model writes, then a
+    ``result`` event carrying the AIAnalysisResponse (or ``error``).
     """
     # Get task from database
     task = await crud.task.get(db=db, id=request.task_id)
@@ -67,21 +108,86 @@ async def analyze_task_endpoint(
         "deadline": task.deadline
     }
     
-    # Process through AI pipeline
-    result = await process_task(task_data)
-    
-    # Update task with AI results
-    update_data = {
-        "estimated_duration_minutes": result.get("estimated_duration_minutes"),
-        "ai_reasoning": result.get("ai_reasoning")
-    }
-    await crud.task.update(db=db, db_obj=task, obj_in=update_data)
+    if stream:
+        async def event_stream():
+            try:
+                # Scheduling options would be discarded, so only the analysis node runs
+                async for kind, data in stream_task(task_data, variant="analyze"):
+                    if kind == "token":
+                        yield format_sse({"event": "token", "task_id": task_data["task_id"], **data})
+                    else:
+                        response = await _save_analysis(db, task, data)
+                        yield format_sse({"event": "result", **response.model_dump()})
+            except Exception as e:
+                yield format_sse({"event": "error", "task_id": task_data["task_id"], "error": str(e)})
+
+        return StreamingResponse(
+            event_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
     
-    return AIAnalysisResponse(
-        task_id=str(task.id),
-        estimated_duration_minutes=result.get("estimated_duration_minutes", 30),
-        suggested_tags=result.get("suggested_tags", []),
-        ai_reasoning=result.get("ai_reasoning", "")
+    # Scheduling options would be discarded, so only the analysis node runs
+    try:
+        result = await process_task(task_data, variant="analyze")
+    except LLMUnavailableError as e:
+        raise _llm_unavailable(e)
+    return await _save_analysis(db, task, result)
+
+@router.post("/analyze-tasks", response_model=BatchAnalysisResponse)
+async def analyze_tasks_endpoint(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    request: BatchAnalysisRequest,
+    current_user: security.Principal = Depends(security.get_current_principal),
+) -> Any:
+    """
+    Analyze a batch of tasks (e.g. an imported backlog) in one request.
+    Tasks are loaded in one query, analyzed concurrently, and the results
+    written back with a single bulk UPDATE.
+    """
+    task_ids = list(dict.fromkeys(request.task_ids))
+    tasks = await crud.task.get_many_by_owner(db=db, ids=task_ids, user_id=current_user.id)
+    tasks_by_id = {str(task.id): task for task in tasks}
+    ordered = [tasks_by_id[task_id] for task_id in task_ids if task_id in tasks_by_id]
+
+    states = [
+        TaskAnalysisState(
+            task_id=str(task.id),
+            user_id=str(task.user_id),
+            title=task.title,
+            description=task.description,
+            context_notes=task.context_notes,
+            priority=task.priority or "medium",
+            deadline=task.deadline and task.deadline.isoformat(),
+        )
+        for task in ordered
+    ]
+    try:
+        analyses = await analyze_tasks(states)
+    except LLMUnavailableError as e:
+        raise _llm_unavailable(e)
+
+    await crud.task.update_analysis_many(db=db, rows=[
+        {
+            "id": task.id,
+            "estimated_duration_minutes": analysis.get("estimated_duration_minutes"),
+            "ai_reasoning": analysis.get("ai_reasoning"),
+        }
+        for task, analysis in zip(ordered, analyses)
+    ])
+
+    return BatchAnalysisResponse(
+        results=[
+            AIAnalysisResponse(
+                task_id=str(task.id),
+                estimated_duration_minutes=analysis.get("estimated_duration_minutes", 30),
+                suggested_tags=analysis.get("suggested_tags", []),
+                ai_reasoning=analysis.get("ai_reasoning", ""),
+            )
+            for task, analysis in zip(ordered, analyses)
+        ],
+        missing_task_ids=[task_id for task_id in task_ids if task_id not in tasks_by_id],
     )
 
 @router.post("/schedule", response_model=SchedulingResponse)
@@ -89,7 +195,7 @@ async def schedule_task_endpoint(
     *,
     db: AsyncSession = Depends(deps.get_db),
     request: SchedulingRequest,
-    current_user: models.User = Depends(security.get_current_user),
+    current_user: security.Principal = Depends(security.get_current_principal),
 ) -> Any:
     """
     Get AI-generated scheduling options for a task.
@@ -102,9 +208,8 @@ async def schedule_task_endpoint(
     if str(task.user_id) != str(current_user.id):
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Get user's calendar events
-    # TODO: Fetch from calendar_events table
-    calendar_events = []
+    # Get user's busy time from the calendar_events free/busy index
+    calendar_events = await freebusy.get_busy_events(db, str(task.user_id), task.deadline)
     
     # Prepare task data
     task_data = {
@@ -114,15 +219,24 @@ async def schedule_task_endpoint(
         "description": task.description,
         "context_notes": task.context_notes,
         "priority": task.priority or "medium",
-        "estimated_duration_minutes": task.estimated_duration_minutes or 30,
+        "estimated_duration_minutes": task.estimated_duration_minutes,
         "deadline": task.deadline,
         "calendar_events": calendar_events
     }
     
-    # Process through AI pipeline
-    result = await process_task(task_data)
+    # A stored analysis is reused; otherwise analyze first and keep the result
+    variant = scheduling_variant(task_data)
+    try:
+        result = await process_task(task_data, variant=variant)
+    except LLMUnavailableError as e:
+        raise _llm_unavailable(e)
+    if variant == "full":
+        update_data = {
+            "estimated_duration_minutes": result.get("estimated_duration_minutes"),
+            "ai_reasoning": result.get("ai_reasoning")
+        }
+        await crud.task.update(db=db, db_obj=task, obj_in=update_data, refresh=False)
     
-    # Return scheduling options
     # Return scheduling options
     options = result.get("scheduling_options", [])
     
@@ -134,11 +248,20 @@ async def schedule_task_endpoint(
 # --- Async / HITL Endpoints ---
 
 import uuid
-from fastapi import BackgroundTasks
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from app.services.ai_pipeline.checkpointer import current_checkpointer
 from app.services.ai_pipeline.graph import get_hitl_app
+from app.services.ai_pipeline.retention import checkpoint_retention
+from app.services.ai_pipeline.events import TERMINAL_EVENTS, event_broker, format_sse, make_event
+from app.services.job_queue.backends import Job
+from app.services.job_queue.queue import QueueFullError, ai_job_queue
 
 class StartWorkflowResponse(BaseModel):
     thread_id: str
+    job_id: Optional[str] = None
+    lane: Optional[str] = None
+    queue_position: int = 0  # Jobs ahead of this one in its lane
 
 class WorkflowStatusResponse(BaseModel):
     thread_id: str
@@ -149,17 +272,84 @@ class WorkflowStatusResponse(BaseModel):
 class ResumeWorkflowRequest(BaseModel):
     selected_option_id: str
 
-async def run_pipeline_background(initial_state: dict, thread_id: str):
+def _option_to_dict(opt: Any) -> dict:
+    # state might hold dicts or models depending on how langgraph stored it
+    if isinstance(opt, dict):
+        return opt
+    if hasattr(opt, 'model_dump'):
+        return opt.model_dump()
+    return opt.dict()
+
+def snapshot_status(snapshot: Any) -> Tuple[str, List[dict]]:
+    """Derive workflow status and scheduling options from a checkpoint snapshot."""
+    if not snapshot.next:
+        status = "completed"
+    elif "human_review" in snapshot.next:
+        status = "waiting_input"
+    else:
+        status = "processing"
+    options = [_option_to_dict(opt) for opt in snapshot.values.get("scheduling_options", []) or []]
+    return status, options
+
+async def _run_and_publish(
+    graph_input: Optional[dict], thread_id: str, user_id: str, final_attempt: bool = True
+):
+    """
+    Run the HITL graph, publishing node-level progress to event subscribers.
+    Errors are re-raised so the job queue can retry; subscribers only see
+    "error" once no retries are left.
+    """
     app = await get_hitl_app()
     config = {"configurable": {"thread_id": thread_id}}
-    await app.ainvoke(initial_state, config)
+    try:
+        async for task_event in app.astream(graph_input, config, stream_mode="tasks"):
+            if "result" in task_event:
+                await event_broker.publish(thread_id, make_event(
+                    thread_id, user_id, "node_finished",
+                    node=task_event["name"], error=task_event.get("error") and str(task_event["error"]),
+                ))
+            else:
+                await event_broker.publish(thread_id, make_event(
+                    thread_id, user_id, "node_started", node=task_event["name"],
+                ))
+
+        snapshot = await app.aget_state(config)
+        status, options = snapshot_status(snapshot)
+        await event_broker.publish(thread_id, make_event(
+            thread_id, user_id, status,
+            options=options, execution_result=snapshot.values.get("execution_result"),
+        ))
+    except Exception as e:
+        print(f"Workflow {thread_id} failed: {e}")
+        event = "error" if final_attempt else "retrying"
+        await event_broker.publish(thread_id, make_event(thread_id, user_id, event, error=str(e)))
+        raise
 
-async def run_resume_background(thread_id: str, selected_option_id: str):
+async def run_pipeline_background(initial_state: dict, thread_id: str, final_attempt: bool = True):
+    await _run_and_publish(initial_state, thread_id, initial_state.get("user_id"), final_attempt)
+
+async def run_resume_background(
+    thread_id: str, selected_option_id: str, user_id: Optional[str] = None, final_attempt: bool = True
+):
     app = await get_hitl_app()
     config = {"configurable": {"thread_id": thread_id}}
     # Resume by proceeding (update state explicitly, then resume)
     await app.aupdate_state(config, {"selected_option_id": selected_option_id})
-    await app.ainvoke(None, config)
+    await _run_and_publish(None, thread_id, user_id, final_attempt)
+
+async def _run_job(job: Job):
+    await run_pipeline_background(
+        job.payload["initial_state"], job.payload["thread_id"], job.is_last_attempt
+    )
+
+async def _resume_job(job: Job):
+    await run_resume_background(
+        job.payload["thread_id"], job.payload["selected_option_id"],
+        job.payload.get("user_id"), job.is_last_attempt,
+    )
+
+ai_job_queue.register("run", _run_job)
+ai_job_queue.register("resume", _resume_job)
 
 class AIStartRequest(BaseModel):
     """Request model for starting AI workflow."""
@@ -173,10 +363,12 @@ async def start_workflow(
     *,
     db: AsyncSession = Depends(deps.get_db),
     request: AIStartRequest,
-    current_user: models.User = Depends(security.get_current_user),
-    background_tasks: BackgroundTasks,
+    current_user: security.Principal = Depends(security.get_current_principal),
 ) -> Any:
-    """Start async AI workflow. Creates task if not provided."""
+    """
+    Start async AI workflow. Creates task if not provided.
+    Returns immediately with the queued job's lane and position.
+    """
     
     task = None
     
@@ -214,18 +406,47 @@ async def start_workflow(
         "context_notes": task.context_notes,
         "priority": task.priority or "medium",
         "deadline": task.deadline and task.deadline.isoformat(),
-        "calendar_events": [] # TODO: Fetch real events
+        "calendar_events": await freebusy.get_busy_events(db, str(task.user_id), task.deadline)
     }
     
     thread_id = str(uuid.uuid4())
-    background_tasks.add_task(run_pipeline_background, initial_state, thread_id)
-    
-    return {"thread_id": thread_id}
+    try:
+        job = await ai_job_queue.enqueue(
+            "run",
+            {"initial_state": initial_state, "thread_id": thread_id},
+            tier=current_user.subscription_tier,
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+    return {
+        "thread_id": thread_id,
+        "job_id": job.id,
+        "lane": job.lane,
+        "queue_position": await ai_job_queue.position(job),
+    }
+
+@router.get("/queue/stats")
+async def get_queue_stats(
+    current_user: security.Principal = Depends(security.get_current_principal),
+) -> Any:
+    """Per-lane backlog, throughput and latency for the AI job queue."""
+    return await ai_job_queue.stats()
+
+@router.get("/checkpoints/stats")
+async def get_checkpoint_stats(
+    current_user: security.Principal = Depends(security.get_current_principal),
+) -> Any:
+    """Checkpoint store size and cumulative retention/compaction results."""
+    return {
+        "storage": await checkpoint_retention.describe(current_checkpointer()),
+        "retention": checkpoint_retention.stats,
+    }
 
 @router.get("/{thread_id}/status", response_model=WorkflowStatusResponse)
 async def get_workflow_status(
     thread_id: str,
-    current_user: models.User = Depends(security.get_current_user),
+    current_user: security.Principal = Depends(security.get_current_principal),
 ) -> Any:
     """Get status of async workflow."""
     try:
@@ -241,33 +462,9 @@ async def get_workflow_status(
         if state_data.get('user_id') != str(current_user.id):
             raise HTTPException(status_code=403, detail="Not authorized")
             
-        next_step = state_snapshot.next
-        status = "processing"
-        
-        if not next_step:
-            status = "completed"
-        elif "human_review" in next_step:
-            status = "waiting_input"
-        
-        options_data = state_data.get("scheduling_options", [])
+        status, options_data = snapshot_status(state_snapshot)
         # Ensure compatibility with Pydantic list of models
-        options = []
-        if options_data:
-             # state might hold dicts or models depending on how langgraph stored it
-             for opt in options_data:
-                 if hasattr(opt, 'dict'):
-                     options.append(SchedulingOption(**opt.dict()))
-                 elif isinstance(opt, dict):
-                     options.append(SchedulingOption(**opt))
-                 else:
-                     # Pydantic model directly
-                     options.append(SchedulingOption(
-                         option_number=opt.option_number,
-                         start_time=opt.start_time,
-                         end_time=opt.end_time,
-                         reasoning=opt.reasoning,
-                         impact=opt.impact
-                     ))
+        options = [SchedulingOption(**opt) for opt in options_data]
 
         return {
             "thread_id": thread_id,
@@ -283,8 +480,7 @@ async def resume_workflow_endpoint(
     *,
     thread_id: str,
     request: ResumeWorkflowRequest,
-    background_tasks: BackgroundTasks,
-    current_user: models.User = Depends(security.get_current_user),
+    current_user: security.Principal = Depends(security.get_current_principal),
 ) -> Any:
     """Resume workflow with user selection."""
     # Verify auth
@@ -297,7 +493,72 @@ async def resume_workflow_endpoint(
         if state_snapshot.values.get('user_id') != str(current_user.id):
              raise HTTPException(status_code=403, detail="Not authorized")
              
-        background_tasks.add_task(run_resume_background, thread_id, request.selected_option_id)
-        return {"status": "resumed"}
+        job = await ai_job_queue.enqueue(
+            "resume",
+            {
+                "thread_id": thread_id,
+                "selected_option_id": request.selected_option_id,
+                "user_id": str(current_user.id),
+            },
+            tier=current_user.subscription_tier,
+        )
+        return {"status": "resumed", "job_id": job.id}
+    except HTTPException:
+        raise
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{thread_id}/events")
+async def stream_workflow_events(
+    thread_id: str,
+    request: Request,
+    user_id: str = Depends(security.get_current_user_id),
+) -> Any:
+    """
+    Server-Sent Events stream of workflow progress (replaces status polling).
+
+    Sends the current checkpoint status first, then node-level transitions
+    as the background runner publishes them. Closes on completed/error.
+    """
+    # Token-only auth: no DB session is held open for the life of the stream
+    # Subscribe before reading the checkpoint so no transition is missed
+    subscription = await event_broker.subscribe(thread_id)
+
+    app = await get_hitl_app()
+    state_snapshot = await app.aget_state({"configurable": {"thread_id": thread_id}})
+    owner = state_snapshot.values.get('user_id') if state_snapshot else None
+    if owner is not None and owner != user_id:
+        await subscription.close()
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    initial = None
+    if owner is not None:
+        status, options = snapshot_status(state_snapshot)
+        initial = make_event(thread_id, user_id, status, options=options)
+
+    async def event_stream():
+        try:
+            if initial is not None:
+                yield format_sse(initial)
+                if initial["event"] in TERMINAL_EVENTS:
+                    return
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=settings.AI_EVENTS_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event.get("user_id") not in (None, user_id):
+                    return
+                yield format_sse(event)
+                if event["event"] in TERMINAL_EVENTS:
+                    return
+        finally:
+            await subscription.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app import crud
 from app.api.deps import get_db
 from app.core.security import create_access_token
 from app.models.user import User
@@ -24,10 +25,7 @@ async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
     
     if not user:
         # Create user on first login (MVP) - only use fields that exist in User model
-        user = User(email=request.email)
-        db.add(user)
-        await db.commit()
-        await db.refresh(user)
+        user = await crud.user.create(db=db, obj_in={"email": request.email})
     
     token = create_access_token(subject=str(user.id))
     return LoginResponse(access_token=token)
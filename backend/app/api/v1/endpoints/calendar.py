@@ -1,12 +1,98 @@
+from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Any
+from typing import List, Any, Optional
+from pydantic import BaseModel
+from app import models
 from app.api import deps
+from app.core import security
 from app.models.task import Task
 from app.schemas.task import Task as TaskSchema
+from app.services.calendar_sync.scheduler import calendar_sync_scheduler
+from app.services.calendar_sync.sync import SYNC_PROVIDERS, sync_calendar
+from app.services.calendar_sync.tokens import oauth_tokens
+from app.services.scheduling.freebusy import freebusy
+from app.services.scheduling.slot_finder import to_datetime
 
 router = APIRouter()
 
+class TimeInterval(BaseModel):
+    start: datetime
+    end: datetime
+
+class FreeBusyResponse(BaseModel):
+    """Busy and free intervals (UTC) for the requested window."""
+    start: datetime
+    end: datetime
+    busy: List[TimeInterval]
+    free: List[TimeInterval]
+
+class CalendarSyncRequest(BaseModel):
+    provider: str
+
+class CalendarSyncResponse(BaseModel):
+    status: str
+    events_synced: int = 0
+    events_deleted: int = 0
+
+@router.post("/sync", response_model=CalendarSyncResponse)
+async def sync_calendar_endpoint(
+    request: CalendarSyncRequest,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: security.Principal = Depends(security.get_current_principal),
+) -> Any:
+    """
+    Pull changes from a connected calendar into calendar_events.
+    Scheduling reads those rows, never the provider, on the request path.
+    """
+    if request.provider not in SYNC_PROVIDERS:
+        raise HTTPException(status_code=400, detail=f"Unsupported provider: {request.provider}")
+
+    integration = await db.get(models.UserIntegration, (str(current_user.id), request.provider))
+    if integration is None:
+        return CalendarSyncResponse(status="not_connected")
+    return await sync_calendar(db, integration)
+
+class CalendarSyncStatus(BaseModel):
+    provider: str
+    last_synced_at: Optional[datetime] = None
+    next_sync_at: Optional[datetime] = None
+    lag_seconds: Optional[float] = None  # Age of the local copy
+    sync_failures: int = 0
+    last_sync_error: Optional[str] = None
+
+@router.get("/sync/status", response_model=List[CalendarSyncStatus])
+async def get_sync_status(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: security.Principal = Depends(security.get_current_principal),
+) -> Any:
+    """Background sync state of each of the current user's connected calendars."""
+    from sqlalchemy import select
+
+    result = await db.execute(
+        select(models.UserIntegration).where(models.UserIntegration.user_id == str(current_user.id))
+    )
+    now = datetime.utcnow()
+    return [
+        CalendarSyncStatus(
+            provider=integration.provider,
+            last_synced_at=integration.last_synced_at,
+            next_sync_at=integration.next_sync_at,
+            lag_seconds=(now - to_datetime(integration.last_synced_at)).total_seconds()
+            if integration.last_synced_at else None,
+            sync_failures=integration.sync_failures or 0,
+            last_sync_error=integration.last_sync_error,
+        )
+        for integration in result.scalars().all()
+    ]
+
+@router.get("/sync/stats")
+async def get_sync_stats(
+    current_user: security.Principal = Depends(security.get_current_principal),
+) -> Any:
+    """Lag, per-provider results and circuit state of this process's sync scheduler."""
+    return {**calendar_sync_scheduler.stats(), "tokens": oauth_tokens.stats()}
+
 @router.get("/events", response_model=List[Any])
 async def get_calendar_events(
     db: AsyncSession = Depends(deps.get_db),
@@ -35,3 +121,26 @@ async def get_calendar_events(
         })
         
     return events
+
+@router.get("/freebusy", response_model=FreeBusyResponse)
+async def get_free_busy(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: security.Principal = Depends(security.get_current_principal),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Any:
+    """
+    Free/busy view of the current user's calendar_events (default: next 7 days).
+    """
+    start = to_datetime(start) or datetime.utcnow()
+    end = to_datetime(end) or start + timedelta(days=7)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+
+    index = await freebusy.get_index(db, str(current_user.id), start, end)
+    return FreeBusyResponse(
+        start=start,
+        end=end,
+        busy=[TimeInterval(start=s, end=e) for s, e in index.busy_between(start, end)],
+        free=[TimeInterval(start=s, end=e) for s, e in index.free_between(start, end)],
+    )
@@ -1,8 +1,9 @@
 
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app import crud, models, schemas
+from app import crud, schemas
 from app.api import deps
 from app.core import security
 
@@ -10,16 +11,37 @@ router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Task])
 async def read_tasks(
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: models.User = Depends(security.get_current_user),
-    skip: int = 0,
-    limit: int = 100,
+    current_user: security.Principal = Depends(security.get_current_principal),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    deadline_from: Optional[datetime] = None,
+    deadline_to: Optional[datetime] = None,
 ) -> Any:
     """
-    Retrieve tasks for current user.
+    Retrieve tasks for current user, newest first.
+
+    Pass the X-Next-Cursor response header back as ``cursor`` to get the
+    next page; the header is absent on the last page.
     """
-    # TODO: Filter tasks by user_id in CRUD
-    tasks = await crud.task.get_multi(db, skip=skip, limit=limit)
+    try:
+        tasks, next_cursor = await crud.task.list_for_user(
+            db,
+            user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            priority=priority,
+            deadline_from=deadline_from,
+            deadline_to=deadline_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return tasks
 
 @router.post("/", response_model=schemas.Task)
@@ -27,7 +49,7 @@ async def create_task(
     *,
     db: AsyncSession = Depends(deps.get_db),
     task_in: schemas.TaskCreate,
-    current_user: models.User = Depends(security.get_current_user),
+    current_user: security.Principal = Depends(security.get_current_principal),
 ) -> Any:
     """
     Create new task for current user.
@@ -39,6 +61,65 @@ async def create_task(
     task = await crud.task.create(db=db, obj_in=task_data)
     return task
 
+# Bulk routes are declared before /{task_id} so "bulk" isn't taken for an id
+@router.post("/bulk", response_model=List[schemas.Task])
+async def create_tasks_bulk(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    bulk_in: schemas.TaskBulkCreate,
+    current_user: security.Principal = Depends(security.get_current_principal),
+) -> Any:
+    """
+    Create many tasks for current user in one transaction (multi-row INSERT).
+    """
+    rows = [{**task_in.dict(), "user_id": current_user.id} for task_in in bulk_in.tasks]
+    return await crud.task.create_many(db=db, objs_in=rows)
+
+@router.patch("/bulk", response_model=schemas.TaskBulkResult)
+async def update_tasks_bulk(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    bulk_in: schemas.TaskBulkUpdate,
+    current_user: security.Principal = Depends(security.get_current_principal),
+) -> Any:
+    """
+    Partially update many of the current user's tasks in one transaction.
+    Only fields set on each item are written.
+    """
+    task_ids = list(dict.fromkeys(item.id for item in bulk_in.tasks))
+    tasks = await crud.task.get_many_by_owner(db=db, ids=task_ids, user_id=current_user.id)
+    tasks_by_id = {str(task.id): task for task in tasks}
+
+    rows = []
+    for item in bulk_in.tasks:
+        changes = item.dict(exclude_unset=True, exclude={"id"})
+        if item.id in tasks_by_id and changes:
+            rows.append({"id": item.id, **changes})
+    await crud.task.update_many(db=db, rows=rows)
+
+    return schemas.TaskBulkResult(
+        tasks=[tasks_by_id[task_id] for task_id in task_ids if task_id in tasks_by_id],
+        missing_task_ids=[task_id for task_id in task_ids if task_id not in tasks_by_id],
+    )
+
+@router.delete("/bulk", response_model=schemas.TaskBulkResult)
+async def delete_tasks_bulk(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    bulk_in: schemas.TaskBulkDelete,
+    current_user: security.Principal = Depends(security.get_current_principal),
+) -> Any:
+    """
+    Delete many of the current user's tasks with a single DELETE.
+    """
+    task_ids = list(dict.fromkeys(bulk_in.task_ids))
+    deleted = await crud.task.remove_many(db=db, ids=task_ids, user_id=current_user.id)
+    deleted_by_id = {str(task.id): task for task in deleted}
+    return schemas.TaskBulkResult(
+        tasks=[deleted_by_id[task_id] for task_id in task_ids if task_id in deleted_by_id],
+        missing_task_ids=[task_id for task_id in task_ids if task_id not in deleted_by_id],
+    )
+
 @router.get("/{task_id}", response_model=schemas.Task)
 async def read_task(
     *,
@@ -59,7 +140,7 @@ async def update_task(
     db: AsyncSession = Depends(deps.get_db),
     task_id: str,
     task_in: schemas.TaskUpdate,
-    current_user: models.User = Depends(security.get_current_user),
+    current_user: security.Principal = Depends(security.get_current_principal),
 ) -> Any:
     """
     Update a task.
@@ -77,7 +158,7 @@ async def delete_task(
     *,
     db: AsyncSession = Depends(deps.get_db),
     task_id: str,
-    current_user: models.User = Depends(security.get_current_user),
+    current_user: security.Principal = Depends(security.get_current_principal),
 ) -> Any:
     """
     Delete a task.
@@ -0,0 +1,152 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+class LRUTier:
+    """In-process LRU with per-entry TTL and a max entry count."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.evictions += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class RedisTier:
+    """
+    Shared Redis tier. Entries expire via Redis TTL; size-based eviction is
+    left to the server's maxmemory policy. Errors are logged and treated as misses.
+    """
+
+    def __init__(self, url: str, ttl_seconds: int, namespace: str):
+        self.url = url
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            import redis.asyncio as redis
+            self._client = redis.from_url(self.url)
+        return self._client
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self._get_client().get(f"{self.namespace}:{key}")
+        except Exception as e:
+            print(f"Redis cache get failed: {e}")
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any) -> None:
+        try:
+            await self._get_client().set(
+                f"{self.namespace}:{key}", json.dumps(value), ex=self.ttl_seconds
+            )
+        except Exception as e:
+            print(f"Redis cache set failed: {e}")
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self._get_client().delete(f"{self.namespace}:{key}")
+        except Exception as e:
+            print(f"Redis cache delete failed: {e}")
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+class ResponseCache:
+    """Two-tier (LRU, then optional Redis) cache of JSON-serializable values."""
+
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int = 1024,
+        ttl_seconds: int = 3600,
+        redis_url: Optional[str] = None,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.local = LRUTier(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.remote = RedisTier(redis_url, ttl_seconds, namespace) if redis_url else None
+        self.hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        value = self.local.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        if self.remote is not None:
+            value = await self.remote.get(key)
+            if value is not None:
+                self.hits += 1
+                self.remote_hits += 1
+                self.local.set(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        self.local.set(key, value)
+        if self.remote is not None:
+            await self.remote.set(key, value)
+
+    async def delete(self, key: str) -> None:
+        self.local.delete(key)
+        if self.remote is not None:
+            await self.remote.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "remote_hits": self.remote_hits,
+            "misses": self.misses,
+            "entries": len(self.local),
+            "evictions": self.local.evictions,
+        }
+
+    def clear(self) -> None:
+        self.local.clear()
+        self.hits = self.remote_hits = self.misses = 0
+        self.local.evictions = 0
+
+    async def aclose(self) -> None:
+        if self.remote is not None:
+            await self.remote.aclose()
@@ -1,4 +1,5 @@
 
+from typing import Dict, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -6,6 +7,112 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     DATABASE_URL: str = "sqlite+aiosqlite:///./app.db"
     SECRET_KEY: str = "dev-secret-key"
+    JWT_KEYS: Dict[str, str] = {}  # kid -> signing secret, for rotation; SECRET_KEY verifies tokens without a kid
+    JWT_ACTIVE_KID: Optional[str] = None  # kid that signs new tokens; None signs with SECRET_KEY
+    JWT_CACHE_ENABLED: bool = True  # Verify each token's signature once per worker
+    JWT_CACHE_MAX_ENTRIES: int = 10000
+    JWT_CACHE_MAX_TTL_SECONDS: int = 3600  # Cap for tokens without exp; others expire with the token
+    REDIS_URL: Optional[str] = None
+
+    # Authenticated-user cache (in-process LRU + optional Redis via REDIS_URL)
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_CACHE_TTL_SECONDS: int = 60  # Bounds staleness from writes made by other workers
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    TASKS_BULK_MAX_ITEMS: int = 1000  # Largest /tasks/bulk request
+
+    # Database engine (see app/db/session.py)
+    DB_ECHO: bool = False  # Logs every SQL statement; development only
+    DB_POOL_SIZE: int = 10  # Persistent connections per process
+    DB_MAX_OVERFLOW: int = 20  # Extra connections allowed under burst load
+    DB_POOL_TIMEOUT_SECONDS: float = 30  # Wait for a free connection before erroring
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Reconnect before server/proxy idle timeouts
+    DB_POOL_PRE_PING: bool = True  # Detect dropped connections on checkout
+    DB_STATEMENT_CACHE_SIZE: int = 500  # asyncpg prepared statements per connection; 0 behind pgbouncer
+    DB_SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    DB_SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # LLM (Ollama)
+    OLLAMA_BASE_URL: str = "http://localhost:11434"
+    OLLAMA_MODEL: str = "deepseek-r1:7b"
+    OLLAMA_KEEP_ALIVE: str = "30m"  # How long Ollama keeps the model loaded between calls
+    LLM_RETRY_AFTER_SECONDS: int = 30  # Cool-down before retrying an unhealthy client
+    LLM_TIMEOUT_SECONDS: float = 120  # Per-call generation timeout
+    LLM_MAX_CONCURRENCY: int = 4  # Max in-flight LLM calls per worker
+    LLM_STREAMING_ENABLED: bool = True  # Stream node generations and stop once their JSON answer is complete
+    LLM_BATCH_ANALYSIS_SIZE: int = 5  # Tasks per multi-task analysis prompt; 1 if the model can't follow it
+    AI_BATCH_MAX_TASKS: int = 500  # Largest /ai/analyze-tasks request
+
+    # Task analysis response cache (in-process LRU + optional Redis via REDIS_URL)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+
+    # Workflow progress events: "memory" (single worker) or "redis" (multi-worker)
+    AI_EVENTS_BACKEND: str = "memory"
+    AI_EVENTS_HEARTBEAT_SECONDS: float = 15
+
+    # LangGraph checkpoints: "auto" picks postgres when DATABASE_URL is Postgres, else sqlite
+    CHECKPOINT_BACKEND: str = "auto"  # "auto" | "sqlite" | "postgres" | "memory"
+    CHECKPOINT_SQLITE_PATH: str = "ai_checkpoints.db"
+    CHECKPOINT_POSTGRES_URL: Optional[str] = None  # Defaults to DATABASE_URL
+    CHECKPOINT_POOL_SIZE: int = 4  # SQLite reader connections / Postgres max pool size
+    CHECKPOINT_BUSY_TIMEOUT_MS: int = 5000  # SQLite wait on a locked database
+    CHECKPOINT_RETENTION_ENABLED: bool = True  # Runs alongside the AI queue workers; SQLite checkpointer only
+    CHECKPOINT_RETENTION_DAYS: float = 30  # Threads idle longer than this are deleted
+    CHECKPOINT_RETENTION_INTERVAL_SECONDS: float = 600  # Pause between sweeps
+    CHECKPOINT_RETENTION_BATCH_SIZE: int = 200  # Threads per short write transaction
+
+    # AI job queue (replaces in-request BackgroundTasks)
+    AI_QUEUE_BACKEND: str = "database"  # "database" (durable ai_jobs table) or "memory"
+    AI_QUEUE_RUN_WORKERS: bool = True  # False when a separate `python -m app.services.job_queue.worker` runs them
+    AI_QUEUE_WORKERS: int = 2  # Max in-flight pipeline runs per process
+    AI_QUEUE_MAX_PENDING: int = 1000  # /ai/start returns 429 beyond this backlog
+    AI_QUEUE_MAX_ATTEMPTS: int = 3
+    AI_QUEUE_RETRY_BACKOFF_SECONDS: float = 5  # Doubled on each retry
+    AI_QUEUE_POLL_SECONDS: float = 1
+    AI_QUEUE_LEASE_SECONDS: float = 60  # A running job whose worker stops heartbeating is re-queued after this
+    AI_QUEUE_LANE_WEIGHTS: Dict[str, int] = {"pro": 3, "free": 1}  # Keyed by User.subscription_tier
+
+    # Scheduling
+    SCHEDULING_WORK_START_HOUR: int = 9
+    SCHEDULING_WORK_END_HOUR: int = 18
+    SCHEDULING_HORIZON_DAYS: int = 14  # Search window when a task has no deadline
+    SCHEDULING_MAX_OPTIONS: int = 3
+    FREEBUSY_CACHE_TTL_SECONDS: int = 300
+    FREEBUSY_CACHE_MAX_USERS: int = 10000
+
+    # Calendar sync
+    GOOGLE_CLIENT_ID: Optional[str] = None  # Needed to refresh Google access tokens
+    GOOGLE_CLIENT_SECRET: Optional[str] = None
+    CALENDAR_SYNC_LOOKBACK_DAYS: int = 30  # How far back a full sync starts
+    CALENDAR_SYNC_HORIZON_DAYS: int = 365  # How far ahead a windowed (Microsoft) sync tracks
+    GOOGLE_CALENDAR_API_URL: str = "https://www.googleapis.com/calendar/v3"
+    GOOGLE_CALENDAR_BATCH_URL: str = "https://www.googleapis.com/batch/calendar/v3"
+    GOOGLE_CALENDAR_BATCH_SIZE: int = 50  # Google's limit per batch request
+    GOOGLE_TOKEN_URL: str = "https://oauth2.googleapis.com/token"
+    MICROSOFT_GRAPH_API_URL: str = "https://graph.microsoft.com/v1.0"
+    MICROSOFT_GRAPH_PAGE_SIZE: int = 100  # Prefer: odata.maxpagesize on event listings
+    MICROSOFT_GRAPH_BATCH_SIZE: int = 20  # Graph's limit per $batch request
+    MICROSOFT_CLIENT_ID: Optional[str] = None  # Needed to refresh Microsoft access tokens
+    MICROSOFT_CLIENT_SECRET: Optional[str] = None
+    MICROSOFT_TOKEN_URL: str = "https://login.microsoftonline.com/common/oauth2/v2.0/token"
+    MICROSOFT_GRAPH_SCOPES: str = "offline_access Calendars.ReadWrite"
+    OAUTH_TOKEN_REFRESH_MARGIN_SECONDS: float = 300  # Refresh access tokens this long before they expire
+    CALENDAR_SYNC_RUN_SCHEDULER: bool = False  # True to sync in the API process; else run `python -m app.services.calendar_sync.worker`
+    CALENDAR_SYNC_INTERVAL_SECONDS: float = 900  # Each integration is synced about this often
+    CALENDAR_SYNC_JITTER_SECONDS: float = 60  # Random spread added to every next slot
+    CALENDAR_SYNC_MAX_CONCURRENCY: int = 50  # In-flight syncs per scheduler process
+    CALENDAR_SYNC_RATE_LIMITS: Dict[str, float] = {"google": 10, "microsoft": 5}  # Syncs/second per provider
+    CALENDAR_SYNC_TIMEOUT_SECONDS: float = 60
+    CALENDAR_SYNC_RETRY_BACKOFF_SECONDS: float = 60  # Doubled on each consecutive failure
+    CALENDAR_SYNC_MAX_BACKOFF_SECONDS: float = 3600  # Cap on the retry delay after repeated failures
+    CALENDAR_SYNC_BREAKER_FAILURES: int = 5  # Consecutive provider failures that open its circuit
+    CALENDAR_SYNC_BREAKER_RESET_SECONDS: float = 60  # Open circuit wait before a trial sync
+    CALENDAR_SYNC_CLAIM_BATCH: int = 500  # Due integrations read per scheduler tick
+    CALENDAR_SYNC_POLL_SECONDS: float = 1
+    CALENDAR_HTTP_TIMEOUT_SECONDS: float = 30
+    CALENDAR_HTTP_MAX_CONNECTIONS: int = 100  # Shared by every user's sync in the process
+    CALENDAR_HTTP_MAX_KEEPALIVE: int = 20
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,86 @@
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import event as sa_event
+
+from app.core.cache import ResponseCache
+from app.core.config import settings
+from app.models.user import User
+
+class Principal(BaseModel):
+    """
+    The authenticated caller, without an ORM row or a session behind it.
+    Enough for ownership checks and queue lanes; endpoints that need the
+    full profile depend on ``get_current_user`` instead.
+    """
+    id: str
+    email: Optional[str] = None
+    subscription_tier: Optional[str] = "free"
+    subscription_status: Optional[str] = "active"
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=str(user.id),
+            email=user.email,
+            subscription_tier=user.subscription_tier,
+            subscription_status=user.subscription_status,
+        )
+
+class PrincipalCache:
+    """
+    Principals keyed by user id, so authenticated requests (status polls in
+    particular) skip the users SELECT. CRUDUser invalidates both tiers on
+    writes; ORM flushes invalidate this worker's LRU, and the short TTL
+    bounds staleness everywhere else.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: int = 60,
+        redis_url: Optional[str] = None,
+        enabled: bool = True,
+    ):
+        self._cache = ResponseCache(
+            namespace="auth:principal",
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+            redis_url=redis_url,
+            enabled=enabled,
+        )
+
+    async def get(self, user_id: str) -> Optional[Principal]:
+        value = await self._cache.get(str(user_id))
+        return Principal(**value) if value is not None else None
+
+    async def set(self, principal: Principal) -> None:
+        await self._cache.set(principal.id, principal.model_dump())
+
+    async def invalidate(self, user_id: str) -> None:
+        await self._cache.delete(str(user_id))
+
+    def invalidate_local(self, user_id: str) -> None:
+        self._cache.local.delete(str(user_id))
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    async def aclose(self) -> None:
+        await self._cache.aclose()
+
+principal_cache = PrincipalCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL,
+    enabled=settings.AUTH_CACHE_ENABLED,
+)
+
+@sa_event.listens_for(User, "after_update")
+@sa_event.listens_for(User, "after_delete")
+def _invalidate_on_user_write(mapper, connection, target) -> None:
+    if target.id is not None:
+        principal_cache.invalidate_local(target.id)
@@ -1,6 +1,6 @@
 
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import timedelta
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,16 +10,16 @@ import jwt
 from app.api.deps import get_db
 from app import crud
 from app.core.config import settings
+from app.core.principal import Principal, principal_cache
+from app.core.tokens import token_verifier
 
 security = HTTPBearer()
 
 SECRET_KEY = settings.SECRET_KEY
 
 def create_access_token(subject: str) -> str:
-    """Create JWT token for MVP."""
-    expire = datetime.utcnow() + timedelta(days=7)
-    to_encode = {"sub": subject, "exp": expire}
-    return jwt.encode(to_encode, SECRET_KEY, algorithm="HS256")
+    """Create JWT token for MVP, signed with the active key (see app/core/tokens.py)."""
+    return token_verifier.encode(subject, timedelta(days=7))
 
 # Mock auth for MVP - Replace with Firebase Admin SDK in production
 async def get_current_user_id(
@@ -31,21 +31,14 @@ async def get_current_user_id(
     In production, validate Firebase token and extract user_id.
     """
     try:
-        # Decode JWT token
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=["HS256"])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-            )
-        return user_id
+        # Signature is checked once per token per worker, then served from cache
+        return token_verifier.verify(credentials.credentials)
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired",
         )
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
@@ -65,4 +58,26 @@ async def get_current_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
+    await principal_cache.set(Principal.from_user(user))
     return user
+
+async def get_current_principal(
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+) -> Principal:
+    """
+    Get current user as a cached Principal; no DB query on a cache hit.
+    Use this unless the endpoint needs the full User row.
+    """
+    principal = await principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    user = await crud.user.get(db, id=user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    principal = Principal.from_user(user)
+    await principal_cache.set(principal)
+    return principal
@@ -0,0 +1,104 @@
+import hashlib
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import jwt
+
+from app.core.cache import LRUTier
+from app.core.config import settings
+
+class TokenVerifier:
+    """
+    HS256 access tokens with a per-worker cache of already-verified tokens.
+
+    Clients reuse one token for thousands of requests, so after the first
+    successful ``verify`` the (kid, subject) pair is served from an LRU
+    keyed by the token's SHA-256, until the token's own ``exp``. Keys are
+    selected by the ``kid`` header: ``rotate`` can add a new signing key
+    without touching cached entries, and entries signed with a key that
+    has since been removed are rejected on their next use.
+    """
+
+    def __init__(
+        self,
+        default_key: str,
+        keys: Optional[Dict[str, str]] = None,
+        active_kid: Optional[str] = None,
+        algorithm: str = "HS256",
+        max_entries: int = 10000,
+        max_ttl_seconds: float = 3600,
+        enabled: bool = True,
+    ):
+        self.default_key = default_key
+        self.algorithm = algorithm
+        self.enabled = enabled
+        self._cache = LRUTier(max_entries=max_entries, ttl_seconds=max_ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+        self.rotate(keys or {}, active_kid)
+
+    def rotate(self, keys: Dict[str, str], active_kid: Optional[str] = None) -> None:
+        """Replace the key set. Cached tokens stay valid while their kid (and key) does."""
+        if active_kid is not None and active_kid not in keys:
+            raise ValueError(f"Active kid {active_kid!r} is not in the key set")
+        self.keys = dict(keys)
+        self.active_kid = active_kid
+
+    def _current_key(self, kid: Optional[str]) -> Optional[str]:
+        return self.default_key if kid is None else self.keys.get(kid)
+
+    def _key_for(self, kid: Optional[str]) -> str:
+        key = self._current_key(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key {kid!r}")
+        return key
+
+    def encode(self, subject: str, expires_delta: timedelta) -> str:
+        claims = {"sub": subject, "exp": datetime.utcnow() + expires_delta}
+        headers = {"kid": self.active_kid} if self.active_kid else None
+        return jwt.encode(claims, self._key_for(self.active_kid), algorithm=self.algorithm, headers=headers)
+
+    def verify(self, token: str) -> str:
+        """
+        Return the token's subject. Raises jwt.ExpiredSignatureError or
+        jwt.InvalidTokenError, exactly as an uncached jwt.decode would.
+        """
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        if self.enabled:
+            entry = self._cache.get(cache_key)
+            if entry is not None:
+                kid, key, subject = entry
+                if self._current_key(kid) == key:
+                    self.hits += 1
+                    return subject
+                self._cache.delete(cache_key)  # Signed with a key that was rotated out
+
+        self.misses += 1
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._key_for(kid)
+        payload = jwt.decode(token, key, algorithms=[self.algorithm])
+        subject = payload.get("sub")
+        if subject is None:
+            raise jwt.InvalidTokenError("Token has no subject")
+
+        if self.enabled:
+            ttl = payload["exp"] - time.time() if "exp" in payload else None
+            self._cache.set(cache_key, (kid, key, subject), ttl_seconds=ttl)
+        return subject
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache)}
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+token_verifier = TokenVerifier(
+    default_key=settings.SECRET_KEY,
+    keys=settings.JWT_KEYS,
+    active_kid=settings.JWT_ACTIVE_KID,
+    max_entries=settings.JWT_CACHE_MAX_ENTRIES,
+    max_ttl_seconds=settings.JWT_CACHE_MAX_TTL_SECONDS,
+    enabled=settings.JWT_CACHE_ENABLED,
+)
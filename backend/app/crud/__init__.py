@@ -1,5 +1,6 @@
 # Import CRUD operations
 from app.crud.user import user
 from app.crud.task import task
+from app.crud.event import event
 
-__all__ = ["user", "task"]
+__all__ = ["user", "task", "event"]
@@ -1,6 +1,7 @@
 
-from typing import Any, Dict, Optional, Union, List
+from typing import Any, Dict, Optional, Sequence, Union, List
 
+from sqlalchemy import delete, insert, inspect, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -20,36 +21,108 @@ class CRUDBase:
         )
         return result.scalars().all()
 
-    async def create(self, db: AsyncSession, *, obj_in: Union[Dict[str, Any], Base]) -> Base:
-        obj_in_data = obj_in.dict() if hasattr(obj_in, "dict") else obj_in
-        if isinstance(obj_in_data, dict):
-             db_obj = self.model(**obj_in_data)
+    async def create(
+        self, db: AsyncSession, *, obj_in: Union[Dict[str, Any], Base], refresh: bool = True
+    ) -> Base:
+        """
+        Insert one row. Server defaults (created_at, ...) come back on the
+        INSERT itself via RETURNING, so there's no refresh round-trip.
+        refresh=False writes through the session without asking for the row
+        back; database-side defaults may then be left unloaded.
+        """
+        obj_in_data = obj_in.dict() if hasattr(obj_in, "dict") else dict(obj_in)
+        if refresh:
+            result = await db.scalars(insert(self.model).values(**obj_in_data).returning(self.model))
+            db_obj = result.one()
         else:
-            db_obj = self.model(**obj_in_data.dict()) 
-        
-        db.add(db_obj)
+            db_obj = self.model(**obj_in_data)
+            db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
-    async def update(self, db: AsyncSession, *, db_obj: Base, obj_in: Union[Dict[str, Any], Base]) -> Base:
-        obj_data = db_obj.__dict__
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Base,
+        obj_in: Union[Dict[str, Any], Base],
+        refresh: bool = True,
+    ) -> Base:
+        """
+        Write only the columns whose values actually change, as one targeted
+        UPDATE (nothing at all if none do). With refresh=True the row comes
+        back via RETURNING, which also picks up onupdate columns such as
+        users.updated_at; with refresh=False those are left unloaded.
+        """
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.dict(exclude_unset=True)
-            
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-                
-        db.add(db_obj)
+
+        columns = inspect(self.model).column_attrs.keys()
+        loaded = db_obj.__dict__
+        changes = {
+            field: value
+            for field, value in update_data.items()
+            if field in columns and (field not in loaded or loaded[field] != value)
+        }
+        if not changes:
+            return db_obj
+
+        stmt = update(self.model).where(self.model.id == db_obj.id).values(**changes)
+        if refresh:
+            # The returned row refreshes db_obj in the identity map
+            result = await db.scalars(stmt.returning(self.model))
+            db_obj = result.one()
+        else:
+            await db.execute(stmt)
+        await db.commit()
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: Any) -> Optional[Base]:
+        """Delete one row with DELETE ... RETURNING; None if it didn't exist."""
+        result = await db.scalars(
+            delete(self.model).where(self.model.id == id).returning(self.model)
+        )
+        db_obj = result.first()
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
-    async def remove(self, db: AsyncSession, *, id: Any) -> Base:
-        obj = await self.get(db, id)
-        await db.delete(obj)
+    async def create_many(self, db: AsyncSession, *, objs_in: Sequence[Union[Dict[str, Any], Base]]) -> List[Base]:
+        """
+        Insert many rows in one transaction with INSERT ... RETURNING.
+        Rows with the same set of keys go out as one multi-row statement.
+        Returned objects are in the same order as ``objs_in``.
+        """
+        rows = [obj.dict() if hasattr(obj, "dict") else dict(obj) for obj in objs_in]
+        if not rows:
+            return []
+        result = await db.scalars(insert(self.model).returning(self.model, sort_by_parameter_order=True), rows)
+        db_objs = result.all()
+        await db.commit()
+        return db_objs
+
+    async def update_many(self, db: AsyncSession, *, rows: Sequence[Dict[str, Any]]) -> None:
+        """
+        Bulk UPDATE by primary key: each row is {"id": ..., <changed fields>}.
+        Sent as executemany in one transaction; objects already loaded in the
+        session are updated in place.
+        """
+        if not rows:
+            return
+        await db.execute(update(self.model), list(rows))
+        await db.commit()
+
+    async def remove_many(self, db: AsyncSession, *, ids: Sequence[Any], **filters: Any) -> List[Base]:
+        """
+        Delete rows by id with a single DELETE ... RETURNING and return the
+        deleted rows. Extra keyword filters narrow the match (e.g. user_id=...).
+        """
+        if not ids:
+            return []
+        result = await db.scalars(
+            delete(self.model).where(self.model.id.in_(list(ids))).filter_by(**filters).returning(self.model)
+        )
+        db_objs = result.all()
         await db.commit()
-        return obj
+        return db_objs
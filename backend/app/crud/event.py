@@ -0,0 +1,145 @@
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Union
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.crud.base import CRUDBase
+from app.models.event import CalendarEvent
+
+def _invalidate_busy(user_ids: Iterable[Any]) -> None:
+    # Imported here: freebusy reads events through app.crud
+    from app.services.scheduling.freebusy import freebusy
+
+    for user_id in set(user_ids):
+        if user_id is not None:
+            freebusy.invalidate(user_id)
+
+class CRUDEvent(CRUDBase):
+    """
+    Event writes also drop the owner's cached BusyIndex. The base writes are
+    Core statements, which the freebusy session listeners never see.
+    """
+    UPSERT_CHUNK_SIZE = 500
+
+    async def create(
+        self, db: AsyncSession, *, obj_in: Union[Dict[str, Any], Any], refresh: bool = True
+    ) -> CalendarEvent:
+        db_obj = await super().create(db, obj_in=obj_in, refresh=refresh)
+        _invalidate_busy([db_obj.user_id])
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: CalendarEvent,
+        obj_in: Union[Dict[str, Any], Any],
+        refresh: bool = True,
+    ) -> CalendarEvent:
+        owner = db_obj.user_id
+        event = await super().update(db, db_obj=db_obj, obj_in=obj_in, refresh=refresh)
+        _invalidate_busy([owner, event.user_id])
+        return event
+
+    async def remove(self, db: AsyncSession, *, id: Any) -> Optional[CalendarEvent]:
+        event = await super().remove(db, id=id)
+        if event is not None:
+            _invalidate_busy([event.user_id])
+        return event
+
+    async def create_many(
+        self, db: AsyncSession, *, objs_in: Sequence[Union[Dict[str, Any], Any]]
+    ) -> List[CalendarEvent]:
+        events = await super().create_many(db, objs_in=objs_in)
+        _invalidate_busy(event.user_id for event in events)
+        return events
+
+    async def update_many(self, db: AsyncSession, *, rows: Sequence[Dict[str, Any]]) -> None:
+        # Rows carry only the changed fields, so look the owners up first
+        owners = []
+        if rows:
+            result = await db.scalars(
+                select(self.model.user_id).where(self.model.id.in_([row["id"] for row in rows]))
+            )
+            owners = result.all()
+        await super().update_many(db, rows=rows)
+        _invalidate_busy([*owners, *(row.get("user_id") for row in rows)])
+
+    async def remove_many(
+        self, db: AsyncSession, *, ids: Sequence[Any], **filters: Any
+    ) -> List[CalendarEvent]:
+        events = await super().remove_many(db, ids=ids, **filters)
+        _invalidate_busy(event.user_id for event in events)
+        return events
+
+    async def get_range(
+        self, db: AsyncSession, *, user_id: str, start: datetime, end: datetime
+    ) -> List[CalendarEvent]:
+        """Events overlapping [start, end), served by idx_calendar_range."""
+        result = await db.execute(
+            select(self.model)
+            .filter(
+                self.model.user_id == user_id,
+                self.model.start_time < end,
+                self.model.end_time > start,
+            )
+            .order_by(self.model.start_time)
+        )
+        return result.scalars().all()
+
+    async def upsert_external_many(
+        self, db: AsyncSession, *, user_id: str, source: str, rows: Sequence[Dict[str, Any]]
+    ) -> None:
+        """
+        Insert or update provider events keyed on (user_id, source, external_id)
+        with one INSERT ... ON CONFLICT DO UPDATE. Doesn't commit, so a sync
+        can write its upserts, deletes and new token in one transaction.
+        """
+        if not rows:
+            return
+        if db.bind.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        rows = [{**row, "user_id": user_id, "source": source} for row in rows]
+        # Multi-row VALUES, chunked to stay under SQLite's bound-parameter limit
+        for i in range(0, len(rows), self.UPSERT_CHUNK_SIZE):
+            stmt = insert(self.model).values(rows[i:i + self.UPSERT_CHUNK_SIZE])
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=["user_id", "source", "external_id"],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in ("title", "start_time", "end_time", "is_fixed")
+                },
+            ))
+
+    async def get_external_ids(self, db: AsyncSession, *, user_id: str, source: str) -> Set[str]:
+        """External ids of every event a provider synced for the user."""
+        result = await db.execute(
+            select(self.model.external_id).where(
+                self.model.user_id == user_id,
+                self.model.source == source,
+                self.model.external_id.is_not(None),
+            )
+        )
+        return set(result.scalars().all())
+
+    async def remove_external_many(
+        self, db: AsyncSession, *, user_id: str, source: str, external_ids: Sequence[str]
+    ) -> None:
+        """Delete provider events by external id, one statement per chunk (no commit)."""
+        external_ids = list(external_ids)
+        for i in range(0, len(external_ids), self.UPSERT_CHUNK_SIZE):
+            await db.execute(
+                delete(self.model).where(
+                    self.model.user_id == user_id,
+                    self.model.source == source,
+                    self.model.external_id.in_(external_ids[i:i + self.UPSERT_CHUNK_SIZE]),
+                )
+            )
+
+event = CRUDEvent(CalendarEvent)
@@ -1,8 +1,91 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
 
 from app.crud.base import CRUDBase
 from app.models.task import Task
 
+def encode_cursor(task: Task) -> str:
+    """Opaque keyset cursor pointing just after ``task`` in listing order."""
+    payload = json.dumps([task.created_at.isoformat(), str(task.id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Raises ValueError for a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(task_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
 class CRUDTask(CRUDBase):
-    pass
+    async def list_for_user(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        deadline_from: Optional[datetime] = None,
+        deadline_to: Optional[datetime] = None,
+    ) -> Tuple[List[Task], Optional[str]]:
+        """
+        One page of a user's tasks, newest first.
+
+        Pages are keyed on (created_at, id) after the user_id prefix, so each
+        page is an index range scan (idx_tasks_user_created, or
+        idx_tasks_status when filtering by status) no matter how deep it is.
+
+        Returns:
+            (tasks, next_cursor); next_cursor is None on the last page
+        """
+        query = select(Task).filter(Task.user_id == str(user_id))
+        if status is not None:
+            query = query.filter(Task.status == status)
+        if priority is not None:
+            query = query.filter(Task.priority == priority)
+        if deadline_from is not None:
+            query = query.filter(Task.deadline >= deadline_from)
+        if deadline_to is not None:
+            query = query.filter(Task.deadline < deadline_to)
+        if cursor is not None:
+            created_at, task_id = decode_cursor(cursor)
+            # Row-value comparison, so the index seeks straight to the cursor
+            # (an equivalent OR of two predicates degrades to a prefix scan)
+            query = query.filter(tuple_(Task.created_at, Task.id) < (created_at, task_id))
+
+        result = await db.execute(
+            query.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit + 1)
+        )
+        tasks = result.scalars().all()
+        if len(tasks) > limit:
+            return tasks[:limit], encode_cursor(tasks[limit - 1])
+        return tasks, None
+
+    async def get_many_by_owner(
+        self, db: AsyncSession, *, ids: Sequence[str], user_id: str
+    ) -> List[Task]:
+        """Load the given tasks in one query, skipping any the user doesn't own."""
+        if not ids:
+            return []
+        result = await db.execute(
+            select(Task).filter(Task.id.in_(list(ids)), Task.user_id == str(user_id))
+        )
+        return result.scalars().all()
+
+    async def update_analysis_many(self, db: AsyncSession, *, rows: List[Dict[str, Any]]) -> None:
+        """
+        Write AI analysis results for many tasks as one executemany UPDATE.
+        Each row is {"id", "estimated_duration_minutes", "ai_reasoning"}.
+        """
+        await self.update_many(db, rows=rows)
 
 task = CRUDTask(Task)
@@ -1,8 +1,40 @@
+from typing import Any, Dict, List, Optional, Sequence, Union
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.principal import principal_cache
 from app.crud.base import CRUDBase
 from app.models.user import User
 
 class CRUDUser(CRUDBase):
-    pass
+    """User writes also drop the cached principal (see app/core/principal.py)."""
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: User,
+        obj_in: Union[Dict[str, Any], Any],
+        refresh: bool = True,
+    ) -> User:
+        user = await super().update(db, db_obj=db_obj, obj_in=obj_in, refresh=refresh)
+        await principal_cache.invalidate(db_obj.id)
+        return user
+
+    async def remove(self, db: AsyncSession, *, id: Any) -> Optional[User]:
+        user = await super().remove(db, id=id)
+        await principal_cache.invalidate(id)
+        return user
+
+    async def update_many(self, db: AsyncSession, *, rows: Sequence[Dict[str, Any]]) -> None:
+        await super().update_many(db, rows=rows)
+        for row in rows:
+            await principal_cache.invalidate(row["id"])
+
+    async def remove_many(self, db: AsyncSession, *, ids: Sequence[Any], **filters: Any) -> List[User]:
+        users = await super().remove_many(db, ids=ids, **filters)
+        for user in users:
+            await principal_cache.invalidate(user.id)
+        return users
 
 user = CRUDUser(User)
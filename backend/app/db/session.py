@@ -1,11 +1,82 @@
+from typing import Any, AsyncGenerator, Dict, Optional
 
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from app.core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+from app.core.config import Settings, settings
+
+def sqlite_pragmas(config: Settings = settings, busy_timeout_ms: Optional[int] = None) -> tuple:
+    """
+    Run on every new SQLite connection, by the app engine and the AI
+    checkpointer alike. WAL lets readers run alongside the single writer;
+    NORMAL sync is durable across application crashes and only risks the
+    last commits on power loss.
+    """
+    if busy_timeout_ms is None:
+        busy_timeout_ms = config.DB_SQLITE_BUSY_TIMEOUT_MS
+    return (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        f"PRAGMA mmap_size={int(config.DB_SQLITE_MMAP_SIZE)}",
+        f"PRAGMA busy_timeout={int(busy_timeout_ms)}",
+    )
+
+def engine_options(url: str, config: Settings = settings) -> Dict[str, Any]:
+    """create_async_engine() keyword arguments for ``url``'s dialect."""
+    parsed = make_url(url)
+    options: Dict[str, Any] = {"echo": config.DB_ECHO}
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory databases live on one static connection; no pool to size
+        return options
+
+    options.update(
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT_SECONDS,
+    )
+    if parsed.get_backend_name() == "sqlite":
+        # A local file can't drop the connection; pinging costs a query per checkout
+        return options
+
+    options.update(
+        pool_recycle=config.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+    )
+    if parsed.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            # SQLAlchemy's per-connection cache of prepared statements, and asyncpg's own
+            "prepared_statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+def create_engine(url: Optional[str] = None, config: Settings = settings, **overrides: Any) -> AsyncEngine:
+    """
+    Build the application engine from Settings: echo, pool sizing and
+    asyncpg statement caching, plus connection pragmas on SQLite.
+    """
+    url = url or config.DATABASE_URL
+    engine = create_async_engine(url, **{**engine_options(url, config), **overrides})
+
+    if engine.dialect.name == "sqlite":
+        pragmas = sqlite_pragmas(config)
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+
+    return engine
+
+engine = create_engine()
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
-async def get_db():
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency: one session per request."""
     async with AsyncSessionLocal() as session:
         yield session
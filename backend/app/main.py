@@ -1,11 +1,45 @@
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.services.ai_pipeline.graph import warm_up_graphs, clear_compiled_apps
+from app.services.ai_pipeline.checkpointer import close_checkpointer
+from app.services.ai_pipeline.retention import checkpoint_retention
+from app.services.ai_pipeline.llm_factory import llm_pool
+from app.services.ai_pipeline.cache import analysis_cache
+from app.core.principal import principal_cache
+from app.services.ai_pipeline.events import event_broker
+from app.services.calendar_sync.http import calendar_http
+from app.services.calendar_sync.scheduler import calendar_sync_scheduler
+from app.services.job_queue.queue import ai_job_queue
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the checkpointer and compile the AI graphs once per process
+    await warm_up_graphs()
+    if settings.AI_QUEUE_RUN_WORKERS:
+        await ai_job_queue.start()
+        if settings.CHECKPOINT_RETENTION_ENABLED:
+            checkpoint_retention.start()
+    if settings.CALENDAR_SYNC_RUN_SCHEDULER:
+        calendar_sync_scheduler.start()
+    yield
+    await ai_job_queue.stop()
+    await checkpoint_retention.stop()
+    await calendar_sync_scheduler.stop()
+    clear_compiled_apps()
+    await close_checkpointer()
+    await llm_pool.aclose()
+    await analysis_cache.aclose()
+    await principal_cache.aclose()
+    await calendar_http.aclose()
+    await event_broker.aclose()
 
-app = FastAPI(title=settings.PROJECT_NAME)
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
 # Configure CORS for Flutter frontend
 app.add_middleware(
@@ -14,6 +48,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Task list pagination
 )
 
 # Include API router
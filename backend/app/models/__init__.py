@@ -2,5 +2,6 @@
 from app.models.user import User, UserIntegration
 from app.models.task import Task
 from app.models.event import CalendarEvent
+from app.models.job import AIJob
 
-__all__ = ["User", "UserIntegration", "Task", "CalendarEvent"]
+__all__ = ["User", "UserIntegration", "Task", "CalendarEvent", "AIJob"]
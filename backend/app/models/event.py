@@ -1,6 +1,6 @@
 
 import uuid
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey
 
 from sqlalchemy.orm import relationship
@@ -20,6 +20,13 @@ class CalendarEvent(Base):
     end_time = Column(DateTime(timezone=True), nullable=False)
     is_fixed = Column(Boolean, default=False)
     source = Column(String)
+    external_id = Column(String)  # Provider's event id, for incremental sync
 
     user = relationship("User", back_populates="events")
     task = relationship("Task", back_populates="events")
+
+    __table_args__ = (
+        Index("idx_calendar_range", "user_id", "start_time", "end_time"),
+        # One row per provider event; the upsert target for calendar sync
+        Index("uq_calendar_events_external", "user_id", "source", "external_id", unique=True),
+    )
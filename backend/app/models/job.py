@@ -0,0 +1,30 @@
+
+import uuid
+from sqlalchemy import Column, String, Integer, Text, DateTime, Index
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+class AIJob(Base):
+    __tablename__ = "ai_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    kind = Column(String, nullable=False)  # "run" | "resume"
+    lane = Column(String, nullable=False, default="free")
+    payload = Column(Text, nullable=False)  # JSON
+    status = Column(String, nullable=False, default="queued")  # queued | running | done | failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    last_error = Column(Text)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    available_at = Column(DateTime(timezone=True), nullable=False)
+    started_at = Column(DateTime(timezone=True))
+    heartbeat_at = Column(DateTime(timezone=True))
+    lease_expires_at = Column(DateTime(timezone=True))  # Re-queued once passed while still running
+    finished_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("idx_ai_jobs_claim", "status", "lane", "available_at"),
+    )
@@ -1,12 +1,29 @@
 
 import uuid
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Index
 from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey
 
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql.expression import FunctionElement
 from app.db.base import Base
 
+class utc_now(FunctionElement):
+    """Server-side current timestamp, stored like client-side datetimes."""
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+@compiles(utc_now)
+def _utc_now(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+@compiles(utc_now, "sqlite")
+def _utc_now_sqlite(element, compiler, **kw):
+    # SQLite compares DATETIME columns as text: CURRENT_TIMESTAMP has no
+    # fraction and would sort before an equal 'YYYY-MM-DD HH:MM:SS.ffffff'
+    return "(STRFTIME('%Y-%m-%d %H:%M:%f000', 'now'))"
+
 class Task(Base):
     __tablename__ = "tasks"
 
@@ -25,8 +42,19 @@ class Task(Base):
     ai_reasoning = Column(Text)
     parent_task_id = Column(String, ForeignKey("tasks.id", ondelete="CASCADE"))
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set client-side too: keyset pagination needs a non-null, full-precision value
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=utc_now(),
+    )
 
     user = relationship("User", back_populates="tasks")
     subtasks = relationship("Task", remote_side=[id])
     events = relationship("CalendarEvent", back_populates="task")
+
+    __table_args__ = (
+        # Listing: user-scoped keyset pagination, newest first
+        Index("idx_tasks_user_created", "user_id", "created_at", "id"),
+        Index("idx_tasks_status", "user_id", "status", "created_at", "id"),
+    )
@@ -1,6 +1,6 @@
 
 import uuid
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, Date, Enum, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, Date, Enum, ForeignKey, Index
 from sqlalchemy import Column, String, Integer, DateTime, Boolean, Date, Enum, ForeignKey
 
 from sqlalchemy.orm import relationship
@@ -34,5 +34,14 @@ class UserIntegration(Base):
     access_token = Column(String) # Encrypted
     refresh_token = Column(String) # Encrypted
     expires_at = Column(DateTime(timezone=True))
+    sync_token = Column(String)  # Provider delta cursor (Google nextSyncToken, Graph deltaLink)
+    last_synced_at = Column(DateTime(timezone=True))
+    next_sync_at = Column(DateTime(timezone=True))  # Slot assigned by the sync scheduler
+    sync_failures = Column(Integer, default=0, nullable=False)  # Consecutive; drives backoff
+    last_sync_error = Column(String)
 
     user = relationship("User", back_populates="integrations")
+
+    __table_args__ = (
+        Index("idx_integrations_next_sync", "next_sync_at"),
+    )
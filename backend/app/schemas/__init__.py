@@ -1,5 +1,10 @@
 from app.schemas.user import User, UserCreate, UserUpdate
-from app.schemas.task import Task, TaskCreate, TaskUpdate
+from app.schemas.task import (
+    Task, TaskCreate, TaskUpdate,
+    TaskBulkCreate, TaskBulkUpdate, TaskBulkUpdateItem, TaskBulkDelete, TaskBulkResult,
+)
 from app.schemas.event import Event, EventCreate, EventUpdate
 
-__all__ = ["User", "UserCreate", "UserUpdate", "Task", "TaskCreate", "TaskUpdate", "Event", "EventCreate", "EventUpdate"]
+__all__ = ["User", "UserCreate", "UserUpdate", "Task", "TaskCreate", "TaskUpdate",
+           "TaskBulkCreate", "TaskBulkUpdate", "TaskBulkUpdateItem", "TaskBulkDelete", "TaskBulkResult",
+           "Event", "EventCreate", "EventUpdate"]
@@ -1,9 +1,11 @@
 
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import datetime
 
+from app.core.config import settings
+
 class TaskBase(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -32,3 +34,20 @@ class TaskInDBBase(TaskBase):
 
 class Task(TaskInDBBase):
     pass
+
+# Bulk operations (/tasks/bulk)
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=settings.TASKS_BULK_MAX_ITEMS)
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: str
+
+class TaskBulkUpdate(BaseModel):
+    tasks: List[TaskBulkUpdateItem] = Field(..., min_length=1, max_length=settings.TASKS_BULK_MAX_ITEMS)
+
+class TaskBulkDelete(BaseModel):
+    task_ids: List[str] = Field(..., min_length=1, max_length=settings.TASKS_BULK_MAX_ITEMS)
+
+class TaskBulkResult(BaseModel):
+    tasks: List[Task]
+    missing_task_ids: List[str] = []  # Not found or not owned by the caller
@@ -0,0 +1,18 @@
+import hashlib
+import json
+
+from app.core.cache import ResponseCache
+from app.core.config import settings
+
+def make_cache_key(model: str, temperature: float, *prompt_parts: str) -> str:
+    """Content-addressed key: hash of the rendered prompt plus model settings."""
+    payload = json.dumps([model, float(temperature), *prompt_parts], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+analysis_cache = ResponseCache(
+    namespace="ai:analysis",
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL,
+    enabled=settings.LLM_CACHE_ENABLED,
+)
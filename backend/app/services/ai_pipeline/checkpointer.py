@@ -0,0 +1,174 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Collection, Optional, Sequence
+
+import aiosqlite
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from app.core.config import settings
+from app.db.session import sqlite_pragmas
+
+async def connect_sqlite(path: str, busy_timeout_ms: int, read_only: bool = False) -> aiosqlite.Connection:
+    conn = await aiosqlite.connect(path)
+    if not read_only:
+        # Only takes effect on a new (empty) database; lets retention shrink the file
+        await conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    for pragma in sqlite_pragmas(busy_timeout_ms=busy_timeout_ms):
+        await conn.execute(pragma)
+    await conn.execute("PRAGMA cache_size=-16000")  # 16 MB page cache per connection
+    if read_only:
+        await conn.execute("PRAGMA query_only=ON")
+    return conn
+
+class PooledSqliteSaver(BaseCheckpointSaver):
+    """
+    SQLite checkpointer with one writer connection and a pool of reader
+    connections.
+
+    AsyncSqliteSaver serializes every call through one connection and lock.
+    In WAL mode readers don't block the writer, so state reads (status
+    polls, SSE snapshots, resume checks) are spread over ``readers`` extra
+    connections while writes stay on the single writer SQLite allows.
+    """
+
+    def __init__(self, writer: AsyncSqliteSaver, readers: Sequence[AsyncSqliteSaver], serde: Any = None):
+        super().__init__(serde=serde)
+        self.writer = writer
+        self.readers = list(readers)
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for i in range(len(self.readers)):
+            self._idle.put_nowait(i)
+
+    @classmethod
+    async def open(cls, path: str, readers: int = 4, busy_timeout_ms: int = 5000) -> "PooledSqliteSaver":
+        writer = AsyncSqliteSaver(await connect_sqlite(path, busy_timeout_ms))
+        await writer.setup()
+        reader_savers = []
+        for _ in range(max(readers, 1)):
+            reader = AsyncSqliteSaver(await connect_sqlite(path, busy_timeout_ms, read_only=True))
+            # Schema is owned by the writer; read-only connections must skip setup()
+            reader.is_setup = True
+            reader._has_task_path = writer._has_task_path
+            reader_savers.append(reader)
+        return cls(writer, reader_savers, serde=writer.serde)
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[AsyncSqliteSaver]:
+        i = await self._idle.get()
+        try:
+            yield self.readers[i]
+        finally:
+            self._idle.put_nowait(i)
+
+    def with_allowlist(self, extra_allowlist: Collection[tuple]) -> "PooledSqliteSaver":
+        clone = super().with_allowlist(extra_allowlist)
+        if clone is not self:
+            # Clones share connections, locks and the idle pool; only serde differs
+            clone.writer = self.writer.with_allowlist(extra_allowlist)
+            clone.readers = [reader.with_allowlist(extra_allowlist) for reader in self.readers]
+        return clone
+
+    async def aget_tuple(self, config):
+        async with self.reader() as reader:
+            return await reader.aget_tuple(config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        async with self.reader() as reader:
+            async for item in reader.alist(config, filter=filter, before=before, limit=limit):
+                yield item
+
+    async def aget_delta_channel_history(self, *, config, channels):
+        async with self.reader() as reader:
+            return await reader.aget_delta_channel_history(config=config, channels=channels)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await self.writer.aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await self.writer.aput_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        return await self.writer.adelete_thread(thread_id)
+
+    def get_next_version(self, current, channel):
+        return self.writer.get_next_version(current, channel)
+
+    async def aclose(self) -> None:
+        for saver in [self.writer, *self.readers]:
+            await saver.conn.close()
+
+def resolve_backend() -> str:
+    backend = settings.CHECKPOINT_BACKEND
+    if backend == "auto":
+        url = settings.CHECKPOINT_POSTGRES_URL or settings.DATABASE_URL
+        return "postgres" if url.startswith("postgres") else "sqlite"
+    return backend
+
+def _psycopg_url(url: str) -> str:
+    """psycopg takes a plain libpq URL, not SQLAlchemy's driver-qualified one."""
+    scheme, sep, rest = url.partition("://")
+    return f"postgresql://{rest}" if sep and scheme.startswith("postgres") else url
+
+_checkpointer: Optional[BaseCheckpointSaver] = None
+_pg_pool = None
+_lock = asyncio.Lock()
+
+async def _open_postgres():
+    global _pg_pool
+    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+
+    pool = AsyncConnectionPool(
+        _psycopg_url(settings.CHECKPOINT_POSTGRES_URL or settings.DATABASE_URL),
+        min_size=1,
+        max_size=settings.CHECKPOINT_POOL_SIZE,
+        kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+        open=False,
+    )
+    await pool.open()
+    saver = AsyncPostgresSaver(pool)
+    await saver.setup()
+    _pg_pool = pool
+    return saver
+
+async def open_checkpointer() -> BaseCheckpointSaver:
+    """Open the configured checkpointer once per process (idempotent)."""
+    global _checkpointer
+    if _checkpointer is not None:
+        return _checkpointer
+    async with _lock:
+        if _checkpointer is not None:
+            return _checkpointer
+        backend = resolve_backend()
+        if backend == "postgres":
+            try:
+                _checkpointer = await _open_postgres()
+            except ImportError as e:
+                print(f"Postgres checkpointer unavailable ({e}); falling back to SQLite")
+                backend = "sqlite"
+        if backend == "memory":
+            _checkpointer = MemorySaver()
+        elif backend == "sqlite":
+            _checkpointer = await PooledSqliteSaver.open(
+                settings.CHECKPOINT_SQLITE_PATH,
+                readers=settings.CHECKPOINT_POOL_SIZE,
+                busy_timeout_ms=settings.CHECKPOINT_BUSY_TIMEOUT_MS,
+            )
+        elif _checkpointer is None:
+            raise ValueError(f"Unknown CHECKPOINT_BACKEND '{settings.CHECKPOINT_BACKEND}'")
+        return _checkpointer
+
+def current_checkpointer() -> Optional[BaseCheckpointSaver]:
+    return _checkpointer
+
+async def close_checkpointer() -> None:
+    global _checkpointer, _pg_pool
+    saver, _checkpointer = _checkpointer, None
+    if isinstance(saver, PooledSqliteSaver):
+        await saver.aclose()
+    if _pg_pool is not None:
+        await _pg_pool.close()
+        _pg_pool = None
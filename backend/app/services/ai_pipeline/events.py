@@ -0,0 +1,124 @@
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from app.core.config import settings
+
+# Events after which no further progress is published for a thread
+TERMINAL_EVENTS = ("completed", "error")
+
+class InProcessSubscription:
+    def __init__(self, broker: "InProcessEventBroker", thread_id: str, queue: asyncio.Queue):
+        self._broker = broker
+        self._thread_id = thread_id
+        self._queue = queue
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next event, or None if nothing arrived within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self) -> None:
+        self._broker._unsubscribe(self._thread_id, self._queue)
+
+class InProcessEventBroker:
+    """
+    Pub/sub for workflow progress within a single worker process.
+
+    Each subscriber gets a bounded queue; if a slow client falls behind, the
+    oldest events are dropped (clients re-sync from the checkpoint on connect).
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    async def publish(self, thread_id: str, event: Dict[str, Any]) -> None:
+        for queue in list(self._subscribers.get(thread_id, ())):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def subscribe(self, thread_id: str) -> InProcessSubscription:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._subscribers[thread_id].add(queue)
+        return InProcessSubscription(self, thread_id, queue)
+
+    def _unsubscribe(self, thread_id: str, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(thread_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[thread_id]
+
+    def subscriber_count(self, thread_id: str) -> int:
+        return len(self._subscribers.get(thread_id, ()))
+
+    async def aclose(self) -> None:
+        self._subscribers.clear()
+
+class RedisSubscription:
+    def __init__(self, pubsub: Any, channel: str):
+        self._pubsub = pubsub
+        self._channel = channel
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        return json.loads(message["data"]) if message else None
+
+    async def close(self) -> None:
+        try:
+            await self._pubsub.unsubscribe(self._channel)
+            await self._pubsub.aclose()
+        except Exception as e:
+            print(f"Redis unsubscribe failed: {e}")
+
+class RedisEventBroker:
+    """Pub/sub over Redis channels so any worker can stream any thread."""
+
+    def __init__(self, url: str, channel_prefix: str = "ai:events"):
+        self.url = url
+        self.channel_prefix = channel_prefix
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            import redis.asyncio as redis
+            self._client = redis.from_url(self.url)
+        return self._client
+
+    def _channel(self, thread_id: str) -> str:
+        return f"{self.channel_prefix}:{thread_id}"
+
+    async def publish(self, thread_id: str, event: Dict[str, Any]) -> None:
+        try:
+            await self._get_client().publish(self._channel(thread_id), json.dumps(event, default=str))
+        except Exception as e:
+            print(f"Redis publish failed: {e}")
+
+    async def subscribe(self, thread_id: str) -> RedisSubscription:
+        pubsub = self._get_client().pubsub()
+        await pubsub.subscribe(self._channel(thread_id))
+        return RedisSubscription(pubsub, self._channel(thread_id))
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+def create_event_broker():
+    if settings.AI_EVENTS_BACKEND == "redis" and settings.REDIS_URL:
+        return RedisEventBroker(settings.REDIS_URL)
+    return InProcessEventBroker()
+
+event_broker = create_event_broker()
+
+def make_event(thread_id: str, user_id: Optional[str], event: str, **data: Any) -> Dict[str, Any]:
+    return {"thread_id": thread_id, "user_id": user_id, "event": event, **data}
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Encode an event as a Server-Sent Events frame."""
+    return f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
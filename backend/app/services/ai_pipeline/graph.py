@@ -1,13 +1,11 @@
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Tuple
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
-import aiosqlite
-import os
 
 from app.services.ai_pipeline.state import TaskAnalysisState
 from app.services.ai_pipeline.nodes.analyze import analyze_task
 from app.services.ai_pipeline.nodes.schedule import schedule_task
 from app.services.ai_pipeline.nodes.execute import execute_task
+from app.services.ai_pipeline.checkpointer import current_checkpointer, open_checkpointer
 
 # Defined node for pickle capability
 def human_review_node(state: TaskAnalysisState) -> Dict:
@@ -37,29 +35,97 @@ def create_graph_builder(with_human_loop: bool = False):
         
     return workflow
 
-# 1. One-Shot Graph (Legacy/Testing) - No persistence, no interrupts matches existing tests
-one_shot_workflow = create_graph_builder(with_human_loop=False).compile()
+# 1. One-Shot Graphs (Legacy/Testing) - No persistence, no interrupts matches existing tests
+PIPELINE_NODES = {"analyze": analyze_task, "schedule": schedule_task}
 
-async def process_task(task_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Legacy one-shot execution for existing endpoints."""
+# Each variant runs only the nodes whose output the caller needs, in pipeline order
+ONE_SHOT_VARIANTS = {
+    "analyze": ("analyze",),
+    "schedule": ("schedule",),  # Duration already known, so analysis would be wasted
+    "full": ("analyze", "schedule"),
+}
+
+def create_subgraph_builder(nodes: Sequence[str]):
+    workflow = StateGraph(TaskAnalysisState)
+    for name in nodes:
+        workflow.add_node(name, PIPELINE_NODES[name])
+    workflow.set_entry_point(nodes[0])
+    for current, following in zip(nodes, nodes[1:]):
+        workflow.add_edge(current, following)
+    workflow.add_edge(nodes[-1], END)
+    return workflow
+
+one_shot_workflows = {
+    variant: create_subgraph_builder(nodes).compile()
+    for variant, nodes in ONE_SHOT_VARIANTS.items()
+}
+one_shot_workflow = one_shot_workflows["full"]
+
+def scheduling_variant(task_data: Dict[str, Any]) -> str:
+    """Smallest graph that yields scheduling options: skip analysis once a duration is stored."""
+    return "schedule" if task_data.get("estimated_duration_minutes") else "full"
+
+async def process_task(task_data: Dict[str, Any], variant: str = "full") -> Dict[str, Any]:
+    """
+    Legacy one-shot execution for existing endpoints.
+
+    Args:
+        task_data: Initial TaskAnalysisState fields
+        variant: "analyze", "schedule" or "full" (see ONE_SHOT_VARIANTS)
+    """
     # Convert dict keys to match Pydantic if needed, but invoke accepts dicts
-    result = await one_shot_workflow.ainvoke(task_data)
+    result = await one_shot_workflows[variant].ainvoke(task_data)
     return result
 
-# 2. HITL Graph (Production/Async) - With persistence
-_checkpointer = None
+async def stream_task(task_data: Dict[str, Any], variant: str = "full") -> AsyncIterator[Tuple[str, Any]]:
+    """
+    process_task, streamed: yields ("token", {"node", "text"}) while the
+    nodes generate, then ("result", final state).
+    """
+    result = None
+    async for mode, chunk in one_shot_workflows[variant].astream(task_data, stream_mode=["custom", "values"]):
+        if mode == "custom":
+            yield "token", chunk
+        else:
+            result = chunk
+    yield "result", result
 
+# 2. HITL Graph (Production/Async) - With persistence
 async def get_checkpointer():
-    global _checkpointer
-    if _checkpointer is None:
-        db_path = "ai_checkpoints.db"
-        conn = await aiosqlite.connect(db_path)
-        # Assuming conn stays open. In prod, use connection pool or lifespan manager
-        _checkpointer = AsyncSqliteSaver(conn)
-        await _checkpointer.setup()
-    return _checkpointer
+    """The process-wide checkpointer (see checkpointer.py); opened on first use."""
+    return await open_checkpointer()
+
+# Compiled graphs are immutable once built, so one instance per
+# (variant, checkpointer, interrupts) is shared by every request.
+HITL_INTERRUPT_BEFORE = ("human_review",)
+
+_compiled_apps: Dict[Tuple[str, int, Tuple[str, ...]], Any] = {}
+
+def get_compiled_app(
+    variant: str = "hitl",
+    checkpointer: Optional[Any] = None,
+    interrupt_before: Sequence[str] = (),
+):
+    """Return the cached compiled graph for this configuration, compiling it on first use."""
+    key = (variant, id(checkpointer), tuple(interrupt_before))
+    app = _compiled_apps.get(key)
+    if app is None:
+        workflow = create_graph_builder(with_human_loop=(variant == "hitl"))
+        app = workflow.compile(
+            checkpointer=checkpointer,
+            interrupt_before=list(interrupt_before) or None,
+        )
+        _compiled_apps[key] = app
+    return app
+
+def clear_compiled_apps() -> None:
+    """Drop every cached compiled graph (used on shutdown and in tests)."""
+    _compiled_apps.clear()
 
 async def get_hitl_app():
-    checkpointer = await get_checkpointer()
-    workflow = create_graph_builder(with_human_loop=True)
-    return workflow.compile(checkpointer=checkpointer, interrupt_before=["human_review"])
+    checkpointer = current_checkpointer() or await get_checkpointer()
+    return get_compiled_app("hitl", checkpointer, HITL_INTERRUPT_BEFORE)
+
+async def warm_up_graphs() -> None:
+    """Open the checkpointer and compile the HITL graph ahead of the first request."""
+    await get_hitl_app()
@@ -1,6 +1,11 @@
-import os
+import asyncio
 import json
-from typing import Any, Optional
+import re
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.core.config import settings
 
 class MockLLM:
     """Mock LLM for testing without API keys."""
@@ -10,7 +15,13 @@ class MockLLM:
                 self.content = content
         
         # Simple heuristic-based response
-        if "estimated duration" in str(prompt).lower():
+        if "analyze every task in the batch" in str(prompt).lower():
+            # Prompt may arrive as a message list repr, with escaped newlines
+            indices = sorted({int(i) for i in re.findall(r"\[(\d+)\](?:\\n|\n)Task:", str(prompt))})
+            content = json.dumps({
+                "results": [{"index": i, "reasoning": "Mock response"} for i in indices]
+            })
+        elif "estimated duration" in str(prompt).lower():
             content = json.dumps({
                 "estimated_duration_minutes": 60,
                 "suggested_tags": ["work", "analysis"],
@@ -47,32 +58,196 @@ class MockLLM:
             
         return MockResponse(content)
 
+class LLMUnavailableError(RuntimeError):
+    """The LLM backend failed recently and is cooling down; retry later."""
+
+class LLMClientPool:
+    """
+    Process-wide registry of LLM clients keyed by (model, base_url, temperature).
+
+    Clients are created lazily on first use and reused by every node call.
+    Each entry tracks its health: while a backend that just failed cools
+    down, ``get`` raises LLMUnavailableError instead of handing out a
+    client, so callers fail fast rather than save made-up results.
+    """
+
+    def __init__(self, retry_after_seconds: float = 30):
+        self.retry_after_seconds = retry_after_seconds
+        self._clients: Dict[Tuple[str, str, float], Any] = {}
+        self._health: Dict[Tuple[str, str, float], Dict[str, Any]] = {}
+        self._keys_by_client: Dict[int, Tuple[str, str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: str, base_url: str, temperature: float = 0) -> Any:
+        key = (model, base_url, float(temperature))
+        health = self._health.get(key)
+        if health and not health["healthy"]:
+            retry_in = self.retry_after_seconds - (time.monotonic() - health["failed_at"])
+            if retry_in > 0:
+                raise LLMUnavailableError(
+                    f"LLM {model} is unavailable ({health['last_error']}); retry in {retry_in:.0f}s"
+                )
+
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._create(model, base_url, temperature)
+                self._clients[key] = client
+                self._keys_by_client[id(client)] = key
+                self._health.setdefault(key, {
+                    "healthy": True,
+                    "failures": 0,
+                    "failed_at": 0.0,
+                    "last_error": None,
+                })
+        return client
+
+    def _create(self, model: str, base_url: str, temperature: float) -> Any:
+        try:
+            from langchain_community.chat_models import ChatOllama
+
+            print(f"Connecting to Ollama at {base_url} with model {model}...")
+            return ChatOllama(
+                model=model,
+                base_url=base_url,
+                temperature=temperature,
+                # Model residency in Ollama, not HTTP keep-alive: ChatOllama
+                # still opens a new HTTP session per call
+                keep_alive=settings.OLLAMA_KEEP_ALIVE,
+            )
+        except ImportError:
+            print("langchain_community not installed. Falling back to Mock.")
+        except Exception as e:
+            print(f"Ollama init failed: {e}")
+
+        print("Using MockLLM (Ollama connection failed or library missing)")
+        return MockLLM()
+
+    def record_success(self, client: Any) -> None:
+        key = self._keys_by_client.get(id(client))
+        if key is not None:
+            self._health[key].update(healthy=True, failures=0, last_error=None)
+
+    def record_failure(self, client: Any, error: Exception) -> None:
+        key = self._keys_by_client.get(id(client))
+        if key is not None:
+            health = self._health[key]
+            health.update(
+                healthy=False,
+                failures=health["failures"] + 1,
+                failed_at=time.monotonic(),
+                last_error=str(error),
+            )
+
+    def health(self) -> List[Dict[str, Any]]:
+        """Snapshot of every pooled client and its health state."""
+        return [
+            {
+                "model": key[0],
+                "base_url": key[1],
+                "temperature": key[2],
+                "client": type(self._clients[key]).__name__,
+                "healthy": state["healthy"],
+                "failures": state["failures"],
+                "last_error": state["last_error"],
+            }
+            for key, state in self._health.items()
+        ]
+
+    async def aclose(self) -> None:
+        """Release every pooled client; called from the app lifespan on shutdown."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._health.clear()
+            self._keys_by_client.clear()
+        for client in clients:
+            closer = getattr(client, "aclose", None) or getattr(client, "close", None)
+            if closer is None:
+                continue
+            try:
+                result = closer()
+                if hasattr(result, "__await__"):
+                    await result
+            except Exception as e:
+                print(f"Error closing LLM client: {e}")
+
+llm_pool = LLMClientPool(retry_after_seconds=settings.LLM_RETRY_AFTER_SECONDS)
+
 def get_llm(temperature: float = 0):
     """
     Get the LLM instance based on configuration.
-    Prioritizes Ollama (local) logic.
+    Prioritizes Ollama (local) logic; clients are shared via ``llm_pool``.
     """
-    try:
-        from langchain_community.chat_models import ChatOllama
-        
-        # User confirmed Ollama is served.
-        base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-        # Detected 'deepseek-r1:7b' via `ollama list`
-        model = os.getenv("OLLAMA_MODEL", "deepseek-r1:7b")
-        
-        print(f"Connecting to Ollama at {base_url} with model {model}...")
-        
-        llm = ChatOllama(
-            model=model,
-            base_url=base_url,
-            temperature=temperature
-        )
-        return llm
-    except ImportError:
-        print("langchain_community not installed. Falling back to Mock.")
-    except Exception as e:
-        print(f"Ollama init failed: {e}")
-
-    # Fallback to MockLLM
-    print("Using MockLLM (Ollama connection failed or library missing)")
-    return MockLLM()
+    return llm_pool.get(
+        model=settings.OLLAMA_MODEL,
+        base_url=settings.OLLAMA_BASE_URL,
+        temperature=temperature,
+    )
+
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    return _llm_semaphore
+
+async def ainvoke_llm(llm: Any, messages: Any, timeout: Optional[float] = None) -> Any:
+    """
+    Invoke an LLM without blocking the event loop.
+
+    Uses the client's native ``ainvoke`` when available and offloads
+    sync-only clients (e.g. MockLLM) to a worker thread. Calls are bounded
+    by LLM_MAX_CONCURRENCY and cancelled after ``timeout`` seconds
+    (raises asyncio.TimeoutError).
+    """
+    if timeout is None:
+        timeout = settings.LLM_TIMEOUT_SECONDS
+
+    async with _get_llm_semaphore():
+        if hasattr(llm, "ainvoke"):
+            call = llm.ainvoke(messages)
+        else:
+            call = asyncio.to_thread(llm.invoke, messages)
+        return await asyncio.wait_for(call, timeout=timeout)
+
+async def astream_llm(llm: Any, messages: Any, timeout: Optional[float] = None) -> AsyncIterator[str]:
+    """
+    Stream an LLM generation as text chunks without blocking the event loop.
+
+    Clients without ``astream`` (e.g. MockLLM) yield their whole answer as
+    one chunk. The call holds an LLM_MAX_CONCURRENCY slot until the caller
+    stops iterating; closing the generator early closes the client's
+    stream, which stops the model generating. Raises asyncio.TimeoutError
+    once ``timeout`` seconds have passed without the generation finishing.
+    """
+    if timeout is None:
+        timeout = settings.LLM_TIMEOUT_SECONDS
+    deadline = time.monotonic() + timeout
+
+    async with _get_llm_semaphore():
+        if not hasattr(llm, "astream"):
+            if hasattr(llm, "ainvoke"):
+                call = llm.ainvoke(messages)
+            else:
+                call = asyncio.to_thread(llm.invoke, messages)
+            response = await asyncio.wait_for(call, timeout=timeout)
+            yield str(response.content)
+            return
+
+        stream = llm.astream(messages)
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(stream.__anext__(), timeout=deadline - time.monotonic())
+                except StopAsyncIteration:
+                    return
+                if chunk.content:
+                    yield str(chunk.content)
+        finally:
+            await stream.aclose()
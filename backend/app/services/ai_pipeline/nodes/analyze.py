@@ -1,10 +1,15 @@
+import asyncio
+import copy
 import json
-from typing import Dict, Any, cast
+from typing import Dict, Any, List, Optional, Sequence, Tuple, cast
 from pathlib import Path
 import yaml
 
+from app.core.config import settings
 from app.services.ai_pipeline.state import TaskAnalysisState
-from app.services.ai_pipeline.llm_factory import get_llm
+from app.services.ai_pipeline.llm_factory import LLMUnavailableError, MockLLM, ainvoke_llm, get_llm, llm_pool
+from app.services.ai_pipeline.cache import analysis_cache, make_cache_key
+from app.services.ai_pipeline.streaming import generate_json
 
 def load_prompts() -> Dict[str, Any]:
     """Load prompt templates from YAML."""
@@ -14,21 +19,55 @@ def load_prompts() -> Dict[str, Any]:
 
 PROMPTS = load_prompts()
 
-async def analyze_task(state: TaskAnalysisState) -> dict:
-    """
-    Analyze task and estimate duration using LLM.
-    """
+# Analysis is deterministic at temperature 0, which makes its results cacheable
+ANALYSIS_TEMPERATURE = 0
+
+def build_analysis_prompt(state: TaskAnalysisState) -> Tuple[str, str]:
+    """Render the (system, user) prompt pair for a single task."""
     prompt_config = PROMPTS['task_analysis']
-    system_prompt = prompt_config['system']
     user_prompt = prompt_config['user_template'].format(
         title=state.title,
         description=state.description or 'No description',
         context_notes=state.context_notes or 'No context',
         priority=state.priority
     )
+    return prompt_config['system'], user_prompt
+
+def analysis_cache_key(state: TaskAnalysisState) -> str:
+    return make_cache_key(
+        settings.OLLAMA_MODEL, ANALYSIS_TEMPERATURE, *build_analysis_prompt(state)
+    )
+
+def strip_json_fences(content: Any) -> str:
+    """Remove markdown code fences the model may wrap around its JSON."""
+    content = str(content).strip()
+    if content.startswith("```json"):
+        content = content[7:]
+    if content.startswith("```"):
+        content = content[3:]
+    if content.endswith("```"):
+        content = content[:-3]
+    return content.strip()
+
+def to_analysis(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "estimated_duration_minutes": result.get('estimated_duration_minutes', 30),
+        "suggested_tags": result.get('suggested_tags', []),
+        "ai_reasoning": result.get('reasoning', 'AI analysis completed')
+    }
+
+async def analyze_task(state: TaskAnalysisState) -> dict:
+    """
+    Analyze task and estimate duration using LLM.
+    """
+    system_prompt, user_prompt = build_analysis_prompt(state)
+    cache_key = analysis_cache_key(state)
+    cached = await analysis_cache.get(cache_key)
+    if cached is not None:
+        return copy.deepcopy(cached)
     
-    # Get LLM (Ollama or Mock)
-    llm = get_llm(temperature=0)
+    # Get LLM (Ollama, or Mock when not installed); raises LLMUnavailableError while cooling down
+    llm = get_llm(temperature=ANALYSIS_TEMPERATURE)
     
     # Invoke
     try:
@@ -37,38 +76,113 @@ async def analyze_task(state: TaskAnalysisState) -> dict:
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt)
         ]
-        response = llm.invoke(messages)
-        content = response.content
+        # Streamed: stops as soon as the JSON answer is complete
+        content = await generate_json(llm, messages, node="analyze")
+        llm_pool.record_success(llm)
     except Exception as e:
-        # Fallback if invoke fails (e.g. Ollama connection refused)
-        print(f"LLM Invoke failed: {e}. Falling back to Mock.")
-        from app.services.ai_pipeline.llm_factory import MockLLM
-        llm = MockLLM()
-        full_prompt = f"{system_prompt}\n\n{user_prompt}"
-        response = llm.invoke(full_prompt)
-        content = response.content
+        llm_pool.record_failure(llm, e)
+        # Never substitute made-up estimates for a live request
+        print(f"LLM Invoke failed: {e}")
+        raise LLMUnavailableError(f"LLM analysis failed: {e}") from e
     
     # Clean up content (remove markdown fences if present)
-    content = str(content).strip()
-    if content.startswith("```json"):
-        content = content[7:]
-    if content.startswith("```"):
-        content = content[3:]
-    if content.endswith("```"):
-        content = content[:-3]
-    content = content.strip()
+    content = strip_json_fences(content)
 
     # Parse JSON
     try:
         result = json.loads(content)
-        return {
-            "estimated_duration_minutes": result.get('estimated_duration_minutes', 30),
-            "suggested_tags": result.get('suggested_tags', []),
-            "ai_reasoning": result.get('reasoning', 'AI analysis completed')
-        }
+        analysis = to_analysis(result)
+        # Only cache real model output, never MockLLM's
+        if not isinstance(llm, MockLLM):
+            await analysis_cache.set(cache_key, analysis)
+        return analysis
     except json.JSONDecodeError as e:
         print(f"JSON Decode Error: {e}. Content: {content}")
         return {
             "estimated_duration_minutes": 30,
             "ai_reasoning": f"Error parsing AI response: {str(e)}"
         }
+
+async def _analyze_group(states: Sequence[TaskAnalysisState]) -> List[Optional[dict]]:
+    """
+    Analyze several tasks with one multi-task prompt.
+    Returns one analysis per input; None where the model's answer had no usable entry.
+    """
+    prompt_config = PROMPTS['task_analysis_batch']
+    task_template = PROMPTS['task_analysis']['user_template']
+    rendered = "\n".join(
+        f"[{i}]\n" + task_template.format(
+            title=state.title,
+            description=state.description or 'No description',
+            context_notes=state.context_notes or 'No context',
+            priority=state.priority
+        )
+        for i, state in enumerate(states)
+    )
+    system_prompt = prompt_config['system']
+    user_prompt = prompt_config['user_template'].format(count=len(states), tasks=rendered)
+
+    llm = get_llm(temperature=ANALYSIS_TEMPERATURE)  # Raises LLMUnavailableError while cooling down
+    try:
+        from langchain_core.messages import SystemMessage, HumanMessage
+        response = await ainvoke_llm(llm, [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=user_prompt)
+        ])
+        llm_pool.record_success(llm)
+        data = json.loads(strip_json_fences(response.content))
+    except Exception as e:
+        if not isinstance(e, json.JSONDecodeError):
+            llm_pool.record_failure(llm, e)
+        print(f"Batch analysis of {len(states)} tasks failed: {e}. Falling back to single prompts.")
+        return [None] * len(states)
+
+    items = data.get("results", []) if isinstance(data, dict) else data
+    analyses: List[Optional[dict]] = [None] * len(states)
+    for item in items if isinstance(items, list) else []:
+        index = item.get("index") if isinstance(item, dict) else None
+        if isinstance(index, int) and 0 <= index < len(states) and analyses[index] is None:
+            analyses[index] = to_analysis(item)
+            if not isinstance(llm, MockLLM):
+                await analysis_cache.set(analysis_cache_key(states[index]), analyses[index])
+    return analyses
+
+async def analyze_tasks(
+    states: Sequence[TaskAnalysisState], group_size: Optional[int] = None
+) -> List[dict]:
+    """
+    Analyze many tasks, in input order.
+
+    Cached tasks are answered without the LLM. The rest are sent
+    ``group_size`` tasks per multi-task prompt (LLM_BATCH_ANALYSIS_SIZE;
+    1 means one prompt per task), with every group in flight at once and
+    concurrency bounded by the shared LLM semaphore. Tasks missing from a
+    multi-task answer are retried with the single-task prompt. Results are
+    cached under the single-task key, so either path can serve later calls.
+    """
+    group_size = group_size or settings.LLM_BATCH_ANALYSIS_SIZE
+    results: List[Optional[dict]] = [None] * len(states)
+    misses = []
+    for i, state in enumerate(states):
+        cached = await analysis_cache.get(analysis_cache_key(state))
+        if cached is not None:
+            results[i] = copy.deepcopy(cached)
+        else:
+            misses.append(i)
+
+    if group_size > 1:
+        # A trailing group of one goes through the regular single-task prompt
+        groups = [misses[j:j + group_size] for j in range(0, len(misses), group_size)]
+        groups = [group for group in groups if len(group) > 1]
+        answers = await asyncio.gather(
+            *(_analyze_group([states[i] for i in group]) for group in groups)
+        )
+        for group, analyses in zip(groups, answers):
+            for i, analysis in zip(group, analyses):
+                results[i] = analysis
+
+    leftovers = [i for i in misses if results[i] is None]
+    singles = await asyncio.gather(*(analyze_task(states[i]) for i in leftovers))
+    for i, analysis in zip(leftovers, singles):
+        results[i] = analysis
+    return cast(List[dict], results)
@@ -1,11 +1,14 @@
 import json
-from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from pathlib import Path
 import yaml
 
+from app.core.config import settings
 from app.services.ai_pipeline.state import TaskAnalysisState
-from app.services.ai_pipeline.llm_factory import get_llm
+from app.services.scheduling.slot_finder import find_free_slots
+from app.services.ai_pipeline.llm_factory import LLMUnavailableError, get_llm, llm_pool
+from app.services.ai_pipeline.nodes.analyze import strip_json_fences
+from app.services.ai_pipeline.streaming import generate_json
 
 def load_prompts() -> Dict[str, Any]:
     """Load prompt templates from YAML."""
@@ -15,30 +18,48 @@ def load_prompts() -> Dict[str, Any]:
 
 PROMPTS = load_prompts()
 
-def format_calendar_summary(events: List[dict]) -> str:
-    """Format calendar events for LLM prompt."""
-    if not events:
-        return "No upcoming events"
-    
-    summary_lines = []
-    for event in events[:10]:  # Limit to 10 events
-        start = event.get('start_time', 'Unknown')
-        end = event.get('end_time', 'Unknown')
-        title = event.get('title', 'Untitled')
-        summary_lines.append(f"- {start} to {end}: {title}")
-    
-    return "\n".join(summary_lines)
+def format_candidate_summary(candidates: List[dict]) -> str:
+    """Format candidate slots for the ranking prompt."""
+    return "\n".join(
+        f"{c['option_number']}. {c['start_time']} to {c['end_time']}"
+        for c in candidates
+    )
 
-async def schedule_task(state: TaskAnalysisState) -> dict:
+def build_candidates(state: TaskAnalysisState) -> List[dict]:
     """
-    Find optimal scheduling slots for the task using LLM.
+    Compute free slots deterministically from the user's calendar. Work
+    hours are UTC until users carry a timezone (see find_free_slots).
+    """
+    duration = state.estimated_duration_minutes or 30
+    search = dict(
+        events=state.calendar_events,
+        duration_minutes=duration,
+        work_start_hour=settings.SCHEDULING_WORK_START_HOUR,
+        work_end_hour=settings.SCHEDULING_WORK_END_HOUR,
+        max_slots=settings.SCHEDULING_MAX_OPTIONS,
+        horizon_days=settings.SCHEDULING_HORIZON_DAYS,
+    )
+    slots = find_free_slots(deadline=state.deadline, **search)
+    if not slots and state.deadline:
+        # Deadline already passed or fully booked: offer the next free slots anyway
+        slots = find_free_slots(**search)
+
+    return [
+        {
+            "option_number": i,
+            "start_time": start.isoformat(),
+            "end_time": end.isoformat(),
+            "reasoning": f"Free slot on {start:%A %d %b at %H:%M}",
+            "impact": "No conflicts",
+        }
+        for i, (start, end) in enumerate(slots, start=1)
+    ]
+
+async def rank_candidates(state: TaskAnalysisState, candidates: List[dict]) -> List[dict]:
+    """
+    Ask the LLM to rank and explain the candidates. Times always come from
+    the candidates; on any LLM or parse failure they are returned as-is.
     """
-    
-    # Get calendar events
-    calendar_events = state.calendar_events
-    calendar_summary = format_calendar_summary(calendar_events)
-    
-    # Build prompt
     prompt_config = PROMPTS['scheduling']
     system_prompt = prompt_config['system']
     user_prompt = prompt_config['user_template'].format(
@@ -47,13 +68,16 @@ async def schedule_task(state: TaskAnalysisState) -> dict:
         priority=state.priority,
         deadline=state.deadline or 'No deadline',
         context_notes=state.context_notes or 'No context',
-        calendar_summary=calendar_summary,
-        work_hours="9 AM - 6 PM", 
+        candidate_summary=format_candidate_summary(candidates),
+        work_hours=f"{settings.SCHEDULING_WORK_START_HOUR}:00 - {settings.SCHEDULING_WORK_END_HOUR}:00",
         focus_preference="Morning"
     )
     
-    # Get LLM (Ollama or Mock)
-    llm = get_llm(temperature=0)
+    try:
+        llm = get_llm(temperature=0)
+    except LLMUnavailableError as e:
+        print(f"{e}. Using unranked candidates.")
+        return candidates
     
     # Invoke
     try:
@@ -62,45 +86,51 @@ async def schedule_task(state: TaskAnalysisState) -> dict:
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt)
         ]
-        response = llm.invoke(messages)
-        content = response.content
+        content = await generate_json(llm, messages, node="schedule")
+        llm_pool.record_success(llm)
     except Exception as e:
-        print(f"LLM Invoke failed: {e}. Falling back to Mock.")
-        from app.services.ai_pipeline.llm_factory import MockLLM
-        llm = MockLLM()
-        full_prompt = f"{system_prompt}\n\n{user_prompt}"
-        response = llm.invoke(full_prompt)
-        content = response.content
+        llm_pool.record_failure(llm, e)
+        print(f"LLM ranking failed: {e}. Using unranked candidates.")
+        return candidates
     
-    # Clean up content
-    content = str(content).strip()
-    if content.startswith("```json"):
-        content = content[7:]
-    if content.startswith("```"):
-        content = content[3:]
-    if content.endswith("```"):
-        content = content[:-3]
-    content = content.strip()
+    content = strip_json_fences(content)
 
     # Parse JSON
     try:
         result = json.loads(content)
-        options = result.get('options', [])
-        # Ensure we have valid structure if LLM hallucinates
-        if not options:
-             raise ValueError("No options returned")
-             
-        return {"scheduling_options": options}
-        
-    except (json.JSONDecodeError, ValueError) as e:
+        ranking = result.get('options', [])
+    except (json.JSONDecodeError, AttributeError) as e:
         print(f"JSON Error in scheduling: {e}. Content: {content}")
-        # Fallback to current time
-        now = datetime.now()
-        fallback_option = {
-            "option_number": 1,
-            "start_time": (now + timedelta(hours=1)).isoformat(),
-            "end_time": (now + timedelta(hours=2)).isoformat(),
-            "reasoning": f"Fallback: Error parsing AI ({str(e)})",
-            "impact": "Unknown"
+        return candidates
+
+    by_number = {c["option_number"]: c for c in candidates}
+    ranked = []
+    for item in ranking:
+        try:
+            candidate = by_number.pop(int(item.get('option_number')))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            continue  # Unknown or duplicate candidate
+        ranked.append({
+            **candidate,
+            "reasoning": item.get('reasoning') or candidate["reasoning"],
+            "impact": item.get('impact') or candidate["impact"],
+        })
+    ranked.extend(by_number.values())
+
+    for i, option in enumerate(ranked, start=1):
+        option["option_number"] = i
+    return ranked
+
+async def schedule_task(state: TaskAnalysisState) -> dict:
+    """
+    Find free slots for the task with the slot finder, then let the LLM
+    rank and explain them.
+    """
+    candidates = build_candidates(state)
+    if not candidates:
+        return {
+            "scheduling_options": [],
+            "error_message": "No free slot found within the scheduling horizon",
         }
-        return {"scheduling_options": [fallback_option]}
+
+    return {"scheduling_options": await rank_candidates(state, candidates)}
@@ -0,0 +1,220 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.ai_pipeline.checkpointer import PooledSqliteSaver, current_checkpointer
+
+# 100-ns intervals between the UUID epoch (1582-10-15) and the Unix epoch
+_UUID_EPOCH_OFFSET = 0x01B21DD213814000
+
+def uuid6_floor(moment: datetime) -> str:
+    """
+    Smallest UUIDv6 string for ``moment`` (naive UTC). Checkpoint IDs are
+    UUIDv6, so ``checkpoint_id < uuid6_floor(t)`` means "written before t".
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    timestamp = int(moment.timestamp() * 10_000_000) + _UUID_EPOCH_OFFSET
+    uuid_int = ((timestamp >> 12) & 0xFFFFFFFFFFFF) << 80
+    uuid_int |= (0x6000 | (timestamp & 0x0FFF)) << 64  # version 6
+    uuid_int |= 0x8000 << 48  # RFC 4122 variant, zero clock_seq and node
+    return str(uuid.UUID(int=uuid_int))
+
+async def thread_is_completed(thread_id: str) -> bool:
+    """A thread is finished once the HITL graph has nothing left to run."""
+    from app.services.ai_pipeline.graph import get_hitl_app
+    app = await get_hitl_app()
+    snapshot = await app.aget_state({"configurable": {"thread_id": thread_id}})
+    return not snapshot.next
+
+class CheckpointRetention:
+    """
+    Background pruning for the SQLite checkpointer. Other backends are
+    not pruned: ``start`` logs a warning and runs nothing for them, so a
+    Postgres checkpointer needs its own retention job.
+
+    Each sweep walks threads in thread_id order, ``batch_size`` at a time:
+    threads idle for more than ``max_age_days`` are deleted, and completed
+    threads are compacted down to their latest checkpoint. Every batch is
+    one short write transaction, so workflows keep checkpointing between
+    batches. Freed pages are returned to the OS with incremental vacuum when
+    the database was created with auto_vacuum=INCREMENTAL (see checkpointer.py).
+    """
+
+    def __init__(
+        self,
+        max_age_days: float = 30,
+        batch_size: int = 200,
+        interval_seconds: float = 600,
+        pause_seconds: float = 0.01,
+        vacuum_pages: int = 250,
+    ):
+        self.max_age_days = max_age_days
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.pause_seconds = pause_seconds
+        self.vacuum_pages = vacuum_pages
+        self._task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, Any] = {
+            "sweeps": 0,
+            "threads_deleted": 0,
+            "threads_compacted": 0,
+            "checkpoints_deleted": 0,
+            "writes_deleted": 0,
+            "bytes_reclaimed": 0,
+            "last_sweep_at": None,
+            "last_sweep_ms": None,
+        }
+
+    async def _next_batch(self, saver: PooledSqliteSaver, after: str) -> List[tuple]:
+        async with saver.reader() as reader, reader.lock:
+            async with reader.conn.execute(
+                "SELECT thread_id, COUNT(*), MAX(checkpoint_id) FROM checkpoints "
+                "WHERE thread_id > ? GROUP BY thread_id ORDER BY thread_id LIMIT ?",
+                (after, self.batch_size),
+            ) as cur:
+                return await cur.fetchall()
+
+    async def _prune(self, saver: PooledSqliteSaver, expired: List[str], finished: List[str]) -> None:
+        writer = saver.writer
+        checkpoints = writes = 0
+        async with writer.lock:
+            for thread_id in expired:
+                cur = await writer.conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+                checkpoints += cur.rowcount
+                cur = await writer.conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+                writes += cur.rowcount
+            for thread_id in finished:
+                cur = await writer.conn.execute(
+                    "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_id NOT IN ("
+                    "SELECT MAX(checkpoint_id) FROM checkpoints WHERE thread_id = ? GROUP BY checkpoint_ns)",
+                    (thread_id, thread_id),
+                )
+                checkpoints += cur.rowcount
+                cur = await writer.conn.execute(
+                    "DELETE FROM writes WHERE thread_id = ? AND checkpoint_id NOT IN ("
+                    "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ?)",
+                    (thread_id, thread_id),
+                )
+                writes += cur.rowcount
+            await writer.conn.commit()
+        self.stats["threads_deleted"] += len(expired)
+        self.stats["threads_compacted"] += len(finished)
+        self.stats["checkpoints_deleted"] += checkpoints
+        self.stats["writes_deleted"] += writes
+
+    async def _pragma(self, saver: PooledSqliteSaver, name: str) -> int:
+        async with saver.writer.conn.execute(f"PRAGMA {name}") as cur:
+            return (await cur.fetchone())[0]
+
+    async def _reclaim(self, saver: PooledSqliteSaver) -> None:
+        """Give free pages back to the filesystem in small chunks."""
+        writer = saver.writer
+        async with writer.lock:
+            if await self._pragma(saver, "auto_vacuum") != 2:  # INCREMENTAL
+                return
+            page_size = await self._pragma(saver, "page_size")
+        while True:
+            async with writer.lock:
+                before = await self._pragma(saver, "freelist_count")
+                if before == 0:
+                    return
+                await writer.conn.execute(f"PRAGMA incremental_vacuum({self.vacuum_pages})")
+                await writer.conn.commit()
+                after = await self._pragma(saver, "freelist_count")
+            self.stats["bytes_reclaimed"] += (before - after) * page_size
+            if after >= before:
+                return
+            await asyncio.sleep(self.pause_seconds)
+
+    async def sweep(
+        self,
+        saver: Any,
+        is_completed: Callable[[str], Awaitable[bool]] = thread_is_completed,
+    ) -> Dict[str, Any]:
+        """Run one full pass over the checkpoint store. Returns cumulative stats."""
+        if not isinstance(saver, PooledSqliteSaver):
+            return self.stats
+        started = time.perf_counter()
+        cutoff = uuid6_floor(datetime.utcnow() - timedelta(days=self.max_age_days))
+        after = ""
+        while True:
+            rows = await self._next_batch(saver, after)
+            if not rows:
+                break
+            after = rows[-1][0]
+            expired = [thread_id for thread_id, _, latest in rows if latest < cutoff]
+            finished = []
+            for thread_id, count, latest in rows:
+                if count > 1 and latest >= cutoff and await is_completed(thread_id):
+                    finished.append(thread_id)
+            if expired or finished:
+                await self._prune(saver, expired, finished)
+            await asyncio.sleep(self.pause_seconds)
+
+        await self._reclaim(saver)
+        self.stats["sweeps"] += 1
+        self.stats["last_sweep_at"] = datetime.utcnow().isoformat()
+        self.stats["last_sweep_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return self.stats
+
+    async def describe(self, saver: Any) -> Dict[str, Any]:
+        """Current size of the checkpoint store."""
+        if not isinstance(saver, PooledSqliteSaver):
+            return {"backend": type(saver).__name__ if saver is not None else None}
+        async with saver.reader() as reader, reader.lock:
+            async with reader.conn.execute(
+                "SELECT COUNT(DISTINCT thread_id), COUNT(*) FROM checkpoints"
+            ) as cur:
+                threads, checkpoints = await cur.fetchone()
+            async with reader.conn.execute("SELECT COUNT(*) FROM writes") as cur:
+                (writes,) = await cur.fetchone()
+            sizes = {}
+            for name in ("page_count", "page_size", "freelist_count"):
+                async with reader.conn.execute(f"PRAGMA {name}") as cur:
+                    sizes[name] = (await cur.fetchone())[0]
+        return {
+            "backend": "sqlite",
+            "threads": threads,
+            "checkpoints": checkpoints,
+            "writes": writes,
+            "size_bytes": sizes["page_count"] * sizes["page_size"],
+            "free_bytes": sizes["freelist_count"] * sizes["page_size"],
+        }
+
+    async def _run(self) -> None:
+        while True:
+            saver = current_checkpointer()
+            if saver is not None:
+                try:
+                    await self.sweep(saver)
+                except Exception as e:
+                    print(f"Checkpoint retention sweep failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        saver = current_checkpointer()
+        if saver is not None and not isinstance(saver, PooledSqliteSaver):
+            print(
+                f"Warning: checkpoint retention only supports the SQLite checkpointer; "
+                f"{type(saver).__name__} checkpoints will not be pruned"
+            )
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+checkpoint_retention = CheckpointRetention(
+    max_age_days=settings.CHECKPOINT_RETENTION_DAYS,
+    batch_size=settings.CHECKPOINT_RETENTION_BATCH_SIZE,
+    interval_seconds=settings.CHECKPOINT_RETENTION_INTERVAL_SECONDS,
+)
@@ -0,0 +1,121 @@
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.services.ai_pipeline.llm_factory import ainvoke_llm, astream_llm
+
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
+
+class JsonObjectScanner:
+    """
+    Incremental scanner for the first complete JSON object in streamed
+    model output.
+
+    Text before the object (``<think>`` blocks, code fences, prose) is
+    skipped, and braces inside strings are ignored, so ``feed`` can say
+    the answer is complete as soon as its closing brace arrives.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.result: Optional[str] = None
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_think = False
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> Optional[str]:
+        """Add streamed text; returns the object's text once it is complete."""
+        self.buffer += text
+        buffer = self.buffer
+        while self.result is None and self._pos < len(buffer):
+            if self._start is None:
+                if not self._skip_preamble(buffer):
+                    return None
+                continue
+            char = buffer[self._pos]
+            self._pos += 1
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.result = buffer[self._start:self._pos]
+        return self.result
+
+    def _skip_preamble(self, buffer: str) -> bool:
+        """Advance through text before the object; False to wait for more input."""
+        if self._in_think:
+            end = buffer.find(THINK_CLOSE, self._pos)
+            if end < 0:
+                # Keep a possibly split closing tag for the next chunk
+                self._pos = max(self._pos, len(buffer) - len(THINK_CLOSE) + 1)
+                return False
+            self._in_think = False
+            self._pos = end + len(THINK_CLOSE)
+            return True
+
+        char = buffer[self._pos]
+        if char == "<":
+            head = buffer[self._pos:self._pos + len(THINK_OPEN)]
+            if head == THINK_OPEN:
+                self._in_think = True
+                self._pos += len(THINK_OPEN)
+                return True
+            if THINK_OPEN.startswith(head):
+                return False  # Wait for the rest of the tag
+        elif char == "{":
+            self._start = self._pos
+        if self._start is None:
+            self._pos += 1
+        return True
+
+def _token_writer(node: str):
+    """Writer for the running graph's custom stream, or None outside a graph run."""
+    try:
+        from langgraph.config import get_stream_writer
+        write = get_stream_writer()
+    except (ImportError, RuntimeError):
+        return None
+    return lambda text: write({"node": node, "text": text})
+
+async def generate_json(llm: Any, messages: Any, node: str) -> str:
+    """
+    Generate a node's JSON answer.
+
+    With LLM_STREAMING_ENABLED, tokens are streamed (and forwarded to the
+    graph's "custom" stream, tagged with ``node``) until the first JSON
+    object is complete; the rest of the generation, such as trailing text,
+    is cancelled. Otherwise this is a single blocking ``ainvoke_llm``
+    whose output is scanned the same way.
+
+    Returns:
+        The object's text, or the whole output if no object completed
+    """
+    scanner = JsonObjectScanner()
+    if not settings.LLM_STREAMING_ENABLED:
+        response = await ainvoke_llm(llm, messages)
+        return scanner.feed(str(response.content)) or scanner.buffer
+
+    write = _token_writer(node)
+    stream = astream_llm(llm, messages)
+    try:
+        async for text in stream:
+            if write is not None:
+                write(text)
+            if scanner.feed(text) is not None:
+                return scanner.result
+    finally:
+        await stream.aclose()
+    return scanner.buffer
@@ -1,21 +1,134 @@
-from typing import List, Dict, Optional
+import json
+import re
+import uuid
+from typing import Any, List, Dict, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from urllib.parse import quote, urlparse
+
+import httpx
+
+from app.core.config import settings
+from app.services.calendar_sync.http import SyncTokenExpired, calendar_http
+from app.services.calendar_sync.tokens import TokenRefreshError, TokenSource
+from app.services.scheduling.slot_finder import to_datetime
+
+class GoogleApiError(Exception):
+    """Non-2xx answer from the Google Calendar API."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Google Calendar API error {status}: {message}")
+        self.status = status
 
 class GoogleCalendarService:
-    """Service for syncing with Google Calendar."""
+    """
+    Service for syncing with Google Calendar.
+
+    Talks to the Calendar v3 REST API directly over the shared async HTTP
+    client, so calls never block the event loop and no discovery document
+    has to be fetched or parsed per instance.
+    """
     
-    def __init__(self, credentials_dict: Dict):
+    def __init__(
+        self,
+        credentials_dict: Dict,
+        http: Optional[httpx.AsyncClient] = None,
+        tokens: Optional[TokenSource] = None,
+    ):
         """
         Initialize Google Calendar service.
         
         Args:
-            credentials_dict: OAuth credentials as dictionary
+            credentials_dict: OAuth credentials as dictionary (token,
+                refresh_token, client_id, client_secret, token_uri)
+            http: Client to send with (default: the process-wide one)
+            tokens: Where to get access tokens (e.g. the shared
+                OAuthTokenManager) instead of refreshing them here
+        """
+        self.credentials = dict(credentials_dict)
+        self.base_url = settings.GOOGLE_CALENDAR_API_URL.rstrip('/')
+        self._http = http
+        self.tokens = tokens
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        return self._http or calendar_http.get()
+
+    async def _refresh_access_token(self) -> bool:
+        """Exchange the refresh token for a new access token; False if we can't."""
+        if self.tokens:
+            try:
+                self.credentials['token'] = await self.tokens(self.credentials.get('token'))
+            except TokenRefreshError as e:
+                print(f'An error occurred: {e}')
+                return False
+            return True
+        if not (self.credentials.get('refresh_token') and self.credentials.get('client_id')):
+            return False
+        response = await self.http.post(
+            self.credentials.get('token_uri') or settings.GOOGLE_TOKEN_URL,
+            data={
+                'grant_type': 'refresh_token',
+                'refresh_token': self.credentials['refresh_token'],
+                'client_id': self.credentials['client_id'],
+                'client_secret': self.credentials.get('client_secret'),
+            },
+        )
+        if response.status_code != 200:
+            return False
+        self.credentials['token'] = response.json()['access_token']
+        return True
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send with the access token, refreshing it once on 401."""
+        headers = kwargs.pop('headers', {})
+        if self.tokens:
+            self.credentials['token'] = await self.tokens(None)
+        for attempt in range(2):
+            response = await self.http.request(
+                method,
+                url,
+                headers={**headers, 'Authorization': f"Bearer {self.credentials.get('token')}"},
+                **kwargs,
+            )
+            if response.status_code == 401 and attempt == 0 and await self._refresh_access_token():
+                continue
+            return response
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> Dict:
+        """
+        Send one API call and return its JSON body.
+
+        Raises:
+            GoogleApiError: on a non-2xx answer
         """
-        self.credentials = Credentials(**credentials_dict)
-        self.service = build('calendar', 'v3', credentials=self.credentials)
+        response = await self._send(method, f"{self.base_url}{path}", **kwargs)
+        if response.status_code >= 400:
+            raise GoogleApiError(response.status_code, response.text)
+        return response.json() if response.content else {}
+
+    @staticmethod
+    def _events_path(calendar_id: str, event_id: Optional[str] = None) -> str:
+        path = f"/calendars/{quote(calendar_id, safe='')}/events"
+        return f"{path}/{quote(event_id, safe='')}" if event_id else path
+
+    @staticmethod
+    def _event_body(
+        title: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        description: Optional[str] = None,
+    ) -> Dict:
+        """Event resource with only the given fields, as PATCH expects."""
+        body = {}
+        if title:
+            body['summary'] = title
+        if description is not None:
+            body['description'] = description
+        if start_time:
+            body['start'] = {'dateTime': start_time.isoformat(), 'timeZone': 'UTC'}
+        if end_time:
+            body['end'] = {'dateTime': end_time.isoformat(), 'timeZone': 'UTC'}
+        return body
     
     async def list_events(
         self,
@@ -43,14 +156,13 @@ class GoogleCalendarService:
             if time_max is None:
                 time_max = time_min + timedelta(days=7)
             
-            events_result = self.service.events().list(
-                calendarId=calendar_id,
-                timeMin=time_min.isoformat() + 'Z',
-                timeMax=time_max.isoformat() + 'Z',
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+            events_result = await self._request('GET', self._events_path(calendar_id), params={
+                'timeMin': time_min.isoformat() + 'Z',
+                'timeMax': time_max.isoformat() + 'Z',
+                'maxResults': max_results,
+                'singleEvents': 'true',
+                'orderBy': 'startTime',
+            })
             
             events = events_result.get('items', [])
             
@@ -71,10 +183,75 @@ class GoogleCalendarService:
             
             return transformed_events
             
-        except HttpError as error:
+        except (GoogleApiError, httpx.HTTPError) as error:
             print(f'An error occurred: {error}')
             return []
     
+    async def list_changes(
+        self,
+        calendar_id: str = 'primary',
+        sync_token: Optional[str] = None,
+        time_min: Optional[datetime] = None,
+        page_size: int = 250
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Fetch every event changed since ``sync_token``, following pagination.
+        Without a token this is a full sync from ``time_min`` onwards.
+        
+        Args:
+            calendar_id: Calendar ID (default 'primary')
+            sync_token: nextSyncToken from the previous sync
+            time_min: Lower bound for a full sync (ignored with a token,
+                which Google doesn't allow to be combined with time filters)
+            page_size: Events per page
+            
+        Returns:
+            (changed events, token for the next sync). Cancelled events come
+            back with ``cancelled`` set so the caller can delete them.
+            
+        Raises:
+            SyncTokenExpired: on 410, the caller should drop its copy and
+                run a full sync
+        """
+        params = {
+            'maxResults': page_size,
+            'singleEvents': 'true',
+        }
+        if sync_token:
+            params['syncToken'] = sync_token
+        else:
+            params['showDeleted'] = 'false'
+            if time_min is not None:
+                params['timeMin'] = to_datetime(time_min).isoformat() + 'Z'
+
+        changes = []
+        while True:
+            try:
+                page = await self._request('GET', self._events_path(calendar_id), params=params)
+            except GoogleApiError as error:
+                if error.status == 410:
+                    raise SyncTokenExpired(str(error)) from error
+                raise
+            changes.extend(self._transform(event) for event in page.get('items', []))
+            params['pageToken'] = page.get('nextPageToken')
+            if not params['pageToken']:
+                return changes, page.get('nextSyncToken')
+
+    @staticmethod
+    def _transform(event: Dict) -> Dict:
+        """Google event resource to a calendar_events row (plus ``cancelled``)."""
+        start = event.get('start', {})
+        end = event.get('end', {})
+        return {
+            'external_id': event['id'],
+            'title': event.get('summary', 'Untitled'),
+            'start_time': to_datetime(start.get('dateTime', start.get('date'))),
+            'end_time': to_datetime(end.get('dateTime', end.get('date'))),
+            'is_fixed': True,  # Google events are considered fixed
+            'source': 'google',
+            'cancelled': event.get('status') == 'cancelled',
+        }
+    
     async def create_event(
         self,
         title: str,
@@ -98,30 +275,18 @@ class GoogleCalendarService:
             Created event data or None if failed
         """
         try:
-            event = {
-                'summary': title,
-                'description': description,
-                'start': {
-                    'dateTime': start_time.isoformat(),
-                    'timeZone': 'UTC',
-                },
-                'end': {
-                    'dateTime': end_time.isoformat(),
-                    'timeZone': 'UTC',
-                },
-            }
+            event = self._event_body(title, start_time, end_time, description)
             
-            created_event = self.service.events().insert(
-                calendarId=calendar_id,
-                body=event
-            ).execute()
+            created_event = await self._request(
+                'POST', self._events_path(calendar_id), json=event
+            )
             
             return {
                 'external_id': created_event.get('id'),
                 'link': created_event.get('htmlLink')
             }
             
-        except HttpError as error:
+        except (GoogleApiError, httpx.HTTPError) as error:
             print(f'An error occurred: {error}')
             return None
     
@@ -147,35 +312,114 @@ class GoogleCalendarService:
             True if successful, False otherwise
         """
         try:
-            # First get the event
-            event = self.service.events().get(
-                calendarId=calendar_id,
-                eventId=event_id
-            ).execute()
-            
-            # Update fields
-            if title:
-                event['summary'] = title
-            if start_time:
-                event['start'] = {
-                    'dateTime': start_time.isoformat(),
-                    'timeZone': 'UTC',
-                }
-            if end_time:
-                event['end'] = {
-                    'dateTime': end_time.isoformat(),
-                    'timeZone': 'UTC',
-                }
-            
-            # Update the event
-            self.service.events().update(
-                calendarId=calendar_id,
-                eventId=event_id,
-                body=event
-            ).execute()
+            # PATCH sends only the changed fields; no read-modify-write GET
+            await self._request(
+                'PATCH',
+                self._events_path(calendar_id, event_id),
+                json=self._event_body(title, start_time, end_time),
+            )
             
             return True
             
-        except HttpError as error:
+        except (GoogleApiError, httpx.HTTPError) as error:
             print(f'An error occurred: {error}')
             return False
+
+    async def batch_write(self, ops: Sequence[Dict], calendar_id: str = 'primary') -> List[Dict]:
+        """
+        Apply many event writes through the batch endpoint, up to
+        GOOGLE_CALENDAR_BATCH_SIZE operations per HTTP request.
+        
+        Args:
+            ops: One dict per write: ``op`` is 'insert', 'patch' or 'delete';
+                'patch' and 'delete' need ``event_id``; 'insert' and 'patch'
+                take title/start_time/end_time/description
+            calendar_id: Calendar ID
+            
+        Returns:
+            One result per op, in order: {'ok', 'status', 'external_id', 'error'}
+        """
+        results = []
+        size = settings.GOOGLE_CALENDAR_BATCH_SIZE
+        for i in range(0, len(ops), size):
+            chunk = ops[i:i + size]
+            try:
+                results.extend(await self._send_batch(chunk, calendar_id))
+            except (GoogleApiError, httpx.HTTPError) as error:
+                print(f'An error occurred: {error}')
+                status = getattr(error, 'status', None)
+                results.extend(
+                    {'ok': False, 'status': status, 'external_id': op.get('event_id'), 'error': str(error)}
+                    for op in chunk
+                )
+        return results
+
+    BATCH_METHODS = {'insert': 'POST', 'patch': 'PATCH', 'delete': 'DELETE'}
+
+    async def _send_batch(self, ops: Sequence[Dict], calendar_id: str) -> List[Dict]:
+        """One multipart/mixed batch request; results mapped back by Content-ID."""
+        boundary = f"batch_{uuid.uuid4().hex}"
+        api_path = urlparse(self.base_url).path
+        parts = []
+        for i, op in enumerate(ops):
+            method, event_id = self.BATCH_METHODS[op['op']], op.get('event_id')
+            request_line = f"{method} {api_path}{self._events_path(calendar_id, event_id)} HTTP/1.1"
+            if op['op'] == 'delete':
+                inner = f"{request_line}\r\n\r\n"
+            else:
+                body = self._event_body(
+                    op.get('title'), op.get('start_time'), op.get('end_time'), op.get('description')
+                )
+                inner = f"{request_line}\r\nContent-Type: application/json\r\n\r\n{json.dumps(body)}"
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <item{i}>\r\n\r\n{inner}\r\n"
+            )
+
+        response = await self._send(
+            'POST',
+            settings.GOOGLE_CALENDAR_BATCH_URL,
+            content=''.join(parts) + f"--{boundary}--\r\n",
+            headers={'Content-Type': f'multipart/mixed; boundary={boundary}'},
+        )
+        if response.status_code >= 400:
+            raise GoogleApiError(response.status_code, response.text)
+
+        answers = parse_batch_response(response.headers.get('content-type', ''), response.text)
+        results = []
+        for i, op in enumerate(ops):
+            status, body = answers.get(f"item{i}", (None, {}))
+            ok = status is not None and status < 300
+            results.append({
+                'ok': ok,
+                'status': status,
+                'external_id': body.get('id', op.get('event_id')) if ok else op.get('event_id'),
+                'error': None if ok else (body.get('error', {}).get('message') or 'No response'),
+            })
+        return results
+
+def parse_batch_response(content_type: str, text: str) -> Dict[str, Tuple[int, Dict]]:
+    """
+    Split a multipart/mixed batch response into {content id: (status, JSON body)}.
+    Google answers part ``<itemN>`` with Content-ID ``<response-itemN>``.
+    """
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    if not match:
+        return {}
+    answers = {}
+    for part in text.split(f"--{match.group(1)}"):
+        # Each part: outer MIME headers, then an HTTP response (status line,
+        # headers, body), each section separated by a blank line
+        sections = re.split(r'\r?\n\r?\n', part.strip(), maxsplit=2)
+        if len(sections) < 2:
+            continue
+        content_id = re.search(r'Content-ID:\s*<(?:response-)?([^>]+)>', sections[0], re.I)
+        status_line = re.match(r'HTTP/\S+\s+(\d{3})', sections[1])
+        if not (content_id and status_line):
+            continue
+        body = sections[2] if len(sections) > 2 else ''
+        try:
+            payload = json.loads(body) if body.strip() else {}
+        except ValueError:
+            payload = {}
+        answers[content_id.group(1)] = (int(status_line.group(1)), payload)
+    return answers
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+class SyncTokenExpired(Exception):
+    """The provider rejected our sync cursor (410 Gone); a full sync is needed."""
+
+class SharedHttpClient:
+    """
+    Process-wide httpx.AsyncClient for calendar provider APIs.
+
+    Every user's calendar service sends through the same client, so
+    connections (and their TLS sessions) are pooled and reused across
+    users instead of being set up per sync. An httpx client is bound to
+    the event loop it first ran on; a new one is made if the loop changes.
+    """
+
+    def __init__(self, timeout_seconds: float, max_connections: int, max_keepalive: int):
+        self.timeout_seconds = timeout_seconds
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                ),
+            )
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+calendar_http = SharedHttpClient(
+    timeout_seconds=settings.CALENDAR_HTTP_TIMEOUT_SECONDS,
+    max_connections=settings.CALENDAR_HTTP_MAX_CONNECTIONS,
+    max_keepalive=settings.CALENDAR_HTTP_MAX_KEEPALIVE,
+)
@@ -1,23 +1,123 @@
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
-import msal
+
+import httpx
+
+from app.core.config import settings
+from app.services.calendar_sync.http import SyncTokenExpired, calendar_http
+from app.services.calendar_sync.tokens import TokenRefreshError, TokenSource
+from app.services.scheduling.slot_finder import to_datetime
+
+class MicrosoftApiError(Exception):
+    """Non-2xx answer from Microsoft Graph."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Microsoft Graph error {status}: {message}")
+        self.status = status
 
 class MicrosoftCalendarService:
-    """Service for syncing with Microsoft Calendar (Outlook)."""
+    """
+    Service for syncing with Microsoft Calendar (Outlook) through
+    Microsoft Graph, over the shared async HTTP client.
+    """
     
-    GRAPH_API_ENDPOINT = 'https://graph.microsoft.com/v1.0'
+    # Fields we store; everything else is trimmed from list responses
+    EVENT_FIELDS = 'id,subject,start,end,isCancelled'
     
-    def __init__(self, access_token: str):
+    def __init__(
+        self,
+        access_token: Optional[str],
+        http: Optional[httpx.AsyncClient] = None,
+        tokens: Optional[TokenSource] = None,
+    ):
         """
         Initialize Microsoft Calendar service.
         
         Args:
             access_token: OAuth access token
+            http: Client to send with (default: the process-wide one)
+            tokens: Where to get (and, after a 401, refresh) access tokens,
+                e.g. the shared OAuthTokenManager
         """
         self.access_token = access_token
+        self.base_url = settings.MICROSOFT_GRAPH_API_URL.rstrip('/')
+        self.tokens = tokens
         self.headers = {
-            'Authorization': f'Bearer {access_token}',
-            'Content-Type': 'application/json'
+            # Event times come back in UTC instead of the mailbox's zone
+            'Prefer': 'outlook.timezone="UTC"',
+        }
+        self._http = http
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        return self._http or calendar_http.get()
+
+    async def _request(self, method: str, url: str, page_size: Optional[int] = None, **kwargs: Any) -> Dict:
+        """
+        Send one Graph call; ``url`` is a path or an absolute next/delta link.
+
+        Raises:
+            MicrosoftApiError: on a non-2xx answer
+        """
+        headers = dict(self.headers)
+        if page_size:
+            headers['Prefer'] += f', odata.maxpagesize={page_size}'
+        if not url.startswith('http'):
+            url = f"{self.base_url}{url}"
+        if self.tokens:
+            self.access_token = await self.tokens(None)
+        for attempt in range(2):
+            headers['Authorization'] = f'Bearer {self.access_token}'
+            response = await self.http.request(method, url, headers=headers, **kwargs)
+            if response.status_code == 401 and attempt == 0 and await self._refresh_access_token():
+                continue
+            break
+        if response.status_code >= 400:
+            raise MicrosoftApiError(response.status_code, response.text)
+        return response.json() if response.content else {}
+
+    async def _refresh_access_token(self) -> bool:
+        """Replace the rejected access token; False if there is no way to."""
+        if not self.tokens:
+            return False
+        try:
+            self.access_token = await self.tokens(self.access_token)
+        except TokenRefreshError as e:
+            print(f'An error occurred: {e}')
+            return False
+        return True
+
+    @staticmethod
+    def _event_body(
+        title: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        description: Optional[str] = None,
+    ) -> Dict:
+        """Graph event resource with only the given fields, as PATCH expects."""
+        body = {}
+        if title:
+            body['subject'] = title
+        if description is not None:
+            body['body'] = {'contentType': 'text', 'content': description}
+        if start_time:
+            body['start'] = {'dateTime': to_datetime(start_time).isoformat(), 'timeZone': 'UTC'}
+        if end_time:
+            body['end'] = {'dateTime': to_datetime(end_time).isoformat(), 'timeZone': 'UTC'}
+        return body
+
+    @staticmethod
+    def _transform(event: Dict) -> Dict:
+        """Graph event to a calendar_events row (plus ``cancelled``)."""
+        return {
+            'external_id': event['id'],
+            'title': event.get('subject') or 'Untitled',
+            'start_time': to_datetime((event.get('start') or {}).get('dateTime')),
+            'end_time': to_datetime((event.get('end') or {}).get('dateTime')),
+            'is_fixed': True,  # Outlook events are considered fixed
+            'source': 'microsoft',
+            # Delta reports deletions as {"id", "@removed"} stubs
+            'cancelled': '@removed' in event or bool(event.get('isCancelled')),
         }
     
     async def list_events(
@@ -37,14 +137,94 @@ class MicrosoftCalendarService:
         Returns:
             List of calendar events
         """
-        # This is a mock implementation for MVP
-        # TODO: Implement actual Microsoft Graph API calls
-        
-        # For now, return empty list
-        # Real implementation would use:
-        # GET https://graph.microsoft.com/v1.0/me/calendar/events
+        try:
+            if time_min is None:
+                time_min = datetime.utcnow()
+            
+            if time_max is None:
+                time_max = time_min + timedelta(days=7)
+            
+            url = '/me/calendarView'
+            params = {
+                'startDateTime': to_datetime(time_min).isoformat() + 'Z',
+                'endDateTime': to_datetime(time_max).isoformat() + 'Z',
+                '$select': self.EVENT_FIELDS,
+                '$orderby': 'start/dateTime',
+                '$top': min(max_results, settings.MICROSOFT_GRAPH_PAGE_SIZE),
+            }
+            events = []
+            while url and len(events) < max_results:
+                page = await self._request('GET', url, params=params)
+                events.extend(
+                    self._transform(event) for event in page.get('value', [])
+                    if not event.get('isCancelled')
+                )
+                # nextLink already carries every query parameter
+                url, params = page.get('@odata.nextLink'), None
+            
+            return [
+                {key: value for key, value in event.items() if key != 'cancelled'}
+                for event in events[:max_results]
+            ]
+            
+        except (MicrosoftApiError, httpx.HTTPError) as error:
+            print(f'An error occurred: {error}')
+            return []
+
+    async def list_changes(
+        self,
+        sync_token: Optional[str] = None,
+        time_min: Optional[datetime] = None,
+        time_max: Optional[datetime] = None,
+        page_size: Optional[int] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Fetch every event changed since the delta link ``sync_token``,
+        following @odata.nextLink pages until Graph hands out a new
+        @odata.deltaLink. Without a link this is a full sync of the
+        calendarView between ``time_min`` and ``time_max``, which the delta
+        link then keeps tracking.
         
-        return []
+        Args:
+            sync_token: @odata.deltaLink from the previous sync
+            time_min: Window start for a full sync (default: now)
+            time_max: Window end for a full sync (default: CALENDAR_SYNC_HORIZON_DAYS ahead)
+            page_size: Events per page (sent as Prefer: odata.maxpagesize)
+            
+        Returns:
+            (changed events, delta link for the next sync). Deleted and
+            cancelled events come back with ``cancelled`` set.
+            
+        Raises:
+            SyncTokenExpired: on 410, the caller should drop its copy and
+                run a full sync
+        """
+        page_size = page_size or settings.MICROSOFT_GRAPH_PAGE_SIZE
+        if sync_token:
+            url, params = sync_token, None
+        else:
+            time_min = to_datetime(time_min) or datetime.utcnow()
+            time_max = to_datetime(time_max) or time_min + timedelta(days=settings.CALENDAR_SYNC_HORIZON_DAYS)
+            # calendarView/delta doesn't accept $select; maxpagesize still trims each page
+            url = '/me/calendarView/delta'
+            params = {
+                'startDateTime': time_min.isoformat() + 'Z',
+                'endDateTime': time_max.isoformat() + 'Z',
+            }
+
+        changes = []
+        while True:
+            try:
+                page = await self._request('GET', url, page_size=page_size, params=params)
+            except MicrosoftApiError as error:
+                if error.status == 410:
+                    raise SyncTokenExpired(str(error)) from error
+                raise
+            changes.extend(self._transform(event) for event in page.get('value', []))
+            if '@odata.nextLink' in page:
+                url, params = page['@odata.nextLink'], None
+            else:
+                return changes, page.get('@odata.deltaLink')
     
     async def create_event(
         self,
@@ -65,16 +245,19 @@ class MicrosoftCalendarService:
         Returns:
             Created event data or None if failed
         """
-        # Mock implementation for MVP
-        # TODO: Implement actual Microsoft Graph API calls
-        
-        # Real implementation would use:
-        # POST https://graph.microsoft.com/v1.0/me/calendar/events
-        
-        return {
-            'external_id': 'mock-event-id',
-            'link': 'https://outlook.office.com/calendar'
-        }
+        try:
+            created_event = await self._request(
+                'POST', '/me/events', json=self._event_body(title, start_time, end_time, description)
+            )
+            
+            return {
+                'external_id': created_event.get('id'),
+                'link': created_event.get('webLink')
+            }
+            
+        except (MicrosoftApiError, httpx.HTTPError) as error:
+            print(f'An error occurred: {error}')
+            return None
     
     async def update_event(
         self,
@@ -95,10 +278,73 @@ class MicrosoftCalendarService:
         Returns:
             True if successful, False otherwise
         """
-        # Mock implementation for MVP
-        # TODO: Implement actual Microsoft Graph API calls
-        
-        # Real implementation would use:
-        # PATCH https://graph.microsoft.com/v1.0/me/calendar/events/{event_id}
+        try:
+            await self._request(
+                'PATCH', f'/me/events/{event_id}', json=self._event_body(title, start_time, end_time)
+            )
+            
+            return True
+            
+        except (MicrosoftApiError, httpx.HTTPError) as error:
+            print(f'An error occurred: {error}')
+            return False
+
+    BATCH_METHODS = {'insert': 'POST', 'patch': 'PATCH', 'delete': 'DELETE'}
+
+    async def batch_write(self, ops: Sequence[Dict]) -> List[Dict]:
+        """
+        Apply many event writes with JSON batching ($batch), up to
+        MICROSOFT_GRAPH_BATCH_SIZE operations per HTTP request.
         
-        return True
+        Args:
+            ops: Same shape as GoogleCalendarService.batch_write
+            
+        Returns:
+            One result per op, in order: {'ok', 'status', 'external_id', 'error'}
+        """
+        results = []
+        size = settings.MICROSOFT_GRAPH_BATCH_SIZE
+        for i in range(0, len(ops), size):
+            chunk = ops[i:i + size]
+            try:
+                results.extend(await self._send_batch(chunk))
+            except (MicrosoftApiError, httpx.HTTPError) as error:
+                print(f'An error occurred: {error}')
+                status = getattr(error, 'status', None)
+                results.extend(
+                    {'ok': False, 'status': status, 'external_id': op.get('event_id'), 'error': str(error)}
+                    for op in chunk
+                )
+        return results
+
+    async def _send_batch(self, ops: Sequence[Dict]) -> List[Dict]:
+        """One $batch request; responses come back in any order, keyed by id."""
+        requests = []
+        for i, op in enumerate(ops):
+            request = {
+                'id': str(i),
+                'method': self.BATCH_METHODS[op['op']],
+                'url': f"/me/events/{op['event_id']}" if op['op'] != 'insert' else '/me/events',
+            }
+            if op['op'] != 'delete':
+                request['headers'] = {'Content-Type': 'application/json'}
+                request['body'] = self._event_body(
+                    op.get('title'), op.get('start_time'), op.get('end_time'), op.get('description')
+                )
+            requests.append(request)
+
+        answer = await self._request('POST', '/$batch', json={'requests': requests})
+        responses = {response['id']: response for response in answer.get('responses', [])}
+        results = []
+        for i, op in enumerate(ops):
+            response = responses.get(str(i), {})
+            status = response.get('status')
+            body = response.get('body') or {}
+            ok = status is not None and status < 300
+            results.append({
+                'ok': ok,
+                'status': status,
+                'external_id': body.get('id', op.get('event_id')) if ok else op.get('event_id'),
+                'error': None if ok else (body.get('error', {}).get('message') or 'No response'),
+            })
+        return results
@@ -0,0 +1,364 @@
+import asyncio
+import random
+import time
+import zlib
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.user import UserIntegration
+from app.services.calendar_sync.sync import service_for, sync_calendar
+from app.services.scheduling.slot_finder import to_datetime
+
+SyncFn = Callable[[AsyncSession, UserIntegration, Any], Awaitable[Dict[str, Any]]]
+
+class TokenBucket:
+    """Async rate limiter: ``rate`` acquisitions per second, bursts up to ``burst``."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst or max(rate, 1)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waited_seconds = 0.0
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                self.waited_seconds += delay
+                await asyncio.sleep(delay)
+                self._updated = time.monotonic()
+                self._tokens = 0
+            else:
+                self._tokens -= 1
+
+class CircuitBreaker:
+    """
+    Stops calling a provider after ``failure_threshold`` consecutive failures.
+    Once ``reset_seconds`` have passed one trial call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 60):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def retry_after(self) -> float:
+        """Seconds until a trial call is allowed (0 when not open)."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+class CalendarSyncScheduler:
+    """
+    Background sync of every connected calendar (all user_integrations rows).
+
+    Each integration owns a slot, ``next_sync_at``. Integrations seen for
+    the first time get a stable slot spread over one interval (hashed from
+    user and provider) so a restart or a bulk import doesn't sync everyone
+    at once; after a sync the next slot is one interval later, plus jitter.
+    Each tick reads the integrations whose slot has come and starts their
+    syncs, bounded by ``max_concurrency`` overall and by a token bucket and
+    circuit breaker per provider. Failed syncs back off exponentially.
+
+    Lag (how long after its slot a sync started) and per-provider results
+    are kept for ``stats()``; per-user state lives on the integration row
+    (last_synced_at, next_sync_at, sync_failures, last_sync_error).
+
+    Run one scheduler per deployment: slots are claimed in memory, not
+    locked in the database.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        interval_seconds: float = 900,
+        jitter_seconds: float = 60,
+        max_concurrency: int = 50,
+        rate_limits: Optional[Dict[str, float]] = None,
+        timeout_seconds: float = 60,
+        retry_backoff_seconds: float = 60,
+        max_backoff_seconds: float = 3600,
+        breaker_failures: int = 5,
+        breaker_reset_seconds: float = 60,
+        claim_batch: int = 500,
+        poll_seconds: float = 1,
+        sync_fn: SyncFn = sync_calendar,
+        service_factory: Callable[[UserIntegration], Any] = service_for,
+    ):
+        self._session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.jitter_seconds = jitter_seconds
+        self.max_concurrency = max_concurrency
+        self.rate_limits = rate_limits or {"google": 10, "microsoft": 5}
+        self.timeout_seconds = timeout_seconds
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.breaker_failures = breaker_failures
+        self.breaker_reset_seconds = breaker_reset_seconds
+        self.claim_batch = claim_batch
+        self.poll_seconds = poll_seconds
+        self.sync_fn = sync_fn
+        self.service_factory = service_factory
+
+        self.limiters: Dict[str, TokenBucket] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight: Set[Tuple[str, str]] = set()
+        self._running: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._lags: deque = deque(maxlen=10000)
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.db.session import AsyncSessionLocal
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory
+
+    def _provider(self, provider: str) -> Tuple[TokenBucket, CircuitBreaker, Dict[str, int]]:
+        if provider not in self.breakers:
+            self.limiters[provider] = TokenBucket(self.rate_limits.get(provider, 1))
+            self.breakers[provider] = CircuitBreaker(self.breaker_failures, self.breaker_reset_seconds)
+            self.counters[provider] = {"synced": 0, "failed": 0, "skipped_open_circuit": 0}
+        return self.limiters[provider], self.breakers[provider], self.counters[provider]
+
+    def initial_slot(self, user_id: str, provider: str, now: datetime) -> datetime:
+        """Stable position within one interval, so first syncs are spread out."""
+        fraction = zlib.crc32(f"{user_id}:{provider}".encode()) / 2**32
+        return now + timedelta(seconds=fraction * self.interval_seconds)
+
+    def next_slot(self, due_at: datetime, now: datetime) -> datetime:
+        due_at, now = to_datetime(due_at), to_datetime(now)
+        jitter = random.uniform(-self.jitter_seconds, self.jitter_seconds) / 2
+        slot = due_at + timedelta(seconds=self.interval_seconds + jitter)
+        if slot <= now:
+            # Fell more than an interval behind: restart from now, spread by the jitter
+            slot = now + timedelta(seconds=random.uniform(0, self.jitter_seconds))
+        return slot
+
+    def backoff_slot(self, failures: int, now: datetime) -> datetime:
+        delay = min(self.max_backoff_seconds, self.retry_backoff_seconds * 2 ** (failures - 1))
+        return now + timedelta(seconds=delay + random.uniform(0, self.jitter_seconds))
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        """
+        One scheduler tick: assign slots to new integrations and start syncs
+        for those that are due. Returns the number of syncs started.
+        """
+        now = to_datetime(now) or datetime.utcnow()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        capacity = self.claim_batch - len(self._in_flight)
+        if capacity <= 0:
+            return 0
+
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(UserIntegration.user_id, UserIntegration.provider, UserIntegration.next_sync_at)
+                .where(or_(UserIntegration.next_sync_at.is_(None), UserIntegration.next_sync_at <= now))
+                .order_by(UserIntegration.next_sync_at.asc().nulls_first())
+                .limit(capacity + len(self._in_flight))
+            )
+            slots, deferred, due = [], [], []
+            for user_id, provider, next_sync_at in result.all():
+                if (user_id, provider) in self._in_flight:
+                    continue
+                if next_sync_at is None:
+                    slots.append({"user_id": user_id, "provider": provider,
+                                  "next_sync_at": self.initial_slot(user_id, provider, now)})
+                    continue
+                _, breaker, counters = self._provider(provider)
+                if breaker.state == "open":
+                    # Park it until the circuit may close instead of re-reading it every tick
+                    counters["skipped_open_circuit"] += 1
+                    deferred.append({"user_id": user_id, "provider": provider,
+                                     "next_sync_at": now + timedelta(seconds=breaker.retry_after())})
+                    continue
+                due.append((user_id, provider, to_datetime(next_sync_at)))
+            if slots or deferred:
+                await db.execute(update(UserIntegration), slots + deferred)
+                await db.commit()
+
+        for user_id, provider, due_at in due:
+            self._in_flight.add((user_id, provider))
+            task = asyncio.create_task(self._sync_one(user_id, provider, due_at))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+        return len(due)
+
+    async def _sync_one(self, user_id: str, provider: str, due_at: datetime) -> None:
+        limiter, breaker, counters = self._provider(provider)
+        try:
+            async with self._semaphore:
+                await limiter.acquire()
+                if not breaker.allow():
+                    # The circuit opened (or a trial is running) while this sync waited
+                    counters["skipped_open_circuit"] += 1
+                    await self._defer(user_id, provider, breaker.retry_after() or self.poll_seconds)
+                    return
+                started = datetime.utcnow()
+                self._lags.append(max(0.0, (started - to_datetime(due_at)).total_seconds()))
+                try:
+                    synced = await self._sync_integration(user_id, provider, due_at, started)
+                except Exception:
+                    breaker.record_failure()
+                    raise
+                if synced:
+                    breaker.record_success()
+                    counters["synced"] += 1
+        except Exception as e:
+            # Whatever failed, push the slot back so the row is not re-claimed every tick
+            counters["failed"] += 1
+            try:
+                await self._record_failure(user_id, provider, e)
+            except Exception as record_error:
+                print(f"Could not record calendar sync failure for {user_id}/{provider}: {record_error!r}")
+        finally:
+            self._in_flight.discard((user_id, provider))
+
+    async def _sync_integration(self, user_id: str, provider: str, due_at: datetime, started: datetime) -> bool:
+        """Run one sync and write the next slot with it; False if the integration is gone."""
+        async with self.session_factory() as db:
+            integration = await db.get(UserIntegration, (user_id, provider))
+            if integration is None:
+                return False
+            await db.commit()  # End the read; the slot is written with the sync's commit
+            # Written by the sync's own commit, with the new token
+            integration.next_sync_at = self.next_slot(due_at, started)
+            integration.sync_failures = 0
+            integration.last_sync_error = None
+            await asyncio.wait_for(
+                self.sync_fn(db, integration, self.service_factory(integration)),
+                timeout=self.timeout_seconds,
+            )
+            await db.commit()  # In case sync_fn left the slot uncommitted
+            return True
+
+    async def _defer(self, user_id: str, provider: str, seconds: float) -> None:
+        async with self.session_factory() as db:
+            await db.execute(
+                update(UserIntegration)
+                .where(UserIntegration.user_id == user_id, UserIntegration.provider == provider)
+                .values(next_sync_at=datetime.utcnow() + timedelta(seconds=seconds))
+            )
+            await db.commit()
+
+    async def _record_failure(self, user_id: str, provider: str, error: Exception) -> None:
+        async with self.session_factory() as db:
+            failures = (await db.scalar(
+                select(UserIntegration.sync_failures).where(
+                    UserIntegration.user_id == user_id, UserIntegration.provider == provider
+                )
+            ) or 0) + 1
+            print(f"Calendar sync failed for {user_id}/{provider} (attempt {failures}): {error!r}")
+            await db.execute(
+                update(UserIntegration)
+                .where(UserIntegration.user_id == user_id, UserIntegration.provider == provider)
+                .values(
+                    sync_failures=failures,
+                    last_sync_error=repr(error)[:500],
+                    next_sync_at=self.backoff_slot(failures, datetime.utcnow()),
+                )
+            )
+            await db.commit()
+
+    async def drain(self) -> None:
+        """Wait for every started sync to finish (for tests and scripts)."""
+        while self._running:
+            await asyncio.gather(*list(self._running), return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Calendar sync scheduler tick failed: {e}")
+            await asyncio.sleep(self.poll_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for task in list(self._running):
+            task.cancel()
+        await asyncio.gather(*list(self._running), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        lags = sorted(self._lags)
+
+        def percentile(p: float) -> float:
+            return round(lags[min(len(lags) - 1, int(p * len(lags)))], 3) if lags else 0.0
+
+        return {
+            "in_flight": len(self._in_flight),
+            "lag_seconds": {"p50": percentile(0.5), "p95": percentile(0.95), "max": percentile(1.0)},
+            "providers": {
+                provider: {
+                    **counters,
+                    "circuit": self.breakers[provider].state,
+                    "rate_limited_seconds": round(self.limiters[provider].waited_seconds, 3),
+                }
+                for provider, counters in self.counters.items()
+            },
+        }
+
+calendar_sync_scheduler = CalendarSyncScheduler(
+    interval_seconds=settings.CALENDAR_SYNC_INTERVAL_SECONDS,
+    jitter_seconds=settings.CALENDAR_SYNC_JITTER_SECONDS,
+    max_concurrency=settings.CALENDAR_SYNC_MAX_CONCURRENCY,
+    rate_limits=settings.CALENDAR_SYNC_RATE_LIMITS,
+    timeout_seconds=settings.CALENDAR_SYNC_TIMEOUT_SECONDS,
+    retry_backoff_seconds=settings.CALENDAR_SYNC_RETRY_BACKOFF_SECONDS,
+    max_backoff_seconds=settings.CALENDAR_SYNC_MAX_BACKOFF_SECONDS,
+    breaker_failures=settings.CALENDAR_SYNC_BREAKER_FAILURES,
+    breaker_reset_seconds=settings.CALENDAR_SYNC_BREAKER_RESET_SECONDS,
+    claim_batch=settings.CALENDAR_SYNC_CLAIM_BATCH,
+    poll_seconds=settings.CALENDAR_SYNC_POLL_SECONDS,
+)
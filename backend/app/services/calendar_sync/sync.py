@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.models.event import CalendarEvent
+from app.models.user import UserIntegration
+from app.services.calendar_sync.google import GoogleCalendarService
+from app.services.calendar_sync.http import SyncTokenExpired
+from app.services.calendar_sync.microsoft import MicrosoftCalendarService
+from app.services.calendar_sync.tokens import oauth_tokens
+from app.services.scheduling.freebusy import freebusy
+
+CalendarService = Union[GoogleCalendarService, MicrosoftCalendarService]
+SYNC_PROVIDERS = ("google", "microsoft")
+
+def google_credentials(integration: UserIntegration) -> Dict[str, Any]:
+    """OAuth credentials for GoogleCalendarService from a stored integration."""
+    return {
+        "token": integration.access_token,
+        "refresh_token": integration.refresh_token,
+        "token_uri": settings.GOOGLE_TOKEN_URL,
+        "client_id": settings.GOOGLE_CLIENT_ID,
+        "client_secret": settings.GOOGLE_CLIENT_SECRET,
+    }
+
+def service_for(integration: UserIntegration) -> CalendarService:
+    """Calendar client for a stored integration, with tokens from the shared OAuthTokenManager."""
+    tokens = partial(oauth_tokens.access_token, integration)
+    if integration.provider == "google":
+        return GoogleCalendarService(google_credentials(integration), tokens=tokens)
+    if integration.provider == "microsoft":
+        return MicrosoftCalendarService(integration.access_token, tokens=tokens)
+    raise ValueError(f"Unsupported provider: {integration.provider}")
+
+async def sync_calendar(
+    db: AsyncSession,
+    integration: UserIntegration,
+    service: Optional[CalendarService] = None,
+) -> Dict[str, Any]:
+    """
+    Bring the user's events from one provider in calendar_events up to date.
+
+    Only events changed since ``integration.sync_token`` (Google
+    nextSyncToken / Graph deltaLink) are fetched; the first sync, or one
+    after the provider expires the token with 410, pulls everything from
+    CALENDAR_SYNC_LOOKBACK_DAYS ago, upserting by external id and deleting
+    only the rows the provider no longer returns. Upserts, deletes and the new token are committed together,
+    so a failed sync is simply retried from the old token.
+
+    Args:
+        db: Database session
+        integration: The user's UserIntegration for the provider
+        service: Calendar client (built from the integration if omitted)
+
+    Returns:
+        {"status": "synced" | "resynced", "events_synced", "events_deleted"}
+    """
+    service = service or service_for(integration)
+    user_id = integration.user_id
+    source = integration.provider
+    if db.in_transaction():
+        # Don't hold a connection (or, on SQLite, a stale read snapshot that
+        # makes the later write fail) while waiting on the provider
+        await db.commit()
+    time_min = datetime.utcnow() - timedelta(days=settings.CALENDAR_SYNC_LOOKBACK_DAYS)
+
+    status = "synced"
+    full_sync = not integration.sync_token
+    try:
+        changes, next_token = await service.list_changes(
+            sync_token=integration.sync_token, time_min=time_min
+        )
+    except SyncTokenExpired:
+        print(f"{source} sync token expired for user {user_id}; running a full sync")
+        status, full_sync = "resynced", True
+        changes, next_token = await service.list_changes(time_min=time_min)
+
+    # Keep the last change per event; a page can't repeat one, but be safe
+    latest = {change["external_id"]: change for change in changes}
+    deleted = [external_id for external_id, change in latest.items() if change["cancelled"]]
+    upserts = [
+        {key: value for key, value in change.items() if key != "cancelled"}
+        for change in latest.values()
+        if not change["cancelled"] and change["start_time"] and change["end_time"]
+    ]
+
+    if full_sync:
+        # Rows the provider still returns are upserted in place, so local
+        # links such as task_id survive; only the ones it dropped go
+        returned = {row["external_id"] for row in upserts}
+        stored = await crud.event.get_external_ids(db, user_id=user_id, source=source)
+        deleted = sorted(stored - returned)
+    await crud.event.remove_external_many(
+        db, user_id=user_id, source=source, external_ids=deleted
+    )
+    await crud.event.upsert_external_many(db, user_id=user_id, source=source, rows=upserts)
+    integration.sync_token = next_token
+    integration.last_synced_at = datetime.utcnow()
+    await db.commit()
+
+    # Core writes bypass the ORM listeners that normally invalidate this
+    freebusy.invalidate(user_id)
+    return {"status": status, "events_synced": len(upserts), "events_deleted": len(deleted)}
+
+async def push_events(
+    db: AsyncSession,
+    integration: UserIntegration,
+    events: Sequence[CalendarEvent],
+    service: Optional[CalendarService] = None,
+) -> Dict[str, Any]:
+    """
+    Write local calendar_events rows (e.g. the blocks of a confirmed
+    schedule) to the integration's provider in batch requests.
+
+    Rows that already have an external_id from that provider are PATCHed;
+    the rest are inserted and then tagged with the provider and new id, so
+    the next incremental sync updates them in place instead of
+    duplicating them.
+
+    Returns:
+        {"events_written", "events_failed", "errors": [{"event_id", "error"}]}
+    """
+    service = service or service_for(integration)
+    source = integration.provider
+    ops = [
+        {
+            "op": "patch" if event.source == source and event.external_id else "insert",
+            "event_id": event.external_id if event.source == source else None,
+            "title": event.title,
+            "start_time": event.start_time,
+            "end_time": event.end_time,
+        }
+        for event in events
+    ]
+    results = await service.batch_write(ops)
+
+    linked: List[Dict[str, Any]] = []
+    errors = []
+    for event, op, result in zip(events, ops, results):
+        if not result["ok"]:
+            errors.append({"event_id": event.id, "error": result["error"]})
+        elif op["op"] == "insert":
+            linked.append({"id": event.id, "source": source, "external_id": result["external_id"]})
+    await crud.event.update_many(db, rows=linked)
+    return {
+        "events_written": len(ops) - len(errors),
+        "events_failed": len(errors),
+        "errors": errors,
+    }
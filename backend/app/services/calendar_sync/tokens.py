@@ -0,0 +1,162 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.models.user import UserIntegration
+from app.services.calendar_sync.http import calendar_http
+from app.services.scheduling.slot_finder import to_datetime
+
+# Current access token for one integration, given the token the provider just rejected (if any)
+TokenSource = Callable[[Optional[str]], Awaitable[str]]
+
+class TokenRefreshError(Exception):
+    """The provider would not exchange the refresh token for an access token."""
+
+    def __init__(self, provider: str, message: str, status: Optional[int] = None):
+        super().__init__(f"{provider} token refresh failed: {message}")
+        self.provider = provider
+        self.status = status
+
+class OAuthTokenManager:
+    """
+    Access tokens for calendar integrations, cached per worker.
+
+    A token is served from memory until ``refresh_margin_seconds`` before
+    its ``expires_at``. Refreshes are single-flight per (user, provider):
+    every sync that needs a new token while one is being fetched awaits
+    that same request, and the result is written back with a single
+    UPDATE of the integration row. Tokens with no known expiry are used
+    until the provider rejects them.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        refresh_margin_seconds: float = 300,
+        http: Optional[httpx.AsyncClient] = None,
+    ):
+        self._session_factory = session_factory
+        self.refresh_margin = timedelta(seconds=refresh_margin_seconds)
+        self._http = http
+        self._tokens: Dict[Tuple[str, str], Tuple[str, Optional[datetime]]] = {}
+        self._refreshing: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.hits = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.db.session import AsyncSessionLocal
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        return self._http or calendar_http.get()
+
+    def _usable(self, expires_at: Optional[datetime]) -> bool:
+        return expires_at is None or to_datetime(expires_at) - self.refresh_margin > datetime.utcnow()
+
+    async def access_token(self, integration: UserIntegration, rejected: Optional[str] = None) -> str:
+        """
+        A valid access token for the integration, refreshing it if needed.
+
+        Args:
+            integration: The user's UserIntegration
+            rejected: Token the provider just answered 401 to; it is
+                refreshed unless another caller already replaced it
+
+        Returns:
+            The access token
+
+        Raises:
+            TokenRefreshError: if a refresh was needed and failed
+        """
+        key = (integration.user_id, integration.provider)
+        cached = self._tokens.get(key)
+        if cached and cached[0] != rejected and self._usable(cached[1]):
+            self.hits += 1
+            return cached[0]
+        stored = integration.access_token
+        if stored and stored != rejected and self._usable(integration.expires_at):
+            self._tokens[key] = (stored, integration.expires_at)
+            return stored
+
+        refresh = self._refreshing.get(key)
+        if refresh is None:
+            refresh = asyncio.ensure_future(self._refresh(integration))
+            self._refreshing[key] = refresh
+            refresh.add_done_callback(lambda _: self._refreshing.pop(key, None))
+        # Shielded: a caller timing out must not cancel the refresh the others await
+        return await asyncio.shield(refresh)
+
+    def _refresh_request(self, integration: UserIntegration) -> Tuple[str, Dict[str, str]]:
+        data = {'grant_type': 'refresh_token', 'refresh_token': integration.refresh_token}
+        if integration.provider == "google":
+            data.update(client_id=settings.GOOGLE_CLIENT_ID, client_secret=settings.GOOGLE_CLIENT_SECRET)
+            return settings.GOOGLE_TOKEN_URL, data
+        if integration.provider == "microsoft":
+            data.update(
+                client_id=settings.MICROSOFT_CLIENT_ID,
+                client_secret=settings.MICROSOFT_CLIENT_SECRET,
+                scope=settings.MICROSOFT_GRAPH_SCOPES,
+            )
+            return settings.MICROSOFT_TOKEN_URL, data
+        raise TokenRefreshError(integration.provider, "unsupported provider")
+
+    async def _refresh(self, integration: UserIntegration) -> str:
+        user_id, provider = integration.user_id, integration.provider
+        if not integration.refresh_token:
+            raise TokenRefreshError(provider, "no refresh token stored")
+        url, data = self._refresh_request(integration)
+        try:
+            response = await self.http.post(url, data={k: v for k, v in data.items() if v is not None})
+        except httpx.HTTPError as e:
+            self.refresh_failures += 1
+            raise TokenRefreshError(provider, str(e)) from e
+        if response.status_code != 200:
+            self.refresh_failures += 1
+            raise TokenRefreshError(provider, response.text, response.status_code)
+
+        body = response.json()
+        values = {
+            'access_token': body['access_token'],
+            'expires_at': datetime.utcnow() + timedelta(seconds=int(body.get('expires_in', 3600))),
+        }
+        if body.get('refresh_token'):  # Microsoft rotates refresh tokens
+            values['refresh_token'] = body['refresh_token']
+        async with self.session_factory() as db:
+            await db.execute(
+                update(UserIntegration)
+                .where(UserIntegration.user_id == user_id, UserIntegration.provider == provider)
+                .values(**values)
+            )
+            await db.commit()
+        # Already persisted: keep the caller's instance current without dirtying it
+        for attribute, value in values.items():
+            set_committed_value(integration, attribute, value)
+
+        self.refreshes += 1
+        self._tokens[(user_id, provider)] = (values['access_token'], values['expires_at'])
+        return values['access_token']
+
+    def forget(self, user_id: str, provider: str) -> None:
+        """Drop a cached token, e.g. when the integration is disconnected."""
+        self._tokens.pop((user_id, provider), None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cached": len(self._tokens),
+            "hits": self.hits,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+        }
+
+oauth_tokens = OAuthTokenManager(refresh_margin_seconds=settings.OAUTH_TOKEN_REFRESH_MARGIN_SECONDS)
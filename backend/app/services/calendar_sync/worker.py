@@ -0,0 +1,33 @@
+"""
+Standalone calendar sync process.
+
+Run this with: python -m app.services.calendar_sync.worker
+
+Run exactly one, and leave CALENDAR_SYNC_RUN_SCHEDULER=false on the API
+processes. Free/busy caches in the API pick up the synced rows within
+FREEBUSY_CACHE_TTL_SECONDS.
+"""
+import asyncio
+import signal
+
+from app.services.calendar_sync.http import calendar_http
+from app.services.calendar_sync.scheduler import calendar_sync_scheduler
+
+async def main() -> None:
+    calendar_sync_scheduler.start()
+    print(
+        f"Calendar sync scheduler started: every {calendar_sync_scheduler.interval_seconds:.0f}s, "
+        f"{calendar_sync_scheduler.max_concurrency} concurrent syncs"
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    await calendar_sync_scheduler.stop()
+    await calendar_http.aclose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1 @@
+# AI Job Queue Service Module
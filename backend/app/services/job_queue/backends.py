@@ -0,0 +1,240 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+from sqlalchemy import func, or_, select, update
+
+from app.models.job import AIJob
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    """SQLite hands timezone=True columns back naive; they are stored as UTC."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+class Job(BaseModel):
+    """A unit of AI pipeline work waiting in (or taken from) the queue."""
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    kind: str
+    lane: str = "free"
+    payload: Dict[str, Any] = {}
+    status: str = "queued"
+    attempts: int = 0
+    max_attempts: int = 3
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=utcnow)
+    available_at: datetime = Field(default_factory=utcnow)
+    started_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    lease_expires_at: Optional[datetime] = None
+
+    @property
+    def is_last_attempt(self) -> bool:
+        return self.attempts + 1 >= self.max_attempts
+
+class InMemoryJobBackend:
+    """Non-durable backend for tests and single-process development."""
+
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+
+    async def add(self, job: Job) -> None:
+        self._jobs[job.id] = job
+
+    async def claim(self, lane: str, now: datetime, lease_until: datetime) -> Optional[Job]:
+        ready = [
+            job for job in self._jobs.values()
+            if job.lane == lane and job.status == "queued" and job.available_at <= now
+        ]
+        if not ready:
+            return None
+        job = min(ready, key=lambda j: (j.available_at, j.created_at))
+        job.status = "running"
+        job.started_at = job.heartbeat_at = now
+        job.lease_expires_at = lease_until
+        return job.model_copy()
+
+    async def heartbeat(self, job: Job, now: datetime, lease_until: datetime) -> bool:
+        stored = self._jobs.get(job.id)
+        if stored is None or stored.status != "running":
+            return False
+        stored.heartbeat_at = now
+        stored.lease_expires_at = lease_until
+        return True
+
+    async def complete(self, job: Job, now: datetime) -> None:
+        self._jobs.pop(job.id, None)
+
+    async def fail(self, job: Job, error: str, retry_at: Optional[datetime]) -> None:
+        stored = self._jobs.get(job.id)
+        if stored is None:
+            return
+        stored.attempts += 1
+        stored.last_error = error
+        if retry_at is None:
+            stored.status = "failed"
+        else:
+            stored.status = "queued"
+            stored.available_at = retry_at
+
+    async def position(self, job: Job) -> int:
+        """Number of queued jobs ahead of this one in its lane."""
+        return sum(
+            1 for other in self._jobs.values()
+            if other.lane == job.lane and other.status == "queued"
+            and (other.available_at, other.created_at) < (job.available_at, job.created_at)
+        )
+
+    async def pending_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            if job.status == "queued":
+                counts[job.lane] = counts.get(job.lane, 0) + 1
+        return counts
+
+    async def recover(self, now: datetime) -> int:
+        stale = [
+            job for job in self._jobs.values()
+            if job.status == "running" and (job.lease_expires_at is None or job.lease_expires_at < now)
+        ]
+        for job in stale:
+            job.status = "queued"
+        return len(stale)
+
+class DatabaseJobBackend:
+    """
+    Durable backend on the ai_jobs table. Claims are a conditional UPDATE
+    (status queued -> running), so several worker processes can share it.
+    A claim takes a lease that the worker renews while the job runs; only
+    jobs whose lease has run out are handed back by ``recover``.
+    """
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    @staticmethod
+    def _to_job(row: AIJob) -> Job:
+        return Job(
+            id=row.id,
+            kind=row.kind,
+            lane=row.lane,
+            payload=json.loads(row.payload),
+            status=row.status,
+            attempts=row.attempts,
+            max_attempts=row.max_attempts,
+            last_error=row.last_error,
+            created_at=_aware(row.created_at or row.available_at),
+            available_at=_aware(row.available_at),
+            started_at=_aware(row.started_at),
+            heartbeat_at=_aware(row.heartbeat_at),
+            lease_expires_at=_aware(row.lease_expires_at),
+        )
+
+    async def add(self, job: Job) -> None:
+        async with self.session_factory() as db:
+            db.add(AIJob(
+                id=job.id,
+                kind=job.kind,
+                lane=job.lane,
+                payload=json.dumps(job.payload, default=str),
+                status=job.status,
+                attempts=job.attempts,
+                max_attempts=job.max_attempts,
+                created_at=job.created_at,
+                available_at=job.available_at,
+            ))
+            await db.commit()
+
+    async def claim(self, lane: str, now: datetime, lease_until: datetime) -> Optional[Job]:
+        async with self.session_factory() as db:
+            for _ in range(3):  # Another worker may win the race for a row
+                result = await db.execute(
+                    select(AIJob)
+                    .filter(AIJob.lane == lane, AIJob.status == "queued", AIJob.available_at <= now)
+                    .order_by(AIJob.available_at, AIJob.created_at)
+                    .limit(1)
+                )
+                row = result.scalars().first()
+                if row is None:
+                    return None
+                claimed = await db.execute(
+                    update(AIJob)
+                    .where(AIJob.id == row.id, AIJob.status == "queued")
+                    .values(status="running", started_at=now, heartbeat_at=now, lease_expires_at=lease_until)
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+                if claimed.rowcount == 1:
+                    job = self._to_job(row)
+                    job.status = "running"
+                    job.started_at = job.heartbeat_at = now
+                    job.lease_expires_at = lease_until
+                    return job
+        return None
+
+    async def complete(self, job: Job, now: datetime) -> None:
+        async with self.session_factory() as db:
+            await db.execute(
+                update(AIJob).where(AIJob.id == job.id).values(status="done", finished_at=now)
+            )
+            await db.commit()
+
+    async def fail(self, job: Job, error: str, retry_at: Optional[datetime]) -> None:
+        values: Dict[str, Any] = {"attempts": job.attempts + 1, "last_error": error}
+        if retry_at is None:
+            values.update(status="failed", finished_at=utcnow())
+        else:
+            values.update(status="queued", available_at=retry_at)
+        async with self.session_factory() as db:
+            await db.execute(update(AIJob).where(AIJob.id == job.id).values(**values))
+            await db.commit()
+
+    async def position(self, job: Job) -> int:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(func.count(AIJob.id)).filter(
+                    AIJob.lane == job.lane,
+                    AIJob.status == "queued",
+                    AIJob.available_at < job.available_at,
+                )
+            )
+            return result.scalar() or 0
+
+    async def pending_counts(self) -> Dict[str, int]:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(AIJob.lane, func.count(AIJob.id))
+                .filter(AIJob.status == "queued")
+                .group_by(AIJob.lane)
+            )
+            return {lane: count for lane, count in result.all()}
+
+    async def heartbeat(self, job: Job, now: datetime, lease_until: datetime) -> bool:
+        """Extend a running job's lease; False if it is no longer running."""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(AIJob)
+                .where(AIJob.id == job.id, AIJob.status == "running")
+                .values(heartbeat_at=now, lease_expires_at=lease_until)
+            )
+            await db.commit()
+            return result.rowcount == 1
+
+    async def recover(self, now: datetime) -> int:
+        """Re-queue running jobs whose worker stopped renewing the lease."""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(AIJob)
+                .where(
+                    AIJob.status == "running",
+                    or_(AIJob.lease_expires_at.is_(None), AIJob.lease_expires_at < now),
+                )
+                .values(status="queued")
+            )
+            await db.commit()
+            return result.rowcount or 0
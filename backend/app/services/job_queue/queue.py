@@ -0,0 +1,244 @@
+import asyncio
+import itertools
+import time
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.job_queue.backends import DatabaseJobBackend, InMemoryJobBackend, Job, utcnow
+
+JobHandler = Callable[[Job], Awaitable[Any]]
+
+class QueueFullError(Exception):
+    """Raised by enqueue when the pending backlog is at its limit."""
+
+class LaneMetrics:
+    """Counters and timings for one priority lane (per process)."""
+
+    def __init__(self):
+        self.enqueued = 0
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+        self.in_flight = 0
+        self.total_wait_ms = 0.0
+        self.total_run_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def as_dict(self, elapsed_seconds: float) -> Dict[str, Any]:
+        started = self.completed + self.failed + self.retried
+        return {
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "in_flight": self.in_flight,
+            "avg_wait_ms": round(self.total_wait_ms / started, 2) if started else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 2),
+            "avg_run_ms": round(self.total_run_ms / started, 2) if started else 0.0,
+            "throughput_per_min": round(self.completed * 60 / elapsed_seconds, 2) if elapsed_seconds else 0.0,
+        }
+
+class AIJobQueue:
+    """
+    Bounded queue of AI pipeline runs served by a pool of asyncio workers.
+
+    Jobs are placed in a lane by the user's subscription tier. Workers pick
+    lanes by weighted round-robin (e.g. pro:3, free:1) so paid users are
+    served first without starving the free lane. Failed jobs are retried
+    with exponential backoff up to ``max_attempts``. A running job holds a
+    lease of ``lease_seconds``, renewed while it runs; jobs whose lease
+    lapses (their worker died) are re-queued by any idle worker.
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        workers: int = 2,
+        lane_weights: Optional[Dict[str, int]] = None,
+        default_lane: str = "free",
+        max_pending: int = 1000,
+        max_attempts: int = 3,
+        retry_backoff_seconds: float = 5,
+        poll_seconds: float = 1,
+        lease_seconds: float = 60,
+    ):
+        self.backend = backend
+        self.workers = workers
+        self.lane_weights = lane_weights or {"pro": 3, "free": 1}
+        self.default_lane = default_lane if default_lane in self.lane_weights else next(iter(self.lane_weights))
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wake = asyncio.Event()
+        self._schedule = [
+            lane for lane, weight in self.lane_weights.items() for _ in range(max(weight, 1))
+        ]
+        self._turn = itertools.count()
+        self.metrics: Dict[str, LaneMetrics] = {lane: LaneMetrics() for lane in self.lane_weights}
+        self._started_at = time.monotonic()
+        self._next_recovery = 0.0
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    def lane_for(self, tier: Optional[str]) -> str:
+        return tier if tier in self.lane_weights else self.default_lane
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any], tier: Optional[str] = None) -> Job:
+        """
+        Persist a job and wake a worker.
+
+        Raises:
+            QueueFullError: If ``max_pending`` jobs are already waiting
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        pending = sum((await self.backend.pending_counts()).values())
+        if pending >= self.max_pending:
+            raise QueueFullError(f"AI queue is full ({pending} jobs pending)")
+
+        job = Job(kind=kind, lane=self.lane_for(tier), payload=payload, max_attempts=self.max_attempts)
+        await self.backend.add(job)
+        self.metrics[job.lane].enqueued += 1
+        self._wake.set()
+        return job
+
+    async def position(self, job: Job) -> int:
+        return await self.backend.position(job)
+
+    def _lane_order(self) -> List[str]:
+        """Lanes to try for the next claim: this turn's lane first, then the rest."""
+        preferred = self._schedule[next(self._turn) % len(self._schedule)]
+        return [preferred] + [lane for lane in self.lane_weights if lane != preferred]
+
+    async def _claim_next(self) -> Optional[Job]:
+        now = utcnow()
+        lease_until = now + timedelta(seconds=self.lease_seconds)
+        for lane in self._lane_order():
+            job = await self.backend.claim(lane, now, lease_until)
+            if job is not None:
+                return job
+        return None
+
+    async def _heartbeat(self, job: Job) -> None:
+        """Renew the job's lease until cancelled when the job finishes."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            now = utcnow()
+            try:
+                await self.backend.heartbeat(job, now, now + timedelta(seconds=self.lease_seconds))
+            except Exception as e:
+                print(f"AI job {job.id} heartbeat failed: {e}")
+
+    async def _recover_expired(self) -> int:
+        """Re-queue jobs whose lease lapsed, at most once per lease period."""
+        if time.monotonic() < self._next_recovery:
+            return 0
+        self._next_recovery = time.monotonic() + self.lease_seconds
+        recovered = await self.backend.recover(utcnow())
+        if recovered:
+            print(f"Re-queued {recovered} AI jobs whose worker stopped heartbeating")
+        return recovered
+
+    async def _execute(self, job: Job) -> None:
+        lane = self.metrics.setdefault(job.lane, LaneMetrics())
+        lane.in_flight += 1
+        started = time.perf_counter()
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            wait_ms = (job.started_at - job.available_at).total_seconds() * 1000
+            lane.total_wait_ms += wait_ms
+            lane.max_wait_ms = max(lane.max_wait_ms, wait_ms)
+            await self._handlers[job.kind](job)
+        except Exception as e:
+            if job.is_last_attempt:
+                print(f"AI job {job.id} failed after {job.attempts + 1} attempts: {e}")
+                await self.backend.fail(job, str(e), retry_at=None)
+                lane.failed += 1
+            else:
+                delay = self.retry_backoff_seconds * (2 ** job.attempts)
+                print(f"AI job {job.id} failed (attempt {job.attempts + 1}), retrying in {delay}s: {e}")
+                await self.backend.fail(job, str(e), retry_at=utcnow() + timedelta(seconds=delay))
+                lane.retried += 1
+        else:
+            await self.backend.complete(job, utcnow())
+            lane.completed += 1
+        finally:
+            heartbeat.cancel()
+            lane.in_flight -= 1
+            lane.total_run_ms += (time.perf_counter() - started) * 1000
+
+    async def _worker(self) -> None:
+        while True:
+            # Clear before claiming so an enqueue during the claim still wakes us
+            self._wake.clear()
+            try:
+                job = await self._claim_next()
+                if job is None:
+                    await self._recover_expired()
+            except Exception as e:
+                print(f"AI job claim failed: {e}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._execute(job)
+
+    async def run_until_idle(self) -> None:
+        """Drain every job that is ready now (for tests and scripts)."""
+        while (job := await self._claim_next()) is not None:
+            await self._execute(job)
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        await self._recover_expired()
+        self._started_at = time.monotonic()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def stats(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self._started_at
+        pending = await self.backend.pending_counts()
+        lanes = {}
+        for lane in sorted(set(self.metrics) | set(pending)):
+            metrics = self.metrics.get(lane) or LaneMetrics()
+            lanes[lane] = {"pending": pending.get(lane, 0), **metrics.as_dict(elapsed)}
+        return {
+            "workers": len(self._tasks),
+            "max_pending": self.max_pending,
+            "lanes": lanes,
+        }
+
+def create_job_queue() -> AIJobQueue:
+    if settings.AI_QUEUE_BACKEND == "memory":
+        backend = InMemoryJobBackend()
+    else:
+        from app.db.session import AsyncSessionLocal
+        backend = DatabaseJobBackend(AsyncSessionLocal)
+    return AIJobQueue(
+        backend,
+        workers=settings.AI_QUEUE_WORKERS,
+        lane_weights=settings.AI_QUEUE_LANE_WEIGHTS,
+        max_pending=settings.AI_QUEUE_MAX_PENDING,
+        max_attempts=settings.AI_QUEUE_MAX_ATTEMPTS,
+        retry_backoff_seconds=settings.AI_QUEUE_RETRY_BACKOFF_SECONDS,
+        poll_seconds=settings.AI_QUEUE_POLL_SECONDS,
+        lease_seconds=settings.AI_QUEUE_LEASE_SECONDS,
+    )
+
+ai_job_queue = create_job_queue()
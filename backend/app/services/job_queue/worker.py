@@ -0,0 +1,45 @@
+"""
+Standalone AI worker process.
+
+Run this with: python -m app.services.job_queue.worker
+
+Use it with AI_QUEUE_BACKEND=database, AI_QUEUE_RUN_WORKERS=false on the API
+processes, and AI_EVENTS_BACKEND=redis so progress events reach the SSE
+streams served by the API.
+"""
+import asyncio
+import signal
+
+# Importing the endpoint module registers the "run"/"resume" job handlers
+from app.api.v1.endpoints import ai  # noqa: F401
+from app.core.config import settings
+from app.services.ai_pipeline.checkpointer import close_checkpointer
+from app.services.ai_pipeline.graph import warm_up_graphs
+from app.services.ai_pipeline.events import event_broker
+from app.services.ai_pipeline.llm_factory import llm_pool
+from app.services.ai_pipeline.retention import checkpoint_retention
+from app.services.job_queue.queue import ai_job_queue
+
+async def main() -> None:
+    if settings.AI_QUEUE_BACKEND == "memory":
+        print("Warning: the memory queue backend is not shared with the API process")
+    await warm_up_graphs()
+    await ai_job_queue.start()
+    if settings.CHECKPOINT_RETENTION_ENABLED:
+        checkpoint_retention.start()
+    print(f"AI worker started with {ai_job_queue.workers} workers")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    await ai_job_queue.stop()
+    await checkpoint_retention.stop()
+    await close_checkpointer()
+    await llm_pool.aclose()
+    await event_broker.aclose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1 @@
+# Scheduling Service Module
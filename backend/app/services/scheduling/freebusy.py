@@ -0,0 +1,145 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, time, timedelta
+from typing import List, Optional
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.cache import LRUTier
+from app.core.config import settings
+from app.models.event import CalendarEvent
+from app.services.scheduling.slot_finder import Interval, merge_intervals, to_datetime
+
+class BusyIndex:
+    """
+    Merged busy intervals for one user over a loaded window, stored as two
+    parallel sorted arrays so overlap and gap queries are O(log n) bisects.
+    """
+
+    def __init__(self, intervals: List[Interval], window_start: datetime, window_end: datetime):
+        merged = merge_intervals(intervals)
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+        self.window_start = window_start
+        self.window_end = window_end
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        return self.window_start <= start and end <= self.window_end
+
+    def is_busy(self, start: datetime, end: datetime) -> bool:
+        """True if any busy interval overlaps [start, end)."""
+        i = bisect_left(self.starts, end) - 1
+        return i >= 0 and self.ends[i] > start
+
+    def busy_between(self, start: datetime, end: datetime) -> List[Interval]:
+        lo = bisect_right(self.ends, start)
+        hi = bisect_left(self.starts, end)
+        return list(zip(self.starts[lo:hi], self.ends[lo:hi]))
+
+    def free_between(self, start: datetime, end: datetime) -> List[Interval]:
+        gaps = []
+        cursor = start
+        for busy_start, busy_end in self.busy_between(start, end):
+            if busy_start > cursor:
+                gaps.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def as_events(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[dict]:
+        """Busy intervals as serializable event dicts (for pipeline state)."""
+        intervals = self.busy_between(start or self.window_start, end or self.window_end)
+        return [
+            {"start_time": s.isoformat(), "end_time": e.isoformat(), "title": "Busy"}
+            for s, e in intervals
+        ]
+
+class FreeBusyService:
+    """
+    Per-user BusyIndex cache backed by a range query on calendar_events.
+
+    Indexes are invalidated when a transaction that wrote a CalendarEvent
+    through the ORM commits; crud.event's Core writes invalidate after
+    their own commit, and other bulk/Core writers must call ``invalidate``
+    themselves. The TTL bounds staleness from writes
+    made by other workers.
+    """
+
+    def __init__(self, max_users: int, ttl_seconds: int):
+        self._indexes = LRUTier(max_entries=max_users, ttl_seconds=ttl_seconds)
+
+    async def get_index(
+        self, db: AsyncSession, user_id: str, start: datetime, end: datetime
+    ) -> BusyIndex:
+        user_id = str(user_id)
+        start, end = to_datetime(start), to_datetime(end)
+        index = self._indexes.get(user_id)
+        if index is not None and index.covers(start, end):
+            return index
+
+        if index is not None:
+            # Grow the cached window instead of thrashing between windows
+            start = min(start, index.window_start)
+            end = max(end, index.window_end)
+
+        events = await crud.event.get_range(db, user_id=user_id, start=start, end=end)
+        intervals = []
+        for event in events:
+            event_start, event_end = to_datetime(event.start_time), to_datetime(event.end_time)
+            if event_end > event_start:
+                intervals.append((event_start, event_end))
+
+        index = BusyIndex(intervals, start, end)
+        self._indexes.set(user_id, index)
+        return index
+
+    async def get_busy_events(
+        self, db: AsyncSession, user_id: str, deadline: Optional[datetime] = None
+    ) -> List[dict]:
+        """Busy intervals from now until the deadline (or the scheduling horizon)."""
+        now = datetime.utcnow()
+        end = now + timedelta(days=settings.SCHEDULING_HORIZON_DAYS)
+        deadline = to_datetime(deadline)
+        if deadline is not None and deadline > end:
+            end = deadline
+        # Load whole days so repeated calls within the day hit the cache
+        day_start = datetime.combine(now.date(), time.min)
+        day_end = datetime.combine(end.date() + timedelta(days=1), time.min)
+        index = await self.get_index(db, user_id, day_start, day_end)
+        return index.as_events(now, end)
+
+    def invalidate(self, user_id: str) -> None:
+        self._indexes.delete(str(user_id))
+
+    def clear(self) -> None:
+        self._indexes.clear()
+
+freebusy = FreeBusyService(
+    max_users=settings.FREEBUSY_CACHE_MAX_USERS,
+    ttl_seconds=settings.FREEBUSY_CACHE_TTL_SECONDS,
+)
+
+_PENDING_KEY = "freebusy_invalidate"
+
+@sa_event.listens_for(Session, "after_flush")
+def _collect_event_writes(session, flush_context) -> None:
+    # Invalidating at flush would let a reader re-cache the old rows before
+    # the commit lands (or keep none if the transaction rolls back)
+    for target in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(target, CalendarEvent) and target.user_id is not None:
+            session.info.setdefault(_PENDING_KEY, set()).add(str(target.user_id))
+
+@sa_event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        freebusy.invalidate(user_id)
+
+@sa_event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,158 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+Interval = Tuple[datetime, datetime]
+
+WORKDAYS = (0, 1, 2, 3, 4)  # Monday - Friday
+
+def to_datetime(value: Any) -> Optional[datetime]:
+    """
+    Normalize a datetime or ISO string to a naive UTC datetime.
+    Returns None for missing or unparseable values.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def events_to_intervals(events: Iterable[dict]) -> List[Interval]:
+    """Extract (start, end) intervals from event dicts, skipping malformed ones."""
+    intervals = []
+    for event in events:
+        start = to_datetime(event.get("start_time"))
+        end = to_datetime(event.get("end_time"))
+        if start is not None and end is not None and end > start:
+            intervals.append((start, end))
+    return intervals
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort and merge overlapping or touching intervals. O(n log n)."""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def _round_up(value: datetime, granularity: timedelta) -> datetime:
+    seconds = granularity.total_seconds()
+    epoch = datetime(1970, 1, 1)
+    offset = (value - epoch).total_seconds()
+    remainder = offset % seconds
+    if remainder == 0:
+        return value
+    return value + timedelta(seconds=seconds - remainder)
+
+def iter_free_gaps(
+    busy: Sequence[Interval],
+    window_start: datetime,
+    window_end: datetime,
+    work_start_hour: int = 9,
+    work_end_hour: int = 18,
+    workdays: Sequence[int] = WORKDAYS,
+) -> Iterator[Interval]:
+    """
+    Yield free gaps inside work hours between window_start and window_end.
+
+    ``busy`` must already be sorted and merged (see merge_intervals). A
+    single forward pointer walks the busy list, so the sweep is linear in
+    events plus days.
+    """
+    i = 0
+    day = window_start.date()
+    while day <= window_end.date():
+        if day.weekday() in workdays:
+            day_start = max(window_start, datetime.combine(day, time(work_start_hour)))
+            day_end = min(window_end, datetime.combine(day, time(work_end_hour)))
+            while i < len(busy) and busy[i][1] <= day_start:
+                i += 1
+            cursor = day_start
+            j = i
+            while cursor < day_end and j < len(busy) and busy[j][0] < day_end:
+                if busy[j][0] > cursor:
+                    yield (cursor, busy[j][0])
+                cursor = max(cursor, busy[j][1])
+                j += 1
+            if cursor < day_end:
+                yield (cursor, day_end)
+        day += timedelta(days=1)
+
+def find_free_slots(
+    events: Iterable[Any],
+    duration_minutes: int,
+    now: Optional[datetime] = None,
+    deadline: Optional[datetime] = None,
+    work_start_hour: int = 9,
+    work_end_hour: int = 18,
+    max_slots: int = 3,
+    horizon_days: int = 14,
+    granularity_minutes: int = 15,
+    workdays: Sequence[int] = WORKDAYS,
+) -> List[Interval]:
+    """
+    Compute the earliest free slots that fit ``duration_minutes``.
+
+    All times are naive UTC (see to_datetime), and work hours and workdays
+    are applied to those UTC times too. Users have no stored timezone yet,
+    so for anyone away from UTC the working day is shifted by their offset.
+
+    Args:
+        events: Event dicts (start_time/end_time) or (start, end) tuples
+        duration_minutes: Length of the slot to place
+        now: Earliest allowed start (default: current UTC time)
+        deadline: Latest allowed end (default: now + horizon_days)
+        work_start_hour: Start of the working day (UTC hour)
+        work_end_hour: End of the working day (UTC hour)
+        max_slots: Number of candidates to return
+        horizon_days: Search horizon when there is no deadline
+        granularity_minutes: Slot starts are aligned to this step
+        workdays: Weekdays (0=Monday) considered schedulable
+
+    Returns:
+        Up to ``max_slots`` (start, end) tuples, preferring one slot per free
+        gap so the options are spread out, earliest first.
+    """
+    events = list(events)
+    if events and isinstance(events[0], dict):
+        intervals = events_to_intervals(events)
+    else:
+        intervals = [(to_datetime(s), to_datetime(e)) for s, e in events]
+
+    now = to_datetime(now) or datetime.utcnow()
+    window_end = to_datetime(deadline) or now + timedelta(days=horizon_days)
+    duration = timedelta(minutes=max(duration_minutes, 1))
+    granularity = timedelta(minutes=granularity_minutes)
+
+    busy = merge_intervals(intervals)
+    gaps: List[Interval] = []
+    slots: List[Interval] = []
+    for gap_start, gap_end in iter_free_gaps(
+        busy, now, window_end, work_start_hour, work_end_hour, workdays
+    ):
+        start = _round_up(gap_start, granularity)
+        if start + duration > gap_end:
+            continue
+        slots.append((start, start + duration))
+        gaps.append((start + duration, gap_end))
+        if len(slots) >= max_slots:
+            return slots
+
+    # Fewer gaps than requested: fill remaining room inside the gaps found
+    for gap_start, gap_end in gaps:
+        start = _round_up(gap_start, granularity)
+        while start + duration <= gap_end and len(slots) < max_slots:
+            slots.append((start, start + duration))
+            start = _round_up(start + duration, granularity)
+        if len(slots) >= max_slots:
+            break
+    return sorted(slots)
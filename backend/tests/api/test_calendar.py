@@ -2,7 +2,24 @@ import pytest
 from httpx import AsyncClient
 from uuid import UUID
 
+from app.core.security import create_access_token
 from app.models.user import User
+from tests.helpers import USER_ID, JsonHandler, seed_integration, stored_events
+
+
+class StubEventsHandler(JsonHandler):
+    """Calendar API answering events.list with a single event."""
+
+    def do_GET(self):
+        self.send_json(200, {
+            "items": [{
+                "id": "standup",
+                "summary": "Standup",
+                "start": {"dateTime": "2026-01-19T09:00:00Z"},
+                "end": {"dateTime": "2026-01-19T09:15:00Z"},
+            }],
+            "nextSyncToken": "next",
+        })
 
 
 @pytest.mark.asyncio
@@ -122,3 +139,20 @@ async def test_calendar_sync_unauthorized(client: AsyncClient):
         json={"provider": "google"}
     )
     assert response.status_code == 403 or response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_calendar_sync_connected_integration(client: AsyncClient, db_session, stub_server):
+    """Test sync for a user with a connected calendar pulls its events."""
+    stub_server(StubEventsHandler, {"GOOGLE_CALENDAR_API_URL": ""})
+    await seed_integration(db_session, "google")
+
+    response = await client.post(
+        "/api/v1/calendar/sync",
+        json={"provider": "google"},
+        headers={"Authorization": f"Bearer {create_access_token(USER_ID)}"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "synced", "events_synced": 1, "events_deleted": 0}
+    assert await stored_events(db_session) == {"standup": "Standup"}
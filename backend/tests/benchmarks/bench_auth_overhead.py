@@ -0,0 +1,64 @@
+"""
+Microbenchmark: per-request cost of the auth dependencies.
+
+Times security.get_current_user_id (JWT verification) with the verified-
+token cache off and on, and the full get_current_principal chain with a
+warm principal cache, for a pool of TOKENS tokens reused round-robin the
+way polling clients reuse theirs.
+
+Run this with: python tests/benchmarks/bench_auth_overhead.py [calls]
+"""
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.append(os.getcwd())
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core import security
+from app.core.principal import Principal, principal_cache
+from app.core.tokens import token_verifier
+
+CALLS = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+TOKENS = 100
+
+async def time_calls(fn, credentials):
+    start = time.perf_counter()
+    for i in range(CALLS):
+        await fn(credentials[i % len(credentials)])
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+async def main():
+    user_ids = [str(uuid.uuid4()) for _ in range(TOKENS)]
+    credentials = [
+        HTTPAuthorizationCredentials(scheme="Bearer", credentials=security.create_access_token(user_id))
+        for user_id in user_ids
+    ]
+    for user_id in user_ids:
+        await principal_cache.set(Principal(id=user_id))
+
+    async def user_id_only(creds):
+        return await security.get_current_user_id(creds)
+
+    async def principal(creds):
+        user_id = await security.get_current_user_id(creds)
+        return await security.get_current_principal(db=None, user_id=user_id)
+
+    print("=" * 60)
+    print(f"Auth dependency overhead, {CALLS:,} calls over {TOKENS} tokens")
+    print("=" * 60)
+    results = {}
+    for label, enabled in (("uncached", False), ("cached", True)):
+        token_verifier.clear()
+        token_verifier.enabled = enabled
+        results[label] = await time_calls(user_id_only, credentials)
+        print(f"get_current_user_id, {label:<9} {results[label]:7.2f} us/request")
+    chain = await time_calls(principal, credentials)
+    print(f"get_current_principal, cached  {chain:7.2f} us/request (token + principal cache)")
+    print(f"\nVerification speed-up: x{results['uncached'] / results['cached']:.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""
+Benchmark: database statements per request with and without the
+authenticated-user (principal) cache.
+
+Replays the locust AIWorkerUser mix (tests/load/locustfile.py: create task
+x3, list tasks x5, get profile x1) through the ASGI app in-process with
+real JWTs for USERS users, and counts SQL statements sent per request.
+Requests run one at a time so each statement is attributed to its request.
+
+Run this with: python tests/benchmarks/bench_auth_principal_cache.py [requests]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.append(os.getcwd())
+
+import httpx
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.api import deps
+from app.core.principal import principal_cache
+from app.core.security import create_access_token
+from app.db import session
+from app.db.base import Base
+from app.main import app
+from app.models.user import User
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+USERS = 50
+
+# (weight, method, path, json) per tests/load/locustfile.py
+MIX = [
+    (3, "POST", "/api/v1/tasks/", {"title": "Load test task", "priority": "medium"}),
+    (5, "GET", "/api/v1/tasks/", None),
+    (1, "GET", "/api/v1/users/me", None),
+]
+
+async def run(client, tokens, statements):
+    requests = random.Random(42).choices(MIX, weights=[m[0] for m in MIX], k=REQUESTS)
+    user_tokens = random.Random(7).choices(tokens, k=REQUESTS)
+    per_path = {}
+    start = time.perf_counter()
+    for (_, method, path, body), token in zip(requests, user_tokens):
+        before = len(statements)
+        response = await client.request(
+            method, path, json=body, headers={"Authorization": f"Bearer {token}"}
+        )
+        response.raise_for_status()
+        per_path.setdefault(f"{method} {path}", []).append(len(statements) - before)
+    return per_path, time.perf_counter() - start
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = session.create_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        user_ids = [str(uuid.uuid4()) for _ in range(USERS)]
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(User), [
+                {"id": user_id, "email": f"load{i}@example.com"} for i, user_id in enumerate(user_ids)
+            ])
+        tokens = [create_access_token(user_id) for user_id in user_ids]
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async def get_db():
+            async with session_factory() as db:
+                yield db
+
+        statements = []
+        event.listen(
+            engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        app.dependency_overrides[deps.get_db] = get_db
+        transport = httpx.ASGITransport(app=app)
+
+        print("=" * 60)
+        print(f"{REQUESTS} requests, locust AIWorkerUser mix, {USERS} users")
+        print("=" * 60)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for label, enabled in (("no cache", False), ("principal cache", True)):
+                    principal_cache.clear()
+                    principal_cache._cache.enabled = enabled
+                    statements.clear()
+                    per_path, elapsed = await run(client, tokens, statements)
+                    print(f"{label}: {len(statements) / REQUESTS:.2f} statements/request, "
+                          f"{REQUESTS / elapsed:.0f} req/s")
+                    for path, counts in sorted(per_path.items()):
+                        print(f"    {path:<28} {sum(counts) / len(counts):.2f}")
+        finally:
+            app.dependency_overrides.clear()
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
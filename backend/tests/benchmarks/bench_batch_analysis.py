@@ -0,0 +1,131 @@
+"""
+Benchmark: analyzing an imported backlog of tasks.
+
+Compares the per-task loop the frontend used to drive (load one task, run
+the full process_task graph, commit) with the /ai/analyze-tasks batch path
+(one query, grouped analysis prompts, one bulk UPDATE).
+
+The LLM is simulated with a fixed per-call latency plus a small per-task
+cost, so the numbers reflect call counts and concurrency rather than a
+particular model.
+
+Run this with: python tests/benchmarks/bench_batch_analysis.py
+"""
+import asyncio
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.core.cache import ResponseCache
+from app.db.base import Base
+from app.models.task import Task
+from app.models.user import User
+from app.services.ai_pipeline.graph import process_task
+from app.services.ai_pipeline.nodes import analyze, schedule
+from app.services.ai_pipeline.state import TaskAnalysisState
+
+TASKS = 200
+CALL_LATENCY = 0.05  # seconds per LLM call
+PER_TASK_LATENCY = 0.005  # extra seconds per task in a prompt
+
+class SimulatedLLM:
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        indices = [int(i) for i in re.findall(r"^\[(\d+)\]$", messages[-1].content, re.M)]
+        await asyncio.sleep(CALL_LATENCY + PER_TASK_LATENCY * max(len(indices), 1))
+
+        class Response:
+            pass
+
+        response = Response()
+        if indices:
+            response.content = json.dumps({"results": [
+                {"index": i, "estimated_duration_minutes": 45, "reasoning": "simulated"} for i in indices
+            ]})
+        else:
+            response.content = json.dumps({"estimated_duration_minutes": 45, "reasoning": "simulated"})
+        return response
+
+def install_llm():
+    llm = SimulatedLLM()
+    analyze.get_llm = lambda temperature=0: llm
+    schedule.get_llm = lambda temperature=0: llm
+    analyze.analysis_cache = ResponseCache(namespace="bench", enabled=False)
+    return llm
+
+async def seed(session_factory):
+    async with session_factory() as db:
+        db.add(User(id="bench", email="bench@example.com", auth_provider_id="bench"))
+        db.add_all([
+            Task(id=f"task-{i}", user_id="bench", title=f"Imported task {i}", priority="medium")
+            for i in range(TASKS)
+        ])
+        await db.commit()
+
+async def per_task_loop(session_factory, task_ids):
+    for task_id in task_ids:
+        async with session_factory() as db:
+            task = await crud.task.get(db=db, id=task_id)
+            result = await process_task({
+                "task_id": task.id, "user_id": task.user_id, "title": task.title,
+                "priority": task.priority, "calendar_events": [],
+            })
+            await crud.task.update(db=db, db_obj=task, obj_in={
+                "estimated_duration_minutes": result.get("estimated_duration_minutes"),
+                "ai_reasoning": result.get("ai_reasoning"),
+            })
+
+async def batch(session_factory, task_ids, group_size):
+    async with session_factory() as db:
+        tasks = await crud.task.get_many_by_owner(db=db, ids=task_ids, user_id="bench")
+        states = [
+            TaskAnalysisState(task_id=t.id, user_id=t.user_id, title=t.title, priority=t.priority)
+            for t in tasks
+        ]
+        analyses = await analyze.analyze_tasks(states, group_size=group_size)
+        await crud.task.update_analysis_many(db=db, rows=[
+            {"id": t.id, "estimated_duration_minutes": a["estimated_duration_minutes"],
+             "ai_reasoning": a["ai_reasoning"]}
+            for t, a in zip(tasks, analyses)
+        ])
+
+async def measure(label, fn):
+    llm = install_llm()
+    start = time.perf_counter()
+    await fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:>9.0f} ms  {TASKS / elapsed:>7.1f} tasks/s  {llm.calls:>4} LLM calls")
+    return elapsed
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        await seed(session_factory)
+        task_ids = [f"task-{i}" for i in range(TASKS)]
+
+        print("=" * 60)
+        print(f"Analyzing {TASKS} tasks ({CALL_LATENCY * 1000:.0f} ms/LLM call)")
+        print("=" * 60)
+        loop = await measure("per-task loop", lambda: per_task_loop(session_factory, task_ids))
+        single = await measure("batch, 1 task/prompt", lambda: batch(session_factory, task_ids, 1))
+        grouped = await measure("batch, 5 tasks/prompt", lambda: batch(session_factory, task_ids, 5))
+        print(f"\nSpeed-up vs loop: x{loop / single:.1f} (1/prompt), x{loop / grouped:.1f} (5/prompt)")
+        await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+"""
+Benchmark: background calendar sync of USERS users against local stub
+Google and Microsoft Graph servers.
+
+The stubs run in a separate process and answer every call after
+STUB_LATENCY seconds: a first (full) sync returns a few events, later
+(incremental) syncs return none. Integrations are split 70/30 between
+Google and Microsoft, and the scheduler runs with a compressed
+INTERVAL so every user comes due within the run.
+
+Reports sync lag (how long after its slot each sync started), syncs
+completed, stale integrations at the end, and the scheduler process's CPU
+time.
+
+Run this with: python tests/benchmarks/bench_calendar_sync_scheduler.py [users] [interval_seconds]
+"""
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db import session
+from app.db.base import Base
+from app.models.event import CalendarEvent
+from app.models.user import User, UserIntegration
+from app.services.calendar_sync.http import calendar_http
+from app.services.calendar_sync.scheduler import CalendarSyncScheduler
+from tests.helpers import JsonHandler, StubServer
+
+USERS = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+INTERVAL = float(sys.argv[2]) if len(sys.argv) > 2 else 180
+RUN_SECONDS = INTERVAL * 1.5  # Every slot comes due at least once
+STUB_LATENCY = 0.05
+EVENTS_PER_USER = 3
+RATE_LIMITS = {"google": 600, "microsoft": 300}  # Syncs/second
+
+class StubProviderHandler(JsonHandler):
+    def do_GET(self):
+        time.sleep(STUB_LATENCY)
+        user = self.headers["Authorization"].split()[-1]
+        full_sync = "syncToken" not in self.path and "deltatoken" not in self.path
+        events = []
+        for i in range(EVENTS_PER_USER if full_sync else 0):
+            start, end = f"2026-01-19T{9 + i:02d}:00:00", f"2026-01-19T{10 + i:02d}:00:00"
+            events.append({
+                "id": f"{user}-{i}", "summary": "Busy", "subject": "Busy",
+                "start": {"dateTime": start + "Z"}, "end": {"dateTime": end + "Z"},
+            })
+        if self.path.startswith("/me/"):
+            base = f"{self.server.url}/me/calendarView/delta"
+            body = {"value": events, "@odata.deltaLink": f"{base}?$deltatoken={user}"}
+        else:
+            body = {"items": events, "nextSyncToken": user}
+        self.send_json(200, body)
+
+def serve_stub(port_queue):
+    server = StubServer(("127.0.0.1", 0), StubProviderHandler)
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+async def seed(session_factory):
+    async with session_factory() as db:
+        await db.execute(insert(User), [
+            {"id": f"user-{i}", "email": f"user{i}@example.com"} for i in range(USERS)
+        ])
+        await db.execute(insert(UserIntegration), [
+            {
+                "user_id": f"user-{i}",
+                "provider": "google" if i % 10 < 7 else "microsoft",
+                "access_token": f"user-{i}",
+            }
+            for i in range(USERS)
+        ])
+        await db.commit()
+
+async def main():
+    port_queue = multiprocessing.Queue()
+    stub = multiprocessing.Process(target=serve_stub, args=(port_queue,), daemon=True)
+    stub.start()
+    stub_url = f"http://127.0.0.1:{port_queue.get()}"
+    settings.GOOGLE_CALENDAR_API_URL = stub_url
+    settings.MICROSOFT_GRAPH_API_URL = stub_url
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = session.create_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'sync.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        await seed(session_factory)
+
+        scheduler = CalendarSyncScheduler(
+            session_factory=session_factory,
+            interval_seconds=INTERVAL,
+            jitter_seconds=INTERVAL / 30,
+            max_concurrency=100,
+            rate_limits=RATE_LIMITS,
+            claim_batch=2000,
+            poll_seconds=0.25,
+        )
+
+        print("=" * 60)
+        print(f"{USERS} users, {INTERVAL:.0f}s interval, {RUN_SECONDS:.0f}s run, "
+              f"stub latency {STUB_LATENCY * 1000:.0f} ms")
+        print("=" * 60)
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        scheduler.start()
+        await asyncio.sleep(RUN_SECONDS)
+        await scheduler.stop()
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+
+        stats = scheduler.stats()
+        synced = sum(p["synced"] for p in stats["providers"].values())
+        async with session_factory() as db:
+            cutoff = datetime.utcnow() - timedelta(seconds=INTERVAL * 1.1)
+            stale = await db.scalar(
+                select(func.count()).select_from(UserIntegration).where(
+                    (UserIntegration.last_synced_at.is_(None)) | (UserIntegration.last_synced_at < cutoff)
+                )
+            )
+            events = await db.scalar(select(func.count()).select_from(CalendarEvent))
+
+        lag = stats["lag_seconds"]
+        print(f"syncs completed   {synced} ({synced / wall:.0f}/s), events stored {events}")
+        for provider, p in sorted(stats["providers"].items()):
+            print(f"    {provider:<10} synced {p['synced']:6}  failed {p['failed']:4}  "
+                  f"circuit {p['circuit']:<9} rate-limited {p['rate_limited_seconds']:.1f}s")
+        print(f"sync lag          p50 {lag['p50']:.2f}s  p95 {lag['p95']:.2f}s  max {lag['max']:.2f}s")
+        print(f"never/stale       {stale} of {USERS} integrations")
+        print(f"scheduler CPU     {cpu:.1f}s over {wall:.1f}s wall ({cpu / wall * 100:.0f}% of a core), "
+              f"{cpu / max(synced, 1) * 1000:.2f} ms/sync")
+        await calendar_http.aclose()
+        await engine.dispose()
+    stub.terminate()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""
+Benchmark: checkpoint write throughput with N parallel HITL workflows.
+
+Compares the previous single-connection AsyncSqliteSaver (default pragmas)
+with PooledSqliteSaver (WAL, tuned pragmas, reader pool). Each workflow
+runs analyze -> schedule up to the human_review interrupt while a poller
+reads its state, like the status/SSE endpoints do.
+
+Run this with: python tests/benchmarks/bench_checkpoint_concurrency.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+import aiosqlite
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from app.services.ai_pipeline.checkpointer import PooledSqliteSaver
+from app.services.ai_pipeline.graph import HITL_INTERRUPT_BEFORE, get_compiled_app
+
+WORKFLOW_COUNTS = [10, 50, 200]
+POLLS_PER_WORKFLOW = 5
+
+async def open_single(path):
+    saver = AsyncSqliteSaver(await aiosqlite.connect(path))
+    await saver.setup()
+    return saver
+
+async def close_single(saver):
+    await saver.conn.close()
+
+async def open_pooled(path):
+    return await PooledSqliteSaver.open(path, readers=4)
+
+async def close_pooled(saver):
+    await saver.aclose()
+
+async def count_checkpoints(path):
+    async with aiosqlite.connect(path) as conn:
+        async with conn.execute("SELECT COUNT(*) FROM checkpoints") as cur:
+            checkpoints = (await cur.fetchone())[0]
+        async with conn.execute("SELECT COUNT(*) FROM writes") as cur:
+            writes = (await cur.fetchone())[0]
+    return checkpoints, writes
+
+async def run_workflow(app, i):
+    config = {"configurable": {"thread_id": f"bench-{i}"}}
+    await app.ainvoke(
+        {"task_id": f"t{i}", "user_id": "bench", "title": f"Benchmark task {i}", "priority": "medium"},
+        config,
+    )
+
+async def poll_state(app, i):
+    config = {"configurable": {"thread_id": f"bench-{i}"}}
+    for _ in range(POLLS_PER_WORKFLOW):
+        await app.aget_state(config)
+        await asyncio.sleep(0)
+
+async def measure(label, open_saver, close_saver, n):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "checkpoints.db")
+        saver = await open_saver(path)
+        app = get_compiled_app("hitl", saver, HITL_INTERRUPT_BEFORE)
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(run_workflow(app, i) for i in range(n)),
+            *(poll_state(app, i) for i in range(n)),
+        )
+        elapsed = time.perf_counter() - start
+
+        await close_saver(saver)
+        checkpoints, writes = await count_checkpoints(path)
+
+    rows = checkpoints + writes
+    print(
+        f"{label:<22} {n:>5} workflows  {elapsed * 1000:>8.1f} ms  "
+        f"{rows:>6} rows  {rows / elapsed:>8.0f} rows/s  {n / elapsed:>6.1f} workflows/s"
+    )
+    return rows / elapsed
+
+async def main():
+    print("=" * 60)
+    print("Checkpoint write throughput (parallel HITL workflows)")
+    print("=" * 60)
+    for n in WORKFLOW_COUNTS:
+        before = await measure("single connection", open_single, close_single, n)
+        after = await measure("pooled WAL", open_pooled, close_pooled, n)
+        print(f"{'':<22} speedup x{after / before:.2f}")
+        print("-" * 60)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,119 @@
+"""
+Benchmark: status-read latency as checkpoint history grows, and what a
+retention sweep does to it.
+
+Fills a temporary SQLite checkpoint store with synthetic finished threads
+(copies of a real checkpoint row, 10 checkpoints per thread), measures
+aget_state on live waiting_input threads at each size, then runs one
+retention sweep over the largest store.
+
+Run this with: python tests/benchmarks/bench_checkpoint_retention.py [max_checkpoints]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+from langgraph.checkpoint.base.id import uuid6
+
+from app.services.ai_pipeline.checkpointer import PooledSqliteSaver
+from app.services.ai_pipeline.graph import HITL_INTERRUPT_BEFORE, get_compiled_app
+from app.services.ai_pipeline.retention import CheckpointRetention
+
+MAX_CHECKPOINTS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+STEPS = [0, MAX_CHECKPOINTS // 10, MAX_CHECKPOINTS]
+CHECKPOINTS_PER_THREAD = 10
+LIVE_THREADS = 20
+READS = 500
+INSERT_CHUNK = 50_000
+
+async def start_workflow(app, thread_id):
+    await app.ainvoke(
+        {"task_id": thread_id, "user_id": "bench", "title": "Benchmark task", "priority": "medium"},
+        {"configurable": {"thread_id": thread_id}},
+    )
+
+async def template_row(saver):
+    async with saver.writer.conn.execute(
+        "SELECT type, checkpoint, metadata FROM checkpoints WHERE thread_id = 'live-0' "
+        "ORDER BY checkpoint_id DESC LIMIT 1"
+    ) as cur:
+        return await cur.fetchone()
+
+async def add_history(saver, template, start_thread, checkpoints):
+    kind, blob, metadata = template
+    rows = []
+    threads = checkpoints // CHECKPOINTS_PER_THREAD
+    for t in range(start_thread, start_thread + threads):
+        parent = None
+        for _ in range(CHECKPOINTS_PER_THREAD):
+            checkpoint_id = str(uuid6())
+            rows.append((f"history-{t:08d}", "", checkpoint_id, parent, kind, blob, metadata))
+            parent = checkpoint_id
+        if len(rows) >= INSERT_CHUNK:
+            await saver.writer.conn.executemany("INSERT INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            await saver.writer.conn.commit()
+            rows = []
+    if rows:
+        await saver.writer.conn.executemany("INSERT INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        await saver.writer.conn.commit()
+    return start_thread + threads
+
+async def measure_reads(app):
+    latencies = []
+    for i in range(READS):
+        config = {"configurable": {"thread_id": f"live-{i % LIVE_THREADS}"}}
+        start = time.perf_counter()
+        await app.aget_state(config)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95)]
+
+def report(label, checkpoints, size_bytes, p50, p95):
+    print(f"{label:<16} {checkpoints:>10,} checkpoints  {size_bytes / 1e6:>9.1f} MB  "
+          f"p50 {p50:6.3f} ms  p95 {p95:6.3f} ms")
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        saver = await PooledSqliteSaver.open(os.path.join(tmp, "checkpoints.db"), readers=4)
+        app = get_compiled_app("hitl", saver, HITL_INTERRUPT_BEFORE)
+        for i in range(LIVE_THREADS):
+            await start_workflow(app, f"live-{i}")
+        template = await template_row(saver)
+        retention = CheckpointRetention(max_age_days=30, batch_size=500, pause_seconds=0)
+
+        print("=" * 60)
+        print(f"Status-read latency vs. checkpoint history ({READS} reads)")
+        print("=" * 60)
+        next_thread = 0
+        loaded = 0
+        for target in STEPS:
+            if target > loaded:
+                next_thread = await add_history(saver, template, next_thread, target - loaded)
+                loaded = target
+            storage = await retention.describe(saver)
+            p50, p95 = await measure_reads(app)
+            report("history", storage["checkpoints"], storage["size_bytes"], p50, p95)
+
+        async def history_finished(thread_id):
+            return thread_id.startswith("history-")
+
+        start = time.perf_counter()
+        stats = await retention.sweep(saver, history_finished)
+        elapsed = time.perf_counter() - start
+        storage = await retention.describe(saver)
+        p50, p95 = await measure_reads(app)
+        report("after sweep", storage["checkpoints"], storage["size_bytes"], p50, p95)
+
+        print("-" * 60)
+        print(f"Sweep: {elapsed:.1f} s, {stats['threads_compacted']:,} threads compacted, "
+              f"{stats['checkpoints_deleted']:,} checkpoints deleted, "
+              f"{stats['bytes_reclaimed'] / 1e6:.1f} MB reclaimed")
+        await saver.aclose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+"""
+Benchmark: /tasks throughput under different database engine profiles.
+
+Profiles:
+- legacy:   what app/db/session.py used to build (echo=True, default pool,
+            SQLite defaults: rollback journal, synchronous=FULL)
+- echo off: the same engine without statement logging
+- tuned:    app.db.session.create_engine() from Settings (echo off, sized
+            pool, WAL + synchronous=NORMAL + mmap on SQLite)
+
+Each profile gets a fresh SQLite file with one user and SEED_TASKS tasks,
+then CONCURRENCY clients drive GET /tasks (one page of 50) and POST /tasks
+through the ASGI app in-process, over ROUNDS interleaved rounds. Echo output goes to /dev/null, so the
+legacy numbers include formatting the log lines but not a terminal.
+
+Run this with: python tests/benchmarks/bench_db_engine_profiles.py [requests]
+"""
+import asyncio
+import contextlib
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.append(os.getcwd())
+
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import deps
+from app.core import security
+from app.db import session
+from app.db.base import Base
+from app.main import app
+from app.models.task import Task
+from app.models.user import User
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+ROUNDS = 3  # Best round per profile is reported
+CONCURRENCY = 20
+SEED_TASKS = 500
+USER_ID = str(uuid.uuid4())
+DEVNULL = open(os.devnull, "w")  # Echo handlers keep the stream they were created with
+
+PROFILES = {
+    "legacy": lambda url: create_async_engine(url, echo=True),
+    "echo off": lambda url: create_async_engine(url),
+    "tuned": lambda url: session.create_engine(url),
+}
+
+async def seed(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [{"id": USER_ID, "email": "bench@example.com"}])
+        await conn.execute(insert(Task), [
+            {"id": str(uuid.uuid4()), "user_id": USER_ID, "title": f"Task {i}", "priority": "medium"}
+            for i in range(SEED_TASKS)
+        ])
+
+async def drive(client, method, path, **kwargs):
+    """Returns (requests/s, failed requests); e.g. 'database is locked' is a 500."""
+    remaining = REQUESTS
+    failed = 0
+
+    async def worker():
+        nonlocal remaining, failed
+        while remaining > 0:
+            remaining -= 1
+            response = await client.request(method, path, **kwargs)
+            failed += response.status_code >= 400
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    return REQUESTS / (time.perf_counter() - start), failed
+
+async def run_profile(name, make_engine, tmp):
+    url = f"sqlite+aiosqlite:///{os.path.join(tmp, name.replace(' ', '_') + '.db')}"
+    with contextlib.redirect_stdout(DEVNULL):
+        engine = make_engine(url)
+    await seed(engine)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_db():
+        async with session_factory() as db:
+            yield db
+
+    async def current_principal():
+        return security.Principal(id=USER_ID, email="bench@example.com")
+
+    app.dependency_overrides[deps.get_db] = get_db
+    app.dependency_overrides[security.get_current_principal] = current_principal
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            reads = await drive(client, "GET", "/api/v1/tasks/", params={"limit": 50})
+            writes = await drive(client, "POST", "/api/v1/tasks/", json={"title": "Benchmark task"})
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+    return reads, writes
+
+async def main():
+    print("=" * 60)
+    print(f"/tasks throughput, {REQUESTS} requests each, {CONCURRENCY} concurrent clients")
+    print("=" * 60)
+    best = {name: None for name in PROFILES}
+    with tempfile.TemporaryDirectory() as tmp:
+        for round_number in range(ROUNDS):
+            for name, make_engine in PROFILES.items():
+                reads, writes = await run_profile(f"{name}-{round_number}", make_engine, tmp)
+                if best[name] is None:
+                    best[name] = [reads, writes]
+                else:
+                    best[name] = [max(best[name][0], reads, key=lambda r: r[0]),
+                                  max(best[name][1], writes, key=lambda r: r[0])]
+    for name, ((read_rate, read_failed), (write_rate, write_failed)) in best.items():
+        print(f"{name:<10} GET /tasks {read_rate:6.0f} req/s ({read_failed} failed)   "
+              f"POST /tasks {write_rate:6.0f} req/s ({write_failed} failed)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
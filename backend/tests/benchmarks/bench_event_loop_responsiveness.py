@@ -0,0 +1,106 @@
+"""
+Load test: /health and /tasks latency while AI jobs are running.
+
+A slow, sync-only fake LLM (blocks for LLM_DELAY seconds per call) is
+installed in the LLM pool, then AI_JOBS analysis nodes run concurrently
+while the API is probed in-process. The "blocking" scenario calls
+llm.invoke() inline, as the nodes used to; the "async" scenario uses the
+current analyze_task node (ainvoke_llm with thread-pool offload).
+
+Run this with: python tests/benchmarks/bench_event_loop_responsiveness.py
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.deps import get_db
+from app.core import security
+from app.db.base import Base
+from app.main import app
+from app.models.user import User
+from app.services.ai_pipeline import llm_factory
+from app.services.ai_pipeline.nodes.analyze import analyze_task
+from app.services.ai_pipeline.state import TaskAnalysisState
+
+LLM_DELAY = 0.5
+AI_JOBS = 8
+PROBES = 20
+USER_ID = "00000000-0000-0000-0000-00000000beef"
+
+class SlowSyncLLM:
+    """Sync-only client that blocks like a local Ollama generation."""
+    def invoke(self, messages):
+        time.sleep(LLM_DELAY)
+        return llm_factory.MockLLM().invoke("estimated duration")
+
+async def blocking_analyze(state: TaskAnalysisState):
+    # Previous behaviour: sync invoke straight on the event loop
+    return SlowSyncLLM().invoke([state.title])
+
+def make_state(i: int) -> TaskAnalysisState:
+    return TaskAnalysisState(task_id=f"task-{i}", user_id=USER_ID, title=f"Job {i}")
+
+async def probe(client: AsyncClient, path: str) -> list:
+    latencies = []
+    for _ in range(PROBES):
+        start = time.perf_counter()
+        await client.get(path)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.01)
+    return latencies
+
+async def launch_jobs(node) -> None:
+    jobs = []
+    for i in range(AI_JOBS):
+        jobs.append(asyncio.create_task(node(make_state(i))))
+        await asyncio.sleep(0.02)
+    await asyncio.gather(*jobs)
+
+async def run_scenario(label: str, node, client: AsyncClient):
+    health, tasks, _ = await asyncio.gather(
+        probe(client, "/health"), probe(client, "/api/v1/tasks/"), launch_jobs(node)
+    )
+    for path, latencies in (("/health", health), ("/tasks", tasks)):
+        print(
+            f"{label:<10} {path:<8} p50={statistics.median(latencies):8.1f} ms"
+            f"  max={max(latencies):8.1f} ms"
+        )
+
+async def main():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_factory() as session:
+        session.add(User(id=USER_ID, email="bench@example.com"))
+        await session.commit()
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[security.get_current_user_id] = lambda: USER_ID
+    llm_factory.llm_pool.get = lambda *args, **kwargs: SlowSyncLLM()
+
+    print("=" * 60)
+    print(f"{AI_JOBS} concurrent AI jobs, {LLM_DELAY}s per LLM call")
+    print("=" * 60)
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+        await run_scenario("idle", lambda state: asyncio.sleep(0), client)
+        await run_scenario("blocking", blocking_analyze, client)
+        await run_scenario("async", analyze_task, client)
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
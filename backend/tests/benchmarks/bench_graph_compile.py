@@ -0,0 +1,58 @@
+"""
+Microbenchmark: per-request cost of the /ai/{thread_id}/status path.
+
+Compares recompiling the HITL graph on every call (old behaviour) with
+the process-wide compiled-app registry.
+
+Run this with: python tests/benchmarks/bench_graph_compile.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.services.ai_pipeline.graph import (
+    HITL_INTERRUPT_BEFORE,
+    create_graph_builder,
+    get_compiled_app,
+)
+
+ITERATIONS = 500
+
+async def status_recompile(checkpointer, config):
+    app = create_graph_builder(with_human_loop=True).compile(
+        checkpointer=checkpointer, interrupt_before=list(HITL_INTERRUPT_BEFORE)
+    )
+    return await app.aget_state(config)
+
+async def status_cached(checkpointer, config):
+    app = get_compiled_app("hitl", checkpointer, HITL_INTERRUPT_BEFORE)
+    return await app.aget_state(config)
+
+async def measure(label, fn, checkpointer, config):
+    await fn(checkpointer, config)  # warm-up
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await fn(checkpointer, config)
+    elapsed = time.perf_counter() - start
+    per_call_ms = elapsed / ITERATIONS * 1000
+    print(f"{label:<12} {per_call_ms:8.3f} ms/request")
+    return per_call_ms
+
+async def main():
+    checkpointer = MemorySaver()
+    config = {"configurable": {"thread_id": "bench-thread"}}
+
+    print("=" * 60)
+    print(f"Status path latency ({ITERATIONS} iterations)")
+    print("=" * 60)
+    before = await measure("recompile", status_recompile, checkpointer, config)
+    after = await measure("cached", status_cached, checkpointer, config)
+    print(f"\nSpeed-up: {before / after:.1f}x")
+
+if __name__ == "__main__":
+    asyncio.run(main())
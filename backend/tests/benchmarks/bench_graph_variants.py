@@ -0,0 +1,71 @@
+"""
+Benchmark: LLM time per /ai/analyze-task and /ai/schedule request when
+each runs the full one-shot graph (previous behaviour) versus the
+smallest precompiled variant (analyze-only, or schedule-only once a
+duration is stored on the task).
+
+The model is simulated with a fixed latency per call, so the numbers
+reflect how many generations each request pays for.
+
+Run this with: python tests/benchmarks/bench_graph_variants.py
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.getcwd())
+
+from app.core.cache import ResponseCache
+from app.services.ai_pipeline.graph import process_task, scheduling_variant
+from app.services.ai_pipeline.nodes import analyze, schedule
+
+REQUESTS = 20
+CALL_LATENCY = 0.2  # seconds per LLM generation
+
+class LatencyLLM:
+    def __init__(self):
+        self.calls = 0
+        self.busy_seconds = 0.0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        start = time.perf_counter()
+        await asyncio.sleep(CALL_LATENCY)
+        self.busy_seconds += time.perf_counter() - start
+        if "AI scheduler" in messages[0].content:
+            return SimpleNamespace(content=json.dumps({"options": []}))
+        return SimpleNamespace(content=json.dumps({"estimated_duration_minutes": 45, "reasoning": "simulated"}))
+
+def install_llm():
+    llm = LatencyLLM()
+    analyze.get_llm = lambda temperature=0: llm
+    schedule.get_llm = lambda temperature=0: llm
+    analyze.analysis_cache = ResponseCache(namespace="bench", enabled=False)
+    return llm
+
+async def run(label, task_data, variant):
+    llm = install_llm()
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        await process_task({**task_data, "task_id": f"task-{i}"}, variant=variant)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {llm.calls / REQUESTS:4.1f} calls  "
+          f"LLM {llm.busy_seconds / REQUESTS * 1000:5.0f} ms  total {elapsed / REQUESTS * 1000:5.0f} ms  /request")
+
+async def main():
+    task = {"user_id": "bench", "title": "Write quarterly report", "priority": "high"}
+    analyzed = {**task, "estimated_duration_minutes": 45}
+
+    print("=" * 60)
+    print(f"{REQUESTS} sequential requests, {CALL_LATENCY * 1000:.0f} ms per LLM call")
+    print("=" * 60)
+    await run("analyze-task, full graph", task, "full")
+    await run("analyze-task, analyze variant", task, "analyze")
+    await run("schedule (analyzed task), full graph", analyzed, "full")
+    await run(f"schedule (analyzed task), {scheduling_variant(analyzed)} variant", analyzed, scheduling_variant(analyzed))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""
+Benchmark: time to first byte and total generation time of the analysis
+node, blocking (one ainvoke, answer parsed at the end) versus streamed
+(tokens forwarded as they arrive, generation stopped once the JSON
+answer is complete).
+
+The model is simulated as a reasoning model: THINK_TOKENS of <think>
+output, the JSON answer, then TRAILING_TOKENS of text after it, each
+token taking TOKEN_LATENCY. For the blocking path the first byte is the
+final result, since /ai/analyze-task sends nothing before it.
+
+Run this with: python tests/benchmarks/bench_llm_streaming.py
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.getcwd())
+
+from app.core.cache import ResponseCache
+from app.core.config import settings
+from app.services.ai_pipeline.graph import process_task, stream_task
+from app.services.ai_pipeline.nodes import analyze
+
+REQUESTS = 5
+TOKEN_LATENCY = 0.005  # seconds per generated token
+THINK_TOKENS = 150
+TRAILING_TOKENS = 80
+ANSWER = json.dumps({"estimated_duration_minutes": 45, "suggested_tags": ["work"], "reasoning": "simulated"})
+
+class ReasoningLLM:
+    def __init__(self):
+        answer = [ANSWER[i:i + 4] for i in range(0, len(ANSWER), 4)]
+        self.tokens = ["<think>"] + ["hmm "] * THINK_TOKENS + ["</think>"] + answer + [" extra"] * TRAILING_TOKENS
+        self.generated = 0
+
+    async def astream(self, messages):
+        for token in self.tokens:
+            await asyncio.sleep(TOKEN_LATENCY)
+            self.generated += 1
+            yield SimpleNamespace(content=token)
+
+    async def ainvoke(self, messages):
+        content = "".join([chunk.content async for chunk in self.astream(messages)])
+        return SimpleNamespace(content=content)
+
+def install_llm():
+    llm = ReasoningLLM()
+    analyze.get_llm = lambda temperature=0: llm
+    analyze.analysis_cache = ResponseCache(namespace="bench", enabled=False)
+    return llm
+
+async def blocking(task_data):
+    settings.LLM_STREAMING_ENABLED = False
+    start = time.perf_counter()
+    result = await process_task(task_data, variant="analyze")
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed, result
+
+async def streamed(task_data):
+    settings.LLM_STREAMING_ENABLED = True
+    start = time.perf_counter()
+    first = None
+    async for kind, data in stream_task(task_data, variant="analyze"):
+        if first is None:
+            first = time.perf_counter() - start
+        if kind == "result":
+            result = data
+    return first, time.perf_counter() - start, result
+
+async def main():
+    print("=" * 60)
+    total_tokens = len(ReasoningLLM().tokens)
+    print(f"{REQUESTS} analyses, {total_tokens} tokens per generation "
+          f"({THINK_TOKENS} thinking, {TRAILING_TOKENS} trailing), {TOKEN_LATENCY * 1000:.0f} ms/token")
+    print("=" * 60)
+    for label, run in (("blocking", blocking), ("streamed", streamed)):
+        ttfb, total, generated = [], [], []
+        for i in range(REQUESTS):
+            llm = install_llm()
+            first, elapsed, result = await run({"task_id": f"task-{i}", "user_id": "bench", "title": "Write report"})
+            assert result["estimated_duration_minutes"] == 45
+            ttfb.append(first)
+            total.append(elapsed)
+            generated.append(llm.generated)
+        print(f"{label:<10} TTFB {sum(ttfb) / REQUESTS * 1000:6.0f} ms   total {sum(total) / REQUESTS * 1000:6.0f} ms   "
+              f"tokens generated {sum(generated) / REQUESTS:.0f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""
+Benchmark: BURST concurrent Google syncs for one user whose access token
+has expired, against a local stub token endpoint and Calendar API.
+
+Compares each client refreshing on its own (the previous behaviour:
+every sync hits the token endpoint after its 401 and nothing is stored)
+with the shared OAuthTokenManager (one single-flight refresh, written
+back with one UPDATE). Reports token endpoint calls, integration
+UPDATEs and wall time for the burst.
+
+Run this with: python tests/benchmarks/bench_oauth_token_refresh.py [burst]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import partial
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db import session
+from app.db.base import Base
+from app.models.user import User, UserIntegration
+from app.services.calendar_sync.google import GoogleCalendarService
+from app.services.calendar_sync.http import calendar_http
+from app.services.calendar_sync.sync import google_credentials
+from app.services.calendar_sync.tokens import OAuthTokenManager
+from tests.helpers import JsonHandler, start_stub_server
+
+BURST = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+USER_ID = "bench-user"
+STUB_LATENCY = 0.05
+
+class StubHandler(JsonHandler):
+    def do_POST(self):
+        self.read_body()
+        time.sleep(STUB_LATENCY)
+        with self.server.lock:
+            self.server.refreshes += 1
+        self.send_json(200, {"access_token": "fresh", "expires_in": 3600})
+
+    def do_GET(self):
+        time.sleep(STUB_LATENCY)
+        if self.headers["Authorization"] != "Bearer fresh":
+            return self.send_json(401, {"error": {"message": "Invalid Credentials"}})
+        self.send_json(200, {"items": [], "nextSyncToken": "sync"})
+
+async def burst(session_factory, server, managed):
+    async with session_factory() as db:
+        integration = await db.get(UserIntegration, (USER_ID, "google"))
+        integration.access_token = "expired"
+        integration.expires_at = datetime.utcnow() - timedelta(minutes=1)
+        await db.commit()
+    tokens = OAuthTokenManager(session_factory=session_factory)
+    server.refreshes = 0
+
+    services = [
+        GoogleCalendarService(
+            google_credentials(integration),
+            tokens=partial(tokens.access_token, integration) if managed else None,
+        )
+        for _ in range(BURST)
+    ]
+    start = time.perf_counter()
+    await asyncio.gather(*(service.list_changes() for service in services))
+    return server.refreshes, time.perf_counter() - start
+
+async def main():
+    server = start_stub_server(StubHandler, lock=threading.Lock(), refreshes=0)
+    url = server.url
+    settings.GOOGLE_CALENDAR_API_URL = url
+    settings.GOOGLE_TOKEN_URL = f"{url}/token"
+    settings.GOOGLE_CLIENT_ID = "client"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = session.create_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'tokens.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        updates = []
+        event.listen(
+            engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: updates.append(statement)
+            if statement.startswith("UPDATE user_integrations") else None,
+        )
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as db:
+            db.add(User(id=USER_ID, email="bench@example.com"))
+            db.add(UserIntegration(user_id=USER_ID, provider="google", refresh_token="refresh"))
+            await db.commit()
+
+        print("=" * 60)
+        print(f"{BURST} concurrent syncs for one user with an expired token, "
+              f"stub latency {STUB_LATENCY * 1000:.0f} ms")
+        print("=" * 60)
+        for label, managed in (("per-client refresh", False), ("OAuthTokenManager", True)):
+            calendar_http.get()
+            updates.clear()
+            refreshes, elapsed = await burst(session_factory, server, managed)
+            writes = len(updates) - 1  # Minus the reset that expires the token
+            print(f"{label:<20} token calls {refreshes:4}  UPDATEs {writes:3}  burst {elapsed * 1000:7.0f} ms")
+        await calendar_http.aclose()
+        await engine.dispose()
+    server.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+"""
+Benchmark: deterministic slot finder over synthetic calendars.
+
+Generates calendars of 10 to 100k events (about 12 events per working day,
+random overlaps) and times find_free_slots for the top 3 slots.
+The search window spans the whole calendar to exercise the sweep.
+
+Run this with: python tests/benchmarks/bench_slot_finder.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.getcwd())
+
+from app.services.scheduling.slot_finder import find_free_slots
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+EVENTS_PER_DAY = 12
+REPEATS = 5
+
+def make_calendar(n: int, start: datetime, rng: random.Random) -> list:
+    days = max(1, n // EVENTS_PER_DAY)
+    events = []
+    for _ in range(n):
+        day = start + timedelta(days=rng.randrange(days))
+        begin = day.replace(hour=rng.randrange(7, 19), minute=rng.choice((0, 15, 30, 45)))
+        events.append({
+            "start_time": begin.isoformat(),
+            "end_time": (begin + timedelta(minutes=rng.choice((15, 30, 60, 90)))).isoformat(),
+        })
+    return events, start + timedelta(days=days)
+
+def main():
+    rng = random.Random(42)
+    now = datetime(2026, 1, 19, 8, 0)
+
+    print("=" * 60)
+    print(f"find_free_slots, 60 min task, best of {REPEATS}")
+    print("=" * 60)
+    for n in SIZES:
+        events, deadline = make_calendar(n, now, rng)
+        best = float("inf")
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            slots = find_free_slots(events, 60, now=now, deadline=deadline)
+            best = min(best, time.perf_counter() - start)
+        print(f"{n:>8} events  {best * 1000:9.2f} ms  ({len(slots)} slots)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: importing, updating and deleting 1,000 tasks.
+
+Compares the per-object CRUDBase calls the API used to make for each task
+(create/update/remove: one commit, plus a refresh or lookup, per task)
+with create_many / update_many / remove_many (one transaction each), which
+back POST/PATCH/DELETE /tasks/bulk.
+
+Run this with: python tests/benchmarks/bench_task_bulk.py [tasks]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.db.base import Base
+from app.models.user import User
+
+TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+def task_rows():
+    return [
+        {"user_id": "bench", "title": f"Imported task {i}", "priority": "medium", "status": "pending"}
+        for i in range(TASKS)
+    ]
+
+async def one_by_one(db):
+    timings = {}
+    start = time.perf_counter()
+    tasks = [await crud.task.create(db=db, obj_in=row) for row in task_rows()]
+    timings["create"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for task in tasks:
+        await crud.task.update(db=db, db_obj=task, obj_in={"status": "done"})
+    timings["update"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for task in tasks:
+        await crud.task.remove(db=db, id=task.id)
+    timings["delete"] = time.perf_counter() - start
+    return timings
+
+async def bulk(db):
+    timings = {}
+    start = time.perf_counter()
+    tasks = await crud.task.create_many(db=db, objs_in=task_rows())
+    timings["create"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await crud.task.update_many(db=db, rows=[{"id": task.id, "status": "done"} for task in tasks])
+    timings["update"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await crud.task.remove_many(db=db, ids=[task.id for task in tasks], user_id="bench")
+    timings["delete"] = time.perf_counter() - start
+    return timings
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as db:
+            db.add(User(id="bench", email="bench@example.com", auth_provider_id="bench"))
+            await db.commit()
+
+        results = {}
+        for label, fn in (("one by one", one_by_one), ("bulk", bulk)):
+            async with session_factory() as db:
+                results[label] = await fn(db)
+
+        print("=" * 60)
+        print(f"{TASKS} tasks, SQLite file database")
+        print("=" * 60)
+        for op in ("create", "update", "delete"):
+            slow, fast = results["one by one"][op], results["bulk"][op]
+            print(f"{op:<8} one by one {slow * 1000:8.0f} ms ({TASKS / slow:8.0f} tasks/s)   "
+                  f"bulk {fast * 1000:6.0f} ms ({TASKS / fast:8.0f} tasks/s)   x{slow / fast:.0f}")
+        await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
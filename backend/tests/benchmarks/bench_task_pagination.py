@@ -0,0 +1,116 @@
+"""
+Benchmark: GET /tasks page latency at depth, OFFSET vs keyset pagination.
+
+Loads TOTAL_TASKS tasks (one heavy user owns HEAVY_USER_TASKS of them)
+into a temporary SQLite database and times pages 1, 100 and 1000 for:
+- the old listing (user-filtered OFFSET/LIMIT, newest first)
+- CRUDTask.list_for_user keyset pages, with and without a status filter
+
+Run this with: python tests/benchmarks/bench_task_pagination.py [total_tasks]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.db.base import Base
+from app.models.task import Task
+from app.models.user import User
+
+TOTAL_TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+USERS = 100
+HEAVY_USER_TASKS = TOTAL_TASKS // 5
+PAGE_SIZE = 50
+PAGES = [1, 100, 1000]
+REPEATS = 20
+CHUNK = 20_000
+
+async def seed(engine):
+    base = datetime(2024, 1, 1)
+    async with engine.begin() as conn:
+        await conn.execute(insert(User), [
+            {"id": f"user-{u}", "email": f"user{u}@example.com", "auth_provider_id": f"user-{u}"}
+            for u in range(USERS)
+        ])
+        rows = []
+        for i in range(TOTAL_TASKS):
+            user = 0 if i < HEAVY_USER_TASKS else 1 + i % (USERS - 1)
+            rows.append({
+                "id": f"task-{i:08d}",
+                "user_id": f"user-{user}",
+                "title": f"Task {i}",
+                "status": "done" if i % 4 == 0 else "pending",
+                "priority": "medium",
+                "created_at": base + timedelta(seconds=i // 3),
+            })
+            if len(rows) == CHUNK:
+                await conn.execute(insert(Task), rows)
+                rows = []
+        if rows:
+            await conn.execute(insert(Task), rows)
+
+async def offset_page(db, page, status=None):
+    query = select(Task).filter(Task.user_id == "user-0")
+    if status:
+        query = query.filter(Task.status == status)
+    query = query.order_by(Task.created_at.desc(), Task.id.desc())
+    result = await db.execute(query.offset((page - 1) * PAGE_SIZE).limit(PAGE_SIZE))
+    return result.scalars().all()
+
+async def cursors_for_pages(db, status=None):
+    cursors, cursor = {1: None}, None
+    for page in range(2, PAGES[-1] + 1):
+        _, cursor = await crud.task.list_for_user(
+            db, user_id="user-0", limit=PAGE_SIZE, cursor=cursor, status=status
+        )
+        cursors[page] = cursor
+    return cursors
+
+async def timed(fn):
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'tasks.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        start = time.perf_counter()
+        await seed(engine)
+        print(f"Seeded {TOTAL_TASKS:,} tasks in {time.perf_counter() - start:.1f} s")
+
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        print("=" * 60)
+        print(f"Median latency, {PAGE_SIZE} tasks/page, user with {HEAVY_USER_TASKS:,} tasks")
+        print("=" * 60)
+        async with session_factory() as db:
+            for status in (None, "pending"):
+                label = f"status={status}" if status else "all"
+                offset = [await timed(lambda: offset_page(db, page, status)) for page in PAGES]
+                cursors = await cursors_for_pages(db, status)
+                keyset = [
+                    await timed(lambda: crud.task.list_for_user(
+                        db, user_id="user-0", limit=PAGE_SIZE, cursor=cursors[page], status=status))
+                    for page in PAGES
+                ]
+                for name, latencies in (("OFFSET", offset), ("keyset", keyset)):
+                    cells = "  ".join(f"p{page} {ms:6.2f} ms" for page, ms in zip(PAGES, latencies))
+                    print(f"{name:<7} {label:<15} {cells}")
+        await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
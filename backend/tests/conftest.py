@@ -1,15 +1,18 @@
 
 import pytest
 import asyncio
-from typing import AsyncGenerator, Generator
+from typing import AsyncGenerator, Generator, List
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from httpx import AsyncClient
 
 from app.main import app
+from app.db import session as db_session_module
 from app.db.base import Base
 from app.api.deps import get_db
 from app.core.config import settings
+from tests.helpers import start_stub_server
 
 # Test database URL (use in-memory SQLite for speed)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -49,6 +52,56 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest.fixture(scope="function")
+def statements(db_session: AsyncSession) -> Generator[List[str], None, None]:
+    """
+    Leading keyword (INSERT, SELECT, ...) of every SQL statement sent to the
+    test database. Clear it after seeding, then assert on round-trips.
+    """
+    sent: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        sent.append(statement.split()[0].upper())
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    yield sent
+    event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture(scope="function")
+async def session_factory(tmp_path) -> AsyncGenerator[sessionmaker, None]:
+    """
+    Session factory on a fresh file database, for code that opens several
+    concurrent sessions (each in-memory SQLite connection is its own database).
+    """
+    engine = db_session_module.create_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def stub_server(monkeypatch):
+    """
+    Start local stub API servers: ``stub_server(Handler, settings_urls, **state)``.
+    ``settings_urls`` maps setting names to paths on the stub, e.g.
+    {"GOOGLE_TOKEN_URL": "/token"}; ``state`` becomes server attributes.
+    """
+    servers = []
+
+    def start(handler, settings_urls=None, **state):
+        server = start_stub_server(handler, **state)
+        servers.append(server)
+        for name, path in (settings_urls or {}).items():
+            monkeypatch.setattr(settings, name, server.url + path)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
 @pytest.fixture(scope="function")
 async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     """Create a test client with database override."""
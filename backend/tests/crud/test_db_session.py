@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import text
+
+from app.api import deps
+from app.core.config import Settings
+from app.db import session
+
+
+def test_engine_options_follow_dialect():
+    config = Settings(DB_POOL_SIZE=7, DB_STATEMENT_CACHE_SIZE=0)
+
+    postgres = session.engine_options("postgresql+asyncpg://app:secret@db/app", config)
+    memory = session.engine_options("sqlite+aiosqlite:///:memory:", config)
+
+    assert postgres["echo"] is False
+    assert postgres["pool_size"] == 7
+    assert postgres["pool_pre_ping"] is True
+    assert postgres["connect_args"] == {"prepared_statement_cache_size": 0, "statement_cache_size": 0}
+    # In-memory SQLite uses a single static connection, so no pool settings
+    assert memory == {"echo": False}
+
+
+@pytest.mark.asyncio
+async def test_sqlite_engine_sets_pragmas(tmp_path):
+    engine = session.create_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    try:
+        async with engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+    finally:
+        await engine.dispose()
+
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+
+
+def test_single_get_db_dependency():
+    assert deps.get_db is session.get_db
+    assert session.engine.echo is False
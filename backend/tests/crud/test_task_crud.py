@@ -0,0 +1,206 @@
+import importlib.util
+import uuid
+from pathlib import Path
+
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, schemas
+from app.api.v1.endpoints import tasks
+from app.models.task import Task
+from app.models.user import User
+
+
+async def seed_tasks(db: AsyncSession):
+    db.add_all([
+        User(id="u1", email="u1@example.com", auth_provider_id="u1"),
+        User(id="u2", email="u2@example.com", auth_provider_id="u2"),
+    ])
+    base = datetime(2026, 1, 1, 9, 0, 0)
+    for i in range(25):
+        db.add(Task(
+            id=f"t{i:02d}",
+            user_id="u1",
+            title=f"Task {i}",
+            # Pairs of tasks share a timestamp to exercise the id tie-breaker
+            created_at=base + timedelta(minutes=i // 2),
+            status="done" if i % 3 == 0 else "pending",
+            priority="high" if i % 2 == 0 else "low",
+            deadline=base + timedelta(days=i),
+        ))
+    db.add(Task(id="other", user_id="u2", title="Someone else's", created_at=base))
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_user_tasks_once(db_session: AsyncSession):
+    await seed_tasks(db_session)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        tasks, cursor = await crud.task.list_for_user(db_session, user_id="u1", limit=4, cursor=cursor)
+        seen.extend(task.id for task in tasks)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 7
+    assert seen == [f"t{i:02d}" for i in reversed(range(25))]
+
+
+@pytest.mark.asyncio
+async def test_listing_filters(db_session: AsyncSession):
+    await seed_tasks(db_session)
+    base = datetime(2026, 1, 1, 9, 0, 0)
+
+    done, _ = await crud.task.list_for_user(db_session, user_id="u1", limit=100, status="done")
+    high_pending, _ = await crud.task.list_for_user(
+        db_session, user_id="u1", limit=100, status="pending", priority="high"
+    )
+    due_soon, _ = await crud.task.list_for_user(
+        db_session, user_id="u1", limit=100,
+        deadline_from=base + timedelta(days=2), deadline_to=base + timedelta(days=5),
+    )
+
+    assert {t.id for t in done} == {f"t{i:02d}" for i in range(0, 25, 3)}
+    assert all(t.status == "pending" and t.priority == "high" for t in high_pending)
+    assert [t.id for t in due_soon] == ["t04", "t03", "t02"]
+
+
+async def walk_pages(db: AsyncSession, user_id: str, limit: int):
+    seen, cursor = [], None
+    for _ in range(20):
+        tasks, cursor = await crud.task.list_for_user(db, user_id=user_id, limit=limit, cursor=cursor)
+        seen.extend(task.id for task in tasks)
+        if cursor is None:
+            return seen
+    raise AssertionError(f"Pagination did not end: {seen}")
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_end_for_server_default_timestamps(db_session: AsyncSession):
+    db_session.add(User(id="u1", email="u1@example.com", auth_provider_id="u1"))
+    await db_session.commit()
+    # Written without created_at, as by raw SQL: the server default fills it in
+    for i in range(6):
+        await db_session.execute(
+            text("INSERT INTO tasks (id, user_id, title) VALUES (:id, 'u1', 'Imported')"), {"id": f"id{i}"}
+        )
+    await db_session.commit()
+
+    seen = await walk_pages(db_session, "u1", limit=2)
+
+    assert sorted(seen) == [f"id{i}" for i in range(6)]
+
+
+@pytest.mark.asyncio
+async def test_migration_normalizes_second_precision_timestamps(db_session: AsyncSession):
+    path = Path(__file__).parents[2] / "alembic" / "versions" / "003_task_listing_indexes.py"
+    spec = importlib.util.spec_from_file_location("migration_003", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    db_session.add(User(id="u1", email="u1@example.com", auth_provider_id="u1"))
+    await db_session.commit()
+    # Rows stored by the old CURRENT_TIMESTAMP default, all in the same second
+    for i in range(6):
+        await db_session.execute(
+            text("INSERT INTO tasks (id, user_id, title, created_at) VALUES (:id, 'u1', 'Old', '2026-01-01 09:00:00')"),
+            {"id": f"id{i}"},
+        )
+    await db_session.execute(text(migration.SQLITE_NORMALIZE_CREATED_AT))
+    await db_session.commit()
+
+    seen = await walk_pages(db_session, "u1", limit=2)
+
+    assert seen == [f"id{i}" for i in reversed(range(6))]
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected(db_session: AsyncSession):
+    with pytest.raises(ValueError):
+        await crud.task.list_for_user(db_session, user_id="u1", cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_status_listing_uses_index_order(db_session: AsyncSession):
+    """Filtered pages come straight from idx_tasks_status, without a sort step."""
+    await seed_tasks(db_session)
+    result = await db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE user_id = 'u1' AND status = 'pending' "
+        "ORDER BY created_at DESC, id DESC LIMIT 51"
+    ))
+    plan = " ".join(row[-1] for row in result.all())
+
+    assert "idx_tasks_status" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_update_remove(db_session: AsyncSession, statements):
+    db_session.add(User(id="u1", email="u1@example.com", auth_provider_id="u1"))
+    await db_session.commit()
+    statements.clear()
+
+    created = await crud.task.create_many(db_session, objs_in=[
+        {"user_id": "u1", "title": f"Imported {i}", "priority": "low"} for i in range(30)
+    ])
+    await crud.task.update_many(db_session, rows=[
+        {"id": task.id, "status": "done"} for task in created[:10]
+    ])
+    removed = await crud.task.remove_many(
+        db_session, ids=[task.id for task in created[5:15]] + ["missing"], user_id="u1"
+    )
+
+    # One multi-row INSERT, one executemany UPDATE, one DELETE ... RETURNING
+    assert statements == ["INSERT", "UPDATE", "DELETE"]
+    assert len({task.id for task in created}) == 30
+    assert [task.title for task in created] == [f"Imported {i}" for i in range(30)]
+    assert all(task.created_at is not None for task in created)
+    assert created[0].status == "done"
+    assert sorted(t.id for t in removed) == sorted(t.id for t in created[5:15])
+    remaining, _ = await crud.task.list_for_user(db_session, user_id="u1", limit=100)
+    assert len(remaining) == 20
+    assert sum(t.status == "done" for t in remaining) == 5
+
+
+@pytest.mark.asyncio
+async def test_bulk_endpoints_only_touch_own_tasks(db_session: AsyncSession):
+    owner = User(id=str(uuid.uuid4()), email="owner@example.com", auth_provider_id="owner")
+    stranger = User(id=str(uuid.uuid4()), email="stranger@example.com", auth_provider_id="stranger")
+    mine = Task(id=str(uuid.uuid4()), user_id=owner.id, title="Mine", priority="low")
+    theirs = Task(id=str(uuid.uuid4()), user_id=stranger.id, title="Theirs")
+    db_session.add_all([owner, stranger, mine, theirs])
+    await db_session.commit()
+
+    created = await tasks.create_tasks_bulk(
+        db=db_session,
+        bulk_in=schemas.TaskBulkCreate(tasks=[schemas.TaskCreate(title="A"), schemas.TaskCreate(title="B")]),
+        current_user=owner,
+    )
+    updated = await tasks.update_tasks_bulk(
+        db=db_session,
+        bulk_in=schemas.TaskBulkUpdate(tasks=[
+            schemas.TaskBulkUpdateItem(id=mine.id, status="done"),
+            schemas.TaskBulkUpdateItem(id=theirs.id, status="done"),
+        ]),
+        current_user=owner,
+    )
+    deleted = await tasks.delete_tasks_bulk(
+        db=db_session,
+        bulk_in=schemas.TaskBulkDelete(task_ids=[created[0].id, theirs.id]),
+        current_user=owner,
+    )
+
+    assert [t.user_id for t in created] == [owner.id, owner.id]
+    assert [str(t.id) for t in updated.tasks] == [mine.id]
+    assert updated.tasks[0].status == "done"
+    assert updated.tasks[0].priority == "low"  # Unset fields are left alone
+    assert updated.missing_task_ids == [theirs.id]
+    assert [str(t.id) for t in deleted.tasks] == [created[0].id]
+    assert deleted.missing_task_ids == [theirs.id]
+    theirs_id = theirs.id
+    db_session.expire_all()
+    assert (await db_session.get(Task, theirs_id)).status == "pending"
@@ -76,3 +76,34 @@ async def test_list_users_crud(db_session: AsyncSession):
     users = await crud.user.get_multi(db=db_session, skip=0, limit=3)
     
     assert len(users) == 3
+
+
+@pytest.mark.asyncio
+async def test_crud_writes_are_single_round_trips(db_session: AsyncSession, statements):
+    """Writes must not re-read the row: server values come back via RETURNING."""
+    user = await crud.user.create(
+        db=db_session, obj_in=schemas.UserCreate(email="trips@example.com", auth_provider_id="trips")
+    )
+    assert statements == ["INSERT"]
+    assert user.created_at is not None  # Server default, returned by the INSERT
+
+    statements.clear()
+    user = await crud.user.update(db=db_session, db_obj=user, obj_in={"subscription_tier": "pro"})
+    assert statements == ["UPDATE"]
+    assert user.subscription_tier == "pro"
+    assert user.updated_at is not None  # onupdate value, returned by the UPDATE
+
+    statements.clear()
+    await crud.user.update(db=db_session, db_obj=user, obj_in={"subscription_tier": "pro"})
+    assert statements == []  # Nothing changed, nothing sent
+
+    statements.clear()
+    await crud.user.update(db=db_session, db_obj=user, obj_in={"subscription_tier": "free"}, refresh=False)
+    assert statements == ["UPDATE"]
+    assert user.subscription_tier == "free"
+
+    statements.clear()
+    removed = await crud.user.remove(db=db_session, id=user.id)
+    assert statements == ["DELETE"]
+    assert removed.email == "trips@example.com"
+    assert await crud.user.remove(db=db_session, id=user.id) is None
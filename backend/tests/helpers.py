@@ -0,0 +1,85 @@
+"""
+Shared test helpers: local stub HTTP servers for provider APIs, and
+seeding/reading helpers for calendar integrations.
+
+Imported by tests (through the fixtures in conftest.py) and by the
+benchmarks, which run from the backend directory.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+from sqlalchemy import select
+
+from app.models.event import CalendarEvent
+from app.models.user import User, UserIntegration
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+
+
+class JsonHandler(BaseHTTPRequestHandler):
+    """Base handler for stub APIs: keep-alive, quiet, JSON in and out."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse is visible
+
+    def log_message(self, *args):
+        pass
+
+    def read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def send_json(self, status: int, body: Any) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded local server; handler state lives in attributes set on it."""
+
+    request_queue_size = 1024  # Accept a whole burst of connections at once
+    daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def handle_error(self, request, client_address):
+        pass  # Clients that hang up mid-response (e.g. on shutdown)
+
+    def start(self) -> "StubServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def start_stub_server(handler: type, **state: Any) -> StubServer:
+    """Serve ``handler`` on a free local port in a background thread."""
+    server = StubServer(("127.0.0.1", 0), handler)
+    for name, value in state.items():
+        setattr(server, name, value)
+    return server.start()
+
+
+async def seed_integration(db_session, provider: str, user_id: str = USER_ID, **fields: Any) -> UserIntegration:
+    """Create a user with one calendar integration (access token "access" unless given)."""
+    integration = UserIntegration(user_id=user_id, provider=provider, **{"access_token": "access", **fields})
+    db_session.add(User(id=user_id, email=f"{provider}-{user_id}@example.com"))
+    db_session.add(integration)
+    await db_session.commit()
+    return integration
+
+
+async def stored_events(db_session, user_id: str = USER_ID) -> Dict[str, str]:
+    """external_id -> title of the user's stored calendar events."""
+    result = await db_session.execute(
+        select(CalendarEvent.external_id, CalendarEvent.title).where(CalendarEvent.user_id == user_id)
+    )
+    return dict(result.all())
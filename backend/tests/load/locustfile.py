@@ -73,3 +73,12 @@ class BurstTraffic(HttpUser):
                 headers=self.headers,
                 json={"title": "Burst task"}
             )
+    
+    @task
+    def rapid_bulk_creation(self):
+        """Create the same burst of tasks in one bulk request."""
+        self.client.post(
+            "/api/v1/tasks/bulk",
+            headers=self.headers,
+            json={"tasks": [{"title": "Burst task"} for _ in range(10)]}
+        )
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from app.core.cache import LRUTier, ResponseCache
+from app.services.ai_pipeline.cache import make_cache_key
+from app.services.ai_pipeline.llm_factory import LLMUnavailableError
+from app.services.ai_pipeline.nodes import analyze
+from app.services.ai_pipeline.state import TaskAnalysisState
+
+
+class CountingLLM:
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+
+        class Response:
+            content = json.dumps({
+                "estimated_duration_minutes": 45,
+                "suggested_tags": ["writing"],
+                "reasoning": "Counted",
+            })
+        return Response()
+
+
+def test_cache_key_depends_on_prompt_and_model():
+    key = make_cache_key("model-a", 0, "system", "user")
+
+    assert key == make_cache_key("model-a", 0, "system", "user")
+    assert key != make_cache_key("model-b", 0, "system", "user")
+    assert key != make_cache_key("model-a", 0.7, "system", "user")
+    assert key != make_cache_key("model-a", 0, "system", "other user")
+
+
+def test_lru_tier_evicts_by_size_and_ttl():
+    tier = LRUTier(max_entries=2, ttl_seconds=60)
+    tier.set("a", 1)
+    tier.set("b", 2)
+    tier.get("a")
+    tier.set("c", 3)
+
+    assert tier.get("b") is None
+    assert tier.get("a") == 1
+    assert tier.evictions == 1
+
+    expired = LRUTier(max_entries=2, ttl_seconds=-1)
+    expired.set("a", 1)
+    assert expired.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_analyze_task_reuses_cached_result(monkeypatch):
+    """Unchanged task inputs are answered from the cache."""
+    llm = CountingLLM()
+    analysis_cache = ResponseCache(namespace="test", max_entries=10, ttl_seconds=60)
+    monkeypatch.setattr(analyze, "get_llm", lambda temperature=0: llm)
+    monkeypatch.setattr(analyze, "analysis_cache", analysis_cache)
+
+    state = TaskAnalysisState(task_id="t1", user_id="u1", title="Write report")
+    first = await analyze.analyze_task(state)
+    second = await analyze.analyze_task(state)
+    changed = await analyze.analyze_task(state.model_copy(update={"priority": "high"}))
+
+    assert first == second == changed
+    assert llm.calls == 2
+    assert analysis_cache.stats()["hits"] == 1
+    assert analysis_cache.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_llm_raises_instead_of_mock_analysis(monkeypatch):
+    """A live request never gets made-up estimates when the model call fails."""
+    class DownLLM:
+        async def ainvoke(self, messages):
+            raise ConnectionError("connection refused")
+
+    analysis_cache = ResponseCache(namespace="test", max_entries=10, ttl_seconds=60)
+    monkeypatch.setattr(analyze, "get_llm", lambda temperature=0: DownLLM())
+    monkeypatch.setattr(analyze, "analysis_cache", analysis_cache)
+
+    with pytest.raises(LLMUnavailableError, match="connection refused"):
+        await analyze.analyze_task(TaskAnalysisState(task_id="t1", user_id="u1", title="Write report"))
+    assert len(analysis_cache.local) == 0
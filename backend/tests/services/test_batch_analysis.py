@@ -0,0 +1,111 @@
+import json
+import re
+
+import pytest
+
+from app.api.v1.endpoints import ai
+from app.core.cache import ResponseCache
+from app.models.task import Task
+from app.models.user import User
+from app.services.ai_pipeline.nodes import analyze
+from app.services.ai_pipeline.state import TaskAnalysisState
+
+
+class BatchLLM:
+    """Answers multi-task prompts, optionally dropping some indices."""
+
+    def __init__(self, drop=()):
+        self.calls = []
+        self.drop = set(drop)
+
+    async def ainvoke(self, messages):
+        prompt = messages[-1].content
+        indices = [int(i) for i in re.findall(r"^\[(\d+)\]$", prompt, re.M)]
+        self.calls.append(len(indices) or 1)
+
+        class Response:
+            pass
+
+        response = Response()
+        if indices:
+            response.content = json.dumps({"results": [
+                {"index": i, "estimated_duration_minutes": 10 * (i + 1), "reasoning": f"task {i}"}
+                for i in indices if i not in self.drop
+            ]})
+        else:
+            response.content = json.dumps({"estimated_duration_minutes": 99, "reasoning": "single"})
+        return response
+
+
+@pytest.fixture
+def batch_llm(monkeypatch):
+    def install(llm):
+        monkeypatch.setattr(analyze, "get_llm", lambda temperature=0: llm)
+        monkeypatch.setattr(
+            analyze, "analysis_cache", ResponseCache(namespace="test", max_entries=100, ttl_seconds=60)
+        )
+        return llm
+    return install
+
+
+def make_states(n):
+    return [TaskAnalysisState(task_id=f"t{i}", user_id="u1", title=f"Task {i}") for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_tasks_are_grouped_into_multi_task_prompts(batch_llm):
+    llm = batch_llm(BatchLLM())
+
+    results = await analyze.analyze_tasks(make_states(7), group_size=3)
+
+    # Two groups of 3, and the trailing single task uses the one-task prompt
+    assert sorted(llm.calls) == [1, 3, 3]
+    assert [r["estimated_duration_minutes"] for r in results] == [10, 20, 30, 10, 20, 30, 99]
+
+
+@pytest.mark.asyncio
+async def test_dropped_batch_items_fall_back_to_single_prompt(batch_llm):
+    llm = batch_llm(BatchLLM(drop={1}))
+
+    results = await analyze.analyze_tasks(make_states(3), group_size=3)
+
+    assert llm.calls == [3, 1]
+    assert results[1]["ai_reasoning"] == "single"
+    assert results[2]["ai_reasoning"] == "task 2"
+
+
+@pytest.mark.asyncio
+async def test_batch_results_are_cached_per_task(batch_llm):
+    llm = batch_llm(BatchLLM())
+    states = make_states(4)
+
+    await analyze.analyze_tasks(states, group_size=4)
+    single = await analyze.analyze_task(states[2])
+
+    assert llm.calls == [4]
+    assert single["estimated_duration_minutes"] == 30
+
+
+@pytest.mark.asyncio
+async def test_batch_endpoint_updates_owned_tasks(db_session, batch_llm):
+    batch_llm(BatchLLM())
+    owner = User(id="u1", email="owner@example.com", auth_provider_id="u1")
+    other = User(id="u2", email="other@example.com", auth_provider_id="u2")
+    db_session.add_all([owner, other])
+    db_session.add_all([Task(id=f"t{i}", user_id="u1", title=f"Task {i}") for i in range(3)])
+    db_session.add(Task(id="foreign", user_id="u2", title="Not yours"))
+    await db_session.commit()
+
+    response = await ai.analyze_tasks_endpoint(
+        db=db_session,
+        request=ai.BatchAnalysisRequest(task_ids=["t2", "t0", "foreign", "missing", "t1", "t0"]),
+        current_user=owner,
+    )
+
+    assert [r.task_id for r in response.results] == ["t2", "t0", "t1"]
+    assert response.missing_task_ids == ["foreign", "missing"]
+    db_session.expire_all()
+    stored = await db_session.get(Task, "t2")
+    assert stored.estimated_duration_minutes == response.results[0].estimated_duration_minutes
+    assert stored.ai_reasoning == response.results[0].ai_reasoning
+    assert (await db_session.get(Task, "foreign")).ai_reasoning is None
@@ -0,0 +1,218 @@
+import email
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from app.models.event import CalendarEvent
+from app.models.task import Task
+from app.services.calendar_sync.google import GoogleCalendarService
+from app.services.calendar_sync.sync import push_events, sync_calendar
+from app.services.scheduling.freebusy import freebusy
+from tests.helpers import USER_ID, seed_integration, stored_events
+DAY = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+
+def google_event(event_id, hour, title="Meeting", status="confirmed"):
+    start = DAY + timedelta(hours=hour)
+    return {
+        "id": event_id,
+        "status": status,
+        "summary": title,
+        "start": {"dateTime": start.isoformat() + "Z"},
+        "end": {"dateTime": (start + timedelta(hours=1)).isoformat() + "Z"},
+    }
+
+
+class FakeCalendar:
+    """Calendar API stand-in answering events.list from canned pages per sync token."""
+
+    def __init__(self):
+        self.pages = {}  # sync token (None = full sync) -> list of pages
+        self.expired = set()
+        self.calls = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        self.calls.append(params)
+        token = params.get("syncToken")
+        if token in self.expired:
+            return httpx.Response(410, json={"error": {"message": "Sync token is no longer valid"}})
+        return httpx.Response(200, json=self.pages[token][int(params.get("pageToken", 0))])
+
+
+def google_service(fake):
+    http = httpx.AsyncClient(transport=httpx.MockTransport(fake.handle))
+    return GoogleCalendarService({"token": "access"}, http=http)
+
+
+@pytest.mark.asyncio
+async def test_full_then_incremental_sync(db_session):
+    integration = await seed_integration(db_session, "google")
+    fake = FakeCalendar()
+    fake.pages[None] = [
+        {"items": [google_event("a", 9), google_event("b", 11)], "nextPageToken": "1"},
+        {"items": [google_event("c", 14)], "nextSyncToken": "token-1"},
+    ]
+
+    result = await sync_calendar(db_session, integration, google_service(fake))
+
+    assert result == {"status": "synced", "events_synced": 3, "events_deleted": 0}
+    assert integration.sync_token == "token-1"
+    assert await stored_events(db_session) == {"a": "Meeting", "b": "Meeting", "c": "Meeting"}
+    assert [call.get("pageToken") for call in fake.calls] == [None, "1"]
+
+    # The next sync asks only for changes: one moved/renamed, one cancelled
+    index = await freebusy.get_index(db_session, USER_ID, DAY, DAY + timedelta(days=1))
+    fake.pages["token-1"] = [{
+        "items": [google_event("a", 16, title="Moved"), google_event("b", 11, status="cancelled")],
+        "nextSyncToken": "token-2",
+    }]
+    result = await sync_calendar(db_session, integration, google_service(fake))
+
+    assert result == {"status": "synced", "events_synced": 1, "events_deleted": 1}
+    assert fake.calls[-1]["syncToken"] == "token-1"
+    assert "timeMin" not in fake.calls[-1]
+    assert integration.sync_token == "token-2"
+    assert await stored_events(db_session) == {"a": "Moved", "c": "Meeting"}
+
+    # Bulk writes bypass the ORM listeners; the sync invalidates the index itself
+    refreshed = await freebusy.get_index(db_session, USER_ID, DAY, DAY + timedelta(days=1))
+    assert refreshed is not index
+    assert refreshed.busy_between(DAY, DAY + timedelta(days=1)) == [
+        (DAY + timedelta(hours=14), DAY + timedelta(hours=15)),
+        (DAY + timedelta(hours=16), DAY + timedelta(hours=17)),
+    ]
+    freebusy.clear()
+
+
+@pytest.mark.asyncio
+async def test_expired_sync_token_triggers_full_resync(db_session):
+    integration = await seed_integration(db_session, "google")
+    fake = FakeCalendar()
+    fake.pages[None] = [{"items": [google_event("a", 9), google_event("b", 10)], "nextSyncToken": "token-1"}]
+    await sync_calendar(db_session, integration, google_service(fake))
+
+    # "b" was deleted while the token was stale; only a full listing reveals it
+    fake.expired.add("token-1")
+    fake.pages[None] = [{"items": [google_event("a", 9)], "nextSyncToken": "token-2"}]
+    result = await sync_calendar(db_session, integration, google_service(fake))
+
+    assert result["status"] == "resynced"
+    assert integration.sync_token == "token-2"
+    assert await stored_events(db_session) == {"a": "Meeting"}
+    freebusy.clear()
+
+
+@pytest.mark.asyncio
+async def test_full_resync_keeps_task_links_of_returned_events(db_session):
+    integration = await seed_integration(db_session, "google")
+    task = Task(user_id=USER_ID, title="Write report")
+    db_session.add(task)
+    await db_session.flush()
+    # Pushed earlier by the planner, so it carries the link to its task
+    db_session.add(
+        CalendarEvent(
+            user_id=USER_ID, task_id=task.id, title="Write report", source="google",
+            external_id="a", start_time=DAY + timedelta(hours=9), end_time=DAY + timedelta(hours=10),
+        )
+    )
+    await db_session.commit()
+
+    fake = FakeCalendar()
+    fake.expired.add("token-1")
+    integration.sync_token = "token-1"
+    fake.pages[None] = [
+        {"items": [google_event("a", 11, "Write report"), google_event("c", 14)], "nextSyncToken": "token-2"}
+    ]
+    await sync_calendar(db_session, integration, google_service(fake))
+    fake.expired.add("token-2")
+    fake.pages[None] = [{"items": [google_event("a", 11, "Write report")], "nextSyncToken": "token-3"}]
+    result = await sync_calendar(db_session, integration, google_service(fake))
+
+    assert result["status"] == "resynced"
+    assert result["events_deleted"] == 1
+    rows = await db_session.execute(
+        select(CalendarEvent.external_id, CalendarEvent.task_id, CalendarEvent.start_time)
+    )
+    assert [(external_id, task_id, start.hour) for external_id, task_id, start in rows] == [("a", task.id, 11)]
+    freebusy.clear()
+
+
+class FakeBatchEndpoint:
+    """Calendar batch endpoint: answers each multipart part; 'missing' ids 404."""
+
+    def __init__(self):
+        self.requests = []
+        self.writes = []  # (method, path, body) per batched op
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.method, request.url.path))
+        message = email.message_from_bytes(
+            b"Content-Type: " + request.headers["content-type"].encode() + b"\r\n\r\n" + request.content
+        )
+        boundary = "response_boundary"
+        answer = []
+        for part in message.get_payload():
+            head, _, body = part.get_payload().partition("\r\n\r\n")
+            method, path, _ = head.split("\r\n")[0].split(" ")
+            self.writes.append((method, path, json.loads(body) if body.strip() else None))
+            if path.endswith("/missing"):
+                status, payload = "404 Not Found", {"error": {"message": "Not Found"}}
+            else:
+                event_id = path.rsplit("/", 1)[-1] if method == "PATCH" else f"g-{len(self.writes)}"
+                status, payload = "200 OK", {"id": event_id}
+            answer.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{part['Content-ID'].strip('<>')}>\r\n\r\n"
+                f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n\r\n{json.dumps(payload)}\r\n"
+            )
+        return httpx.Response(
+            200,
+            content="".join(answer) + f"--{boundary}--\r\n",
+            headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+        )
+
+
+@pytest.mark.asyncio
+async def test_push_batches_writes_and_links_new_rows(db_session):
+    integration = await seed_integration(db_session, "google")
+    events = [
+        CalendarEvent(
+            user_id=USER_ID,
+            title=f"Block {i}",
+            start_time=DAY + timedelta(minutes=10 * i),
+            end_time=DAY + timedelta(minutes=10 * i + 10),
+            # 40 already live in Google (moved by a reschedule), 60 are new
+            source="google" if i < 40 else "planner",
+            external_id=("missing" if i == 0 else f"existing-{i}") if i < 40 else None,
+        )
+        for i in range(100)
+    ]
+    db_session.add_all(events)
+    await db_session.commit()
+    event_ids = [event.id for event in events]
+
+    fake = FakeBatchEndpoint()
+    http = httpx.AsyncClient(transport=httpx.MockTransport(fake.handle))
+    service = GoogleCalendarService({"token": "access"}, http=http)
+    result = await push_events(db_session, integration, events, service)
+
+    assert len(fake.requests) <= 3
+    assert all(method == "POST" and path.startswith("/batch/") for method, path in fake.requests)
+    assert sorted({method for method, _, _ in fake.writes}) == ["PATCH", "POST"]
+    assert fake.writes[1][2] == {
+        "summary": "Block 1",
+        "start": {"dateTime": (DAY + timedelta(minutes=10)).isoformat(), "timeZone": "UTC"},
+        "end": {"dateTime": (DAY + timedelta(minutes=20)).isoformat(), "timeZone": "UTC"},
+    }
+    assert result["events_written"] == 99
+    assert result["errors"] == [{"event_id": event_ids[0], "error": "Not Found"}]
+
+    # New rows now carry their Google id, so the next sync updates them in place
+    rows = await db_session.execute(
+        select(CalendarEvent.source, CalendarEvent.external_id).where(CalendarEvent.id.in_(event_ids[40:]))
+    )
+    assert all(source == "google" and external_id.startswith("g-") for source, external_id in rows)
@@ -0,0 +1,163 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.models.user import User, UserIntegration
+from app.services.calendar_sync.scheduler import CalendarSyncScheduler, CircuitBreaker, TokenBucket
+
+INTERVAL = 600
+
+
+async def seed(session_factory, providers):
+    async with session_factory() as db:
+        await db.execute(insert(User), [
+            {"id": f"user-{i}", "email": f"user{i}@example.com"} for i in range(len(providers))
+        ])
+        await db.execute(insert(UserIntegration), [
+            {"user_id": f"user-{i}", "provider": provider, "access_token": "access"}
+            for i, provider in enumerate(providers)
+        ])
+        await db.commit()
+
+
+async def integrations(session_factory):
+    async with session_factory() as db:
+        return (await db.scalars(select(UserIntegration).order_by(UserIntegration.user_id))).all()
+
+
+def scheduler_for(session_factory, sync_fn, **kwargs):
+    return CalendarSyncScheduler(
+        session_factory=session_factory,
+        interval_seconds=INTERVAL,
+        jitter_seconds=10,
+        rate_limits={"google": 1000, "microsoft": 1000},
+        sync_fn=sync_fn,
+        service_factory=lambda integration: None,
+        **kwargs,
+    )
+
+
+async def fake_sync(db, integration, service):
+    integration.sync_token = "token"
+    integration.last_synced_at = datetime.utcnow()
+    await db.commit()
+    return {"status": "synced", "events_synced": 0, "events_deleted": 0}
+
+
+@pytest.mark.asyncio
+async def test_new_integrations_are_spread_then_synced_once_per_interval(session_factory):
+    await seed(session_factory, ["google"] * 50)
+    scheduler = scheduler_for(session_factory, fake_sync)
+    now = datetime.utcnow()
+
+    # First sight assigns slots spread over one interval instead of syncing everyone
+    assert await scheduler.run_once(now) == 0
+    slots = sorted((row.next_sync_at - now).total_seconds() for row in await integrations(session_factory))
+    assert 0 <= slots[0] and slots[-1] < INTERVAL
+    assert slots[24] - slots[0] > INTERVAL / 4 and slots[-1] - slots[25] > INTERVAL / 4
+
+    # Half an interval later roughly half are due
+    started = await scheduler.run_once(now + timedelta(seconds=INTERVAL / 2))
+    await scheduler.drain()
+    assert 10 < started < 40
+    synced = [row for row in await integrations(session_factory) if row.sync_token]
+    assert len(synced) == started
+    for row in synced:
+        assert row.next_sync_at > now + timedelta(seconds=INTERVAL - 10)
+
+    stats = scheduler.stats()
+    assert stats["providers"]["google"]["synced"] == started
+    assert stats["lag_seconds"]["max"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_failing_provider_opens_its_circuit_and_backs_off(session_factory):
+    await seed(session_factory, ["microsoft"] * 6 + ["google"] * 4)
+
+    async def flaky_sync(db, integration, service):
+        if integration.provider == "microsoft":
+            raise RuntimeError("Graph unavailable")
+        return await fake_sync(db, integration, service)
+
+    scheduler = scheduler_for(
+        session_factory, flaky_sync, max_concurrency=1, breaker_failures=3, breaker_reset_seconds=300
+    )
+    past = datetime.utcnow() - timedelta(seconds=1)
+    async with session_factory() as db:
+        await db.execute(UserIntegration.__table__.update().values(next_sync_at=past))
+        await db.commit()
+
+    await scheduler.run_once()
+    await scheduler.drain()
+    stats = scheduler.stats()["providers"]
+    assert stats["google"]["synced"] == 4
+    assert stats["microsoft"]["failed"] == 3
+    assert scheduler.breakers["microsoft"].state == "open"
+
+    # The open circuit parks the remaining integrations until it may close
+    await scheduler.run_once()
+    await scheduler.drain()
+    rows = {row.user_id: row for row in await integrations(session_factory)}
+    failed = [row for row in rows.values() if row.sync_failures]
+    assert len(failed) == 3
+    assert all("Graph unavailable" in row.last_sync_error for row in failed)
+    assert all(row.next_sync_at > datetime.utcnow() for row in rows.values())
+    assert scheduler.stats()["providers"]["microsoft"]["skipped_open_circuit"] == 3
+
+
+@pytest.mark.asyncio
+async def test_aware_slots_from_postgres_are_synced(session_factory):
+    await seed(session_factory, ["google"])
+    scheduler = scheduler_for(session_factory, fake_sync)
+    scheduler._semaphore = asyncio.Semaphore(1)
+    due_at = datetime.now(timezone.utc) - timedelta(seconds=5)  # asyncpg returns aware values
+
+    await scheduler._sync_one("user-0", "google", due_at)
+
+    [row] = await integrations(session_factory)
+    assert row.sync_token == "token"
+    assert row.next_sync_at > datetime.utcnow() + timedelta(seconds=INTERVAL - 20)
+    assert 4 < scheduler.stats()["lag_seconds"]["max"] < 10
+
+
+@pytest.mark.asyncio
+async def test_any_error_in_a_sync_records_a_failure_and_backs_off(session_factory):
+    await seed(session_factory, ["google"])
+    scheduler = scheduler_for(session_factory, fake_sync, retry_backoff_seconds=60)
+    scheduler._semaphore = asyncio.Semaphore(1)
+    limiter, _, counters = scheduler._provider("google")
+
+    async def broken_acquire():
+        raise RuntimeError("limiter broke")
+
+    limiter.acquire = broken_acquire
+    await scheduler._sync_one("user-0", "google", datetime.utcnow())
+
+    [row] = await integrations(session_factory)
+    assert row.sync_failures == 1 and "limiter broke" in row.last_sync_error
+    assert row.next_sync_at > datetime.utcnow() + timedelta(seconds=50)
+    assert counters["failed"] == 1 and not scheduler._in_flight
+
+
+def test_circuit_breaker_half_open_allows_one_trial():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.01)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    time.sleep(0.02)
+    assert breaker.allow() and not breaker.allow()  # One trial at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, burst=1)
+    start = time.perf_counter()
+    await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+    assert time.perf_counter() - start >= 5 / 50 * 0.9
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+import pytest
+from langgraph.checkpoint.base.id import uuid6
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.services.ai_pipeline.checkpointer import PooledSqliteSaver
+from app.services.ai_pipeline import retention as retention_module
+from app.services.ai_pipeline.graph import HITL_INTERRUPT_BEFORE, get_compiled_app
+from app.services.ai_pipeline.retention import CheckpointRetention, uuid6_floor
+
+
+def test_uuid6_floor_orders_with_checkpoint_ids():
+    now = uuid6()
+    assert uuid6_floor(datetime.utcnow() - timedelta(minutes=1)) < str(now)
+    assert str(now) < uuid6_floor(datetime.utcnow() + timedelta(minutes=1))
+
+
+async def count_rows(saver, thread_id):
+    async with saver.writer.conn.execute(
+        "SELECT COUNT(*) FROM checkpoints WHERE thread_id = ?", (thread_id,)
+    ) as cur:
+        return (await cur.fetchone())[0]
+
+
+@pytest.fixture
+async def saver_with_threads(tmp_path):
+    saver = await PooledSqliteSaver.open(str(tmp_path / "checkpoints.db"), readers=2)
+    app = get_compiled_app("hitl", saver, HITL_INTERRUPT_BEFORE)
+    for thread_id in ("done", "waiting"):
+        config = {"configurable": {"thread_id": thread_id}}
+        await app.ainvoke({"task_id": "t1", "user_id": "u1", "title": "Write report"}, config)
+    done = {"configurable": {"thread_id": "done"}}
+    await app.aupdate_state(done, {"selected_option_id": "1"})
+    await app.ainvoke(None, done)
+
+    async def is_completed(thread_id):
+        return not (await app.aget_state({"configurable": {"thread_id": thread_id}})).next
+
+    yield saver, app, is_completed
+    await saver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_completed_threads_keep_only_latest_checkpoint(saver_with_threads):
+    saver, app, is_completed = saver_with_threads
+    waiting_before = await count_rows(saver, "waiting")
+    final_state = (await app.aget_state({"configurable": {"thread_id": "done"}})).values
+
+    retention = CheckpointRetention(max_age_days=30, batch_size=1, pause_seconds=0)
+    stats = await retention.sweep(saver, is_completed)
+
+    assert await count_rows(saver, "done") == 1
+    assert await count_rows(saver, "waiting") == waiting_before
+    assert stats["threads_compacted"] == 1
+    assert stats["checkpoints_deleted"] > 0
+    snapshot = await app.aget_state({"configurable": {"thread_id": "done"}})
+    assert snapshot.next == ()
+    assert snapshot.values == final_state
+
+
+@pytest.mark.asyncio
+async def test_expired_threads_are_deleted_and_space_reclaimed(saver_with_threads):
+    saver, _, is_completed = saver_with_threads
+
+    retention = CheckpointRetention(max_age_days=-1, pause_seconds=0)
+    stats = await retention.sweep(saver, is_completed)
+    storage = await retention.describe(saver)
+
+    assert stats["threads_deleted"] == 2
+    assert storage["threads"] == 0
+    assert storage["writes"] == 0
+    assert stats["bytes_reclaimed"] > 0
+    assert storage["free_bytes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_retention_warns_and_stays_off_for_other_backends(monkeypatch, capsys):
+    monkeypatch.setattr(retention_module, "current_checkpointer", lambda: MemorySaver())
+
+    retention = CheckpointRetention()
+    retention.start()
+
+    assert retention._task is None
+    assert "only supports the SQLite checkpointer" in capsys.readouterr().out
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.core.config import settings
+from app.services.ai_pipeline import checkpointer as checkpointer_module
+from app.services.ai_pipeline.checkpointer import PooledSqliteSaver, resolve_backend
+from app.services.ai_pipeline.graph import HITL_INTERRUPT_BEFORE, get_compiled_app
+
+
+@pytest.mark.asyncio
+async def test_pooled_sqlite_saver_runs_hitl_workflow(tmp_path):
+    saver = await PooledSqliteSaver.open(str(tmp_path / "checkpoints.db"), readers=2)
+    try:
+        async with saver.writer.conn.execute("PRAGMA journal_mode") as cur:
+            assert (await cur.fetchone())[0] == "wal"
+
+        app = get_compiled_app("hitl", saver, HITL_INTERRUPT_BEFORE)
+        config = {"configurable": {"thread_id": "thread-1"}}
+        await app.ainvoke({"task_id": "t1", "user_id": "u1", "title": "Write report"}, config)
+
+        snapshot = await app.aget_state(config)
+        assert snapshot.next == ("human_review",)
+        assert snapshot.values["user_id"] == "u1"
+        history = [item async for item in app.aget_state_history(config)]
+        assert len(history) >= 3
+    finally:
+        await saver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_reader_connections_are_read_only_and_shared(tmp_path):
+    saver = await PooledSqliteSaver.open(str(tmp_path / "checkpoints.db"), readers=2)
+    try:
+        config = {"configurable": {"thread_id": "missing"}}
+        results = await asyncio.gather(*(saver.aget_tuple(config) for _ in range(10)))
+        assert results == [None] * 10
+        assert saver._idle.qsize() == 2
+
+        async with saver.readers[0].conn.execute("PRAGMA query_only") as cur:
+            assert (await cur.fetchone())[0] == 1
+    finally:
+        await saver.aclose()
+
+
+def test_auto_backend_follows_database_url(monkeypatch):
+    monkeypatch.setattr(settings, "CHECKPOINT_BACKEND", "auto")
+    monkeypatch.setattr(settings, "CHECKPOINT_POSTGRES_URL", None)
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgresql+asyncpg://u:p@db/app")
+    assert resolve_backend() == "postgres"
+    assert checkpointer_module._psycopg_url(settings.DATABASE_URL) == "postgresql://u:p@db/app"
+
+    monkeypatch.setattr(settings, "DATABASE_URL", "sqlite+aiosqlite:///./app.db")
+    assert resolve_backend() == "sqlite"
+
+
+@pytest.mark.asyncio
+async def test_open_checkpointer_is_idempotent_and_closable(monkeypatch):
+    monkeypatch.setattr(settings, "CHECKPOINT_BACKEND", "memory")
+    monkeypatch.setattr(checkpointer_module, "_checkpointer", None)
+
+    first = await checkpointer_module.open_checkpointer()
+    second = await checkpointer_module.open_checkpointer()
+    assert isinstance(first, MemorySaver)
+    assert first is second
+
+    await checkpointer_module.close_checkpointer()
+    assert checkpointer_module.current_checkpointer() is None
@@ -0,0 +1,121 @@
+from datetime import datetime
+
+import pytest
+
+from app import crud
+from app.models.event import CalendarEvent
+from app.models.user import User
+from app.services.scheduling.freebusy import BusyIndex, FreeBusyService
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+DAY_START = datetime(2026, 1, 19, 0, 0)
+DAY_END = datetime(2026, 1, 20, 0, 0)
+
+
+def at(hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 1, 19, hour, minute)
+
+
+def test_busy_index_queries():
+    index = BusyIndex(
+        [(at(9), at(10)), (at(9, 30), at(11)), (at(14), at(15))], DAY_START, DAY_END
+    )
+
+    assert len(index) == 2
+    assert index.is_busy(at(10, 30), at(10, 45))
+    assert not index.is_busy(at(11), at(14))
+    assert index.busy_between(at(12), at(16)) == [(at(14), at(15))]
+    assert index.free_between(at(8), at(16)) == [
+        (at(8), at(9)),
+        (at(11), at(14)),
+        (at(15), at(16)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_index_is_cached_and_invalidated_on_write(db_session):
+    service = FreeBusyService(max_users=10, ttl_seconds=60)
+    db_session.add(User(id=USER_ID, email="freebusy@example.com"))
+    db_session.add(CalendarEvent(user_id=USER_ID, title="Standup", start_time=at(9), end_time=at(10)))
+    await db_session.commit()
+
+    index = await service.get_index(db_session, USER_ID, DAY_START, DAY_END)
+    assert index.busy_between(DAY_START, DAY_END) == [(at(9), at(10))]
+    assert await service.get_index(db_session, USER_ID, at(8), at(12)) is index
+
+    # A private service instance is invalidated explicitly
+    db_session.add(CalendarEvent(user_id=USER_ID, title="Review", start_time=at(13), end_time=at(14)))
+    await db_session.commit()
+    service.invalidate(USER_ID)
+
+    refreshed = await service.get_index(db_session, USER_ID, DAY_START, DAY_END)
+    assert refreshed is not index
+    assert refreshed.busy_between(DAY_START, DAY_END) == [(at(9), at(10)), (at(13), at(14))]
+
+
+@pytest.mark.asyncio
+async def test_event_write_invalidates_shared_index(db_session):
+    from app.services.scheduling.freebusy import freebusy
+
+    db_session.add(User(id=USER_ID, email="shared@example.com"))
+    await db_session.commit()
+    index = await freebusy.get_index(db_session, USER_ID, DAY_START, DAY_END)
+
+    db_session.add(CalendarEvent(user_id=USER_ID, title="Lunch", start_time=at(12), end_time=at(13)))
+    await db_session.commit()
+
+    assert await freebusy.get_index(db_session, USER_ID, DAY_START, DAY_END) is not index
+    freebusy.clear()
+
+
+@pytest.mark.asyncio
+async def test_shared_index_is_invalidated_on_commit_not_flush(db_session):
+    from app.services.scheduling.freebusy import freebusy
+
+    db_session.add(User(id=USER_ID, email="commit@example.com"))
+    await db_session.commit()
+    index = await freebusy.get_index(db_session, USER_ID, DAY_START, DAY_END)
+
+    db_session.add(CalendarEvent(user_id=USER_ID, title="Lunch", start_time=at(12), end_time=at(13)))
+    await db_session.flush()
+    assert await freebusy.get_index(db_session, USER_ID, DAY_START, DAY_END) is index
+    await db_session.rollback()
+    assert await freebusy.get_index(db_session, USER_ID, DAY_START, DAY_END) is index
+
+    db_session.add(CalendarEvent(user_id=USER_ID, title="Lunch", start_time=at(12), end_time=at(13)))
+    await db_session.flush()
+    await db_session.commit()
+    refreshed = await freebusy.get_index(db_session, USER_ID, DAY_START, DAY_END)
+    assert refreshed is not index
+    assert refreshed.busy_between(DAY_START, DAY_END) == [(at(12), at(13))]
+    freebusy.clear()
+
+
+@pytest.mark.asyncio
+async def test_crud_event_writes_invalidate_shared_index(db_session):
+    from app.services.scheduling.freebusy import freebusy
+
+    db_session.add(User(id=USER_ID, email="crud@example.com"))
+    await db_session.commit()
+
+    # Each write is a Core statement, invisible to the session listeners
+    index = await freebusy.get_index(db_session, USER_ID, DAY_START, DAY_END)
+    event = await crud.event.create(
+        db_session, obj_in={"user_id": USER_ID, "title": "Lunch", "start_time": at(12), "end_time": at(13)}
+    )
+    refreshed = await freebusy.get_index(db_session, USER_ID, DAY_START, DAY_END)
+    assert refreshed is not index
+    assert refreshed.busy_between(DAY_START, DAY_END) == [(at(12), at(13))]
+
+    await crud.event.update(db_session, db_obj=event, obj_in={"end_time": at(14)})
+    refreshed = await freebusy.get_index(db_session, USER_ID, DAY_START, DAY_END)
+    assert refreshed.busy_between(DAY_START, DAY_END) == [(at(12), at(14))]
+
+    await crud.event.update_many(db_session, rows=[{"id": event.id, "start_time": at(11)}])
+    refreshed = await freebusy.get_index(db_session, USER_ID, DAY_START, DAY_END)
+    assert refreshed.busy_between(DAY_START, DAY_END) == [(at(11), at(14))]
+
+    await crud.event.remove(db_session, id=event.id)
+    refreshed = await freebusy.get_index(db_session, USER_ID, DAY_START, DAY_END)
+    assert refreshed.busy_between(DAY_START, DAY_END) == []
+    freebusy.clear()
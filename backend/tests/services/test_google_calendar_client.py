@@ -0,0 +1,101 @@
+import asyncio
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app.services.calendar_sync.google import GoogleCalendarService
+from app.services.calendar_sync.http import calendar_http
+from tests.helpers import JsonHandler
+
+RESPONSE_DELAY = 0.25  # Seconds the stub takes per call; a blocking client stalls the loop this long
+USERS = 40
+
+
+class StubCalendarHandler(JsonHandler):
+    """Slow local Calendar API: one page per user, 401 for the token 'expired'."""
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        time.sleep(RESPONSE_DELAY)
+        if self.headers["Authorization"] == "Bearer expired":
+            return self.send_json(401, {"error": {"message": "Invalid Credentials"}})
+        user = self.headers["Authorization"].split()[-1]
+        query = parse_qs(urlparse(self.path).query)
+        assert query["singleEvents"] == ["true"]
+        self.send_json(200, {
+            "items": [{
+                "id": f"{user}-event",
+                "summary": "Standup",
+                "start": {"dateTime": "2026-01-19T09:00:00Z"},
+                "end": {"dateTime": "2026-01-19T09:15:00Z"},
+            }],
+            "nextSyncToken": f"{user}-token",
+        })
+
+    def do_POST(self):
+        # OAuth token endpoint
+        self.read_body()
+        self.send_json(200, {"access_token": "refreshed", "expires_in": 3600})
+
+
+@pytest.fixture
+def stub_api(stub_server):
+    server = stub_server(StubCalendarHandler, {"GOOGLE_CALENDAR_API_URL": ""}, connections=set())
+    return server, server.url
+
+
+@pytest.mark.asyncio
+async def test_syncing_many_users_keeps_the_loop_responsive(stub_api):
+    calendar_http.get()  # Built once per process; loading CA certificates is a one-off cost
+    services = [GoogleCalendarService({"token": f"user{i}"}) for i in range(USERS)]
+    ticks = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        while not done.is_set():
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.005)
+
+    beat = asyncio.create_task(heartbeat())
+    start = time.perf_counter()
+    results = await asyncio.gather(*(service.list_changes() for service in services))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await beat
+
+    assert [token for _, token in results] == [f"user{i}-token" for i in range(USERS)]
+    # Calls overlap instead of running back to back...
+    assert elapsed < USERS * RESPONSE_DELAY / 4
+    # ...and the loop keeps running while they wait on the network
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < RESPONSE_DELAY
+    await calendar_http.aclose()
+
+
+@pytest.mark.asyncio
+async def test_services_share_pooled_connections(stub_api):
+    server, _ = stub_api
+    for i in range(5):
+        await GoogleCalendarService({"token": f"user{i}"}).list_changes()
+
+    assert len(server.connections) == 1
+    await calendar_http.aclose()
+
+
+@pytest.mark.asyncio
+async def test_expired_access_token_is_refreshed_once(stub_api):
+    _, url = stub_api
+    service = GoogleCalendarService({
+        "token": "expired",
+        "refresh_token": "refresh",
+        "client_id": "client",
+        "client_secret": "secret",
+        "token_uri": f"{url}/token",
+    })
+
+    events, token = await service.list_changes()
+
+    assert service.credentials["token"] == "refreshed"
+    assert token == "refreshed-token"
+    assert events[0]["external_id"] == "refreshed-event"
+    await calendar_http.aclose()
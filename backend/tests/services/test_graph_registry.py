@@ -0,0 +1,34 @@
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.services.ai_pipeline.graph import (
+    HITL_INTERRUPT_BEFORE,
+    clear_compiled_apps,
+    get_compiled_app,
+)
+
+
+@pytest.mark.asyncio
+async def test_compiled_app_is_reused():
+    """Same configuration returns the same compiled graph."""
+    clear_compiled_apps()
+    checkpointer = MemorySaver()
+
+    first = get_compiled_app("hitl", checkpointer, HITL_INTERRUPT_BEFORE)
+    second = get_compiled_app("hitl", checkpointer, HITL_INTERRUPT_BEFORE)
+
+    assert first is second
+
+
+@pytest.mark.asyncio
+async def test_compiled_app_keyed_by_configuration():
+    """Different checkpointers or interrupts get their own compiled graph."""
+    clear_compiled_apps()
+    checkpointer = MemorySaver()
+
+    hitl = get_compiled_app("hitl", checkpointer, HITL_INTERRUPT_BEFORE)
+    no_interrupt = get_compiled_app("hitl", checkpointer, ())
+    other_saver = get_compiled_app("hitl", MemorySaver(), HITL_INTERRUPT_BEFORE)
+
+    assert hitl is not no_interrupt
+    assert hitl is not other_saver
@@ -0,0 +1,69 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.cache import ResponseCache
+from app.services.ai_pipeline.graph import process_task, scheduling_variant
+from app.services.ai_pipeline.nodes import analyze, schedule
+
+ANALYSIS = {"estimated_duration_minutes": 60, "suggested_tags": ["work"], "reasoning": "Counted"}
+
+
+class CountingLLM:
+    """Canned answers, recording which node each call came from."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def ainvoke(self, messages):
+        node = "schedule" if "AI scheduler" in messages[0].content else "analyze"
+        self.calls.append(node)
+        # An empty ranking keeps the slot finder's candidates as they are
+        return SimpleNamespace(content=json.dumps(ANALYSIS if node == "analyze" else {"options": []}))
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    llm = CountingLLM()
+    monkeypatch.setattr(analyze, "get_llm", lambda temperature=0: llm)
+    monkeypatch.setattr(schedule, "get_llm", lambda temperature=0: llm)
+    monkeypatch.setattr(analyze, "analysis_cache", ResponseCache(namespace="test", enabled=False))
+    return llm
+
+
+def task_data(**overrides):
+    return {"task_id": "t1", "user_id": "u1", "title": "Write report", "priority": "high", **overrides}
+
+
+@pytest.mark.asyncio
+async def test_analyze_variant_skips_scheduling(llm):
+    result = await process_task(task_data(), variant="analyze")
+
+    assert llm.calls == ["analyze"]
+    assert result["estimated_duration_minutes"] == 60
+    assert not result.get("scheduling_options")
+
+
+@pytest.mark.asyncio
+async def test_stored_duration_routes_to_schedule_only(llm):
+    data = task_data(estimated_duration_minutes=90)
+    assert scheduling_variant(data) == "schedule"
+
+    result = await process_task(data, variant=scheduling_variant(data))
+
+    assert llm.calls == ["schedule"]
+    assert result["estimated_duration_minutes"] == 90
+    assert len(result["scheduling_options"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_missing_duration_runs_the_full_pipeline(llm):
+    data = task_data(estimated_duration_minutes=None)
+    assert scheduling_variant(data) == "full"
+
+    result = await process_task(data, variant=scheduling_variant(data))
+
+    assert llm.calls == ["analyze", "schedule"]
+    assert result["estimated_duration_minutes"] == 60
+    assert result["scheduling_options"]
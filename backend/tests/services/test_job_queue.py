@@ -0,0 +1,193 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.services.job_queue.backends import DatabaseJobBackend, InMemoryJobBackend, Job
+from app.services.job_queue.queue import AIJobQueue, QueueFullError
+
+
+def make_queue(**kwargs) -> AIJobQueue:
+    kwargs.setdefault("retry_backoff_seconds", 0)
+    return AIJobQueue(InMemoryJobBackend(), lane_weights={"pro": 3, "free": 1}, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_lanes_follow_weighted_round_robin():
+    queue = make_queue()
+    order = []
+
+    async def handler(job):
+        order.append(job.payload["n"])
+
+    queue.register("run", handler)
+    for n in range(4):
+        await queue.enqueue("run", {"n": f"free-{n}"}, tier="free")
+    for n in range(4):
+        await queue.enqueue("run", {"n": f"pro-{n}"}, tier="pro")
+
+    await queue.run_until_idle()
+
+    assert order[:4] == ["pro-0", "pro-1", "pro-2", "free-0"]
+    assert sorted(order) == sorted([f"free-{n}" for n in range(4)] + [f"pro-{n}" for n in range(4)])
+
+
+@pytest.mark.asyncio
+async def test_unknown_tier_uses_default_lane():
+    queue = make_queue()
+    queue.register("run", lambda job: asyncio.sleep(0))
+
+    job = await queue.enqueue("run", {}, tier="enterprise-trial")
+
+    assert job.lane == "free"
+
+
+@pytest.mark.asyncio
+async def test_queue_position_counts_jobs_ahead_in_lane():
+    queue = make_queue()
+    queue.register("run", lambda job: asyncio.sleep(0))
+
+    first = await queue.enqueue("run", {}, tier="free")
+    await asyncio.sleep(0.001)
+    second = await queue.enqueue("run", {}, tier="free")
+    other_lane = await queue.enqueue("run", {}, tier="pro")
+
+    assert await queue.position(first) == 0
+    assert await queue.position(second) == 1
+    assert await queue.position(other_lane) == 0
+
+
+@pytest.mark.asyncio
+async def test_enqueue_rejects_when_backlog_is_full():
+    queue = make_queue(max_pending=2)
+    queue.register("run", lambda job: asyncio.sleep(0))
+
+    await queue.enqueue("run", {})
+    await queue.enqueue("run", {})
+    with pytest.raises(QueueFullError):
+        await queue.enqueue("run", {})
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_then_marked_failed():
+    queue = make_queue(max_attempts=3)
+    attempts = []
+
+    async def handler(job):
+        attempts.append(job.is_last_attempt)
+        raise RuntimeError("ollama down")
+
+    queue.register("run", handler)
+    await queue.enqueue("run", {}, tier="pro")
+    await queue.run_until_idle()
+
+    assert attempts == [False, False, True]
+    stats = await queue.stats()
+    assert stats["lanes"]["pro"]["retried"] == 2
+    assert stats["lanes"]["pro"]["failed"] == 1
+    assert stats["lanes"]["pro"]["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_workers_bound_in_flight_jobs():
+    queue = make_queue(workers=2, poll_seconds=0.01)
+    running = 0
+    peak = 0
+
+    async def handler(job):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    queue.register("run", handler)
+    for _ in range(6):
+        await queue.enqueue("run", {})
+    await queue.start()
+    for _ in range(100):
+        if (await queue.stats())["lanes"]["free"]["completed"] == 6:
+            break
+        await asyncio.sleep(0.01)
+    await queue.stop()
+
+    assert peak == 2
+    assert (await queue.stats())["lanes"]["free"]["completed"] == 6
+
+
+@pytest.mark.asyncio
+async def test_database_backend_claims_once_and_recovers(tmp_path):
+    # File-backed so every backend session sees the same database
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    backend = DatabaseJobBackend(sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    job = Job(kind="run", lane="pro", payload={"thread_id": "t1"})
+    await backend.add(job)
+
+    now = datetime.now(timezone.utc) + timedelta(seconds=1)
+    lease_until = now + timedelta(seconds=60)
+    claimed = await backend.claim("pro", now, lease_until)
+    assert claimed.id == job.id
+    assert claimed.payload == {"thread_id": "t1"}
+    assert claimed.available_at.tzinfo is not None  # Read back from SQLite as aware UTC
+    assert await backend.claim("pro", now, lease_until) is None
+
+    # The worker is still heartbeating: its job is left alone
+    assert await backend.recover(now) == 0
+    assert await backend.heartbeat(claimed, now, lease_until + timedelta(seconds=30))
+    assert await backend.recover(lease_until + timedelta(seconds=1)) == 0
+
+    # The worker died mid-run: once the lease runs out the job goes back to the queue
+    assert await backend.recover(lease_until + timedelta(seconds=31)) == 1
+    assert await backend.pending_counts() == {"pro": 1}
+    assert not await backend.heartbeat(claimed, now, lease_until)
+
+    claimed = await backend.claim("pro", now, lease_until)
+    await backend.fail(claimed, "boom", retry_at=None)
+    assert await backend.pending_counts() == {}
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_database_backed_queue_runs_jobs(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    backend = DatabaseJobBackend(sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    queue = AIJobQueue(backend, lane_weights={"pro": 3, "free": 1})
+    done = []
+
+    async def handler(job):
+        done.append(job.payload["n"])
+
+    queue.register("run", handler)
+    await queue.enqueue("run", {"n": 1}, tier="pro")
+    await queue.run_until_idle()
+
+    assert done == [1]
+    stats = await queue.stats()
+    assert stats["lanes"]["pro"]["completed"] == 1 and stats["lanes"]["pro"]["failed"] == 0
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_running_job_renews_its_lease():
+    queue = make_queue(lease_seconds=0.03)
+    leases = []
+
+    async def handler(job):
+        for _ in range(5):
+            await asyncio.sleep(0.02)
+            leases.append(queue.backend._jobs[job.id].lease_expires_at)
+
+    queue.register("run", handler)
+    await queue.enqueue("run", {})
+    await queue.run_until_idle()
+
+    # Renewed every lease_seconds / 3, so it never lapsed while the job ran
+    assert len(set(leases)) > 1
+    assert (await queue.stats())["lanes"]["free"]["completed"] == 1
@@ -0,0 +1,35 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.ai_pipeline.llm_factory import MockLLM, ainvoke_llm
+
+
+class SlowAsyncLLM:
+    async def ainvoke(self, messages):
+        await asyncio.sleep(5)
+
+
+class ThreadRecordingLLM(MockLLM):
+    def invoke(self, prompt):
+        self.thread = threading.current_thread()
+        return super().invoke(prompt)
+
+
+@pytest.mark.asyncio
+async def test_sync_client_runs_off_the_event_loop():
+    """Sync-only clients are offloaded to a worker thread."""
+    llm = ThreadRecordingLLM()
+
+    response = await ainvoke_llm(llm, "estimated duration")
+
+    assert "estimated_duration_minutes" in response.content
+    assert llm.thread is not threading.main_thread()
+
+
+@pytest.mark.asyncio
+async def test_llm_call_times_out():
+    """Calls exceeding the timeout are cancelled."""
+    with pytest.raises(asyncio.TimeoutError):
+        await ainvoke_llm(SlowAsyncLLM(), [], timeout=0.05)
@@ -0,0 +1,59 @@
+import pytest
+
+from app.services.ai_pipeline.llm_factory import LLMClientPool, LLMUnavailableError
+
+
+class StubClient:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(retry_after_seconds: float = 30) -> LLMClientPool:
+    pool = LLMClientPool(retry_after_seconds=retry_after_seconds)
+    pool._create = lambda model, base_url, temperature: StubClient()
+    return pool
+
+
+def test_pool_reuses_client_per_configuration():
+    """One client per (model, base_url, temperature)."""
+    pool = make_pool()
+
+    first = pool.get("model-a", "http://ollama:11434", 0)
+    second = pool.get("model-a", "http://ollama:11434", 0)
+    warmer = pool.get("model-a", "http://ollama:11434", 0.7)
+
+    assert first is second
+    assert first is not warmer
+
+
+def test_unhealthy_client_is_skipped_until_cool_down():
+    """A failed client raises LLMUnavailableError while cooling down; no stand-in is served."""
+    pool = make_pool(retry_after_seconds=60)
+    client = pool.get("model-a", "http://ollama:11434", 0)
+
+    pool.record_failure(client, RuntimeError("connection refused"))
+
+    with pytest.raises(LLMUnavailableError, match="connection refused"):
+        pool.get("model-a", "http://ollama:11434", 0)
+    health = pool.health()[0]
+    assert health["healthy"] is False
+    assert health["failures"] == 1
+    assert "connection refused" in health["last_error"]
+
+    pool.retry_after_seconds = 0
+    assert pool.get("model-a", "http://ollama:11434", 0) is client
+
+
+@pytest.mark.asyncio
+async def test_pool_close_releases_clients():
+    """Shutdown closes and forgets every client."""
+    pool = make_pool()
+    client = pool.get("model-a", "http://ollama:11434", 0)
+
+    await pool.aclose()
+
+    assert client.closed
+    assert pool.health() == []
@@ -0,0 +1,89 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.cache import ResponseCache
+from app.core.config import settings
+from app.services.ai_pipeline.graph import process_task, stream_task
+from app.services.ai_pipeline.nodes import analyze
+from app.services.ai_pipeline.streaming import JsonObjectScanner
+
+ANSWER = json.dumps({"estimated_duration_minutes": 45, "suggested_tags": ["{x}"], "reasoning": "Says \"}\""})
+
+
+class StreamingLLM:
+    """Reasoning-model shaped output: a <think> block, the JSON answer, then trailing tokens."""
+
+    def __init__(self, trailing=50):
+        self.chunks = ["<th", "ink>Maybe {30} minutes", "?</think>\n```json\n"]
+        self.chunks += [ANSWER[i:i + 7] for i in range(0, len(ANSWER), 7)]
+        self.chunks += ["\n```\n"] + ["More text. "] * trailing
+        self.sent = 0
+        self.closed = False
+        self.invokes = 0
+
+    async def astream(self, messages):
+        try:
+            for chunk in self.chunks:
+                await asyncio.sleep(0)
+                self.sent += 1
+                yield SimpleNamespace(content=chunk)
+        finally:
+            self.closed = True
+
+    async def ainvoke(self, messages):
+        self.invokes += 1
+        return SimpleNamespace(content="".join(self.chunks))
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    llm = StreamingLLM()
+    monkeypatch.setattr(analyze, "get_llm", lambda temperature=0: llm)
+    monkeypatch.setattr(analyze, "analysis_cache", ResponseCache(namespace="test", enabled=False))
+    return llm
+
+
+def test_scanner_finds_the_object_across_chunks():
+    scanner = JsonObjectScanner()
+    text = '<think>{"draft": 1}</think>```json\n{"a": "}{", "b": [1, {"c": "\\"}"}]} trailing {"x": 2}'
+    results = [scanner.feed(text[i:i + 3]) for i in range(0, len(text), 3)]
+
+    completed = [result for result in results if result is not None]
+    assert json.loads(completed[0]) == {"a": "}{", "b": [1, {"c": '"}'}]}
+    assert scanner.result == completed[0]
+
+
+def test_scanner_waits_for_a_split_think_tag():
+    scanner = JsonObjectScanner()
+    assert scanner.feed("<thi") is None
+    assert scanner.feed('nk>{"no": 1}</thi') is None
+    assert scanner.feed('nk>{"yes": 1}') == '{"yes": 1}'
+
+
+@pytest.mark.asyncio
+async def test_generation_stops_once_the_answer_is_complete(llm):
+    events = [event async for event in stream_task({"task_id": "t1", "user_id": "u1", "title": "Report"}, "analyze")]
+
+    tokens = [data for kind, data in events if kind == "token"]
+    kind, result = events[-1]
+    assert kind == "result"
+    assert result["estimated_duration_minutes"] == 45
+    assert result["suggested_tags"] == ["{x}"]
+    assert tokens[0] == {"node": "analyze", "text": "<th"}
+    # The trailing tokens were never generated: the model's stream was closed
+    assert llm.closed and llm.sent < len(llm.chunks) - 40
+    assert len(tokens) == llm.sent
+
+
+@pytest.mark.asyncio
+async def test_streaming_can_be_disabled(llm, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_STREAMING_ENABLED", False)
+
+    result = await process_task({"task_id": "t1", "user_id": "u1", "title": "Report"}, variant="analyze")
+
+    # One blocking call for the whole output, <think> block and trailing text included
+    assert llm.invokes == 1 and llm.sent == 0
+    assert result["estimated_duration_minutes"] == 45
@@ -0,0 +1,168 @@
+import json
+from datetime import datetime
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app.core.config import settings
+from app.models.event import CalendarEvent
+from app.services.calendar_sync.http import calendar_http
+from app.services.calendar_sync.microsoft import MicrosoftCalendarService
+from app.services.calendar_sync.sync import push_events, sync_calendar
+from app.services.scheduling.freebusy import freebusy
+from tests.helpers import USER_ID, JsonHandler, seed_integration, stored_events
+
+
+def graph_event(event_id, hour, subject="Meeting"):
+    return {
+        "id": event_id,
+        "subject": subject,
+        "start": {"dateTime": f"2026-01-19T{hour:02d}:00:00.0000000", "timeZone": "UTC"},
+        "end": {"dateTime": f"2026-01-19T{hour + 1:02d}:00:00.0000000", "timeZone": "UTC"},
+    }
+
+
+class StubGraphHandler(JsonHandler):
+    """Local Microsoft Graph: calendarView (+delta) pages and $batch."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.server.calls.append((url.path, query, self.headers["Prefer"]))
+        base = f"http://127.0.0.1:{self.server.server_port}{url.path}"
+        pages = self.server.delta_pages
+
+        if url.path == "/me/calendarView":
+            page = int(query.get("$skip", 0))
+            body = {"value": [graph_event(f"view-{page}", 9 + page)]}
+            if page == 0:
+                body["@odata.nextLink"] = f"{base}?$select={query['$select']}&$skip=1"
+            return self.send_json(200, body)
+
+        token = query.get("$deltatoken") or query.get("$skiptoken") or "initial"
+        if token in self.server.expired:
+            return self.send_json(410, {"error": {"code": "SyncStateNotFound", "message": "Resync required"}})
+        value, link = pages[token]
+        kind = "@odata.deltaLink" if link.startswith("delta-") else "@odata.nextLink"
+        param = "$deltatoken" if kind == "@odata.deltaLink" else "$skiptoken"
+        self.send_json(200, {"value": value, kind: f"{base}?{param}={link}"})
+
+    def do_POST(self):
+        requests = json.loads(self.read_body())["requests"]
+        self.server.batches.append(requests)
+        responses = []
+        for request in reversed(requests):  # Graph may answer in any order
+            if request["url"].endswith("/missing"):
+                responses.append({"id": request["id"], "status": 404,
+                                  "body": {"error": {"code": "ErrorItemNotFound", "message": "Not found"}}})
+            elif request["method"] == "POST":
+                created = f"ms-{len(self.server.batches)}-{request['id']}"
+                responses.append({"id": request["id"], "status": 201, "body": {"id": created}})
+            else:
+                responses.append({"id": request["id"], "status": 200, "body": {"id": request["url"].split("/")[-1]}})
+        self.send_json(200, {"responses": responses})
+
+
+@pytest.fixture
+def stub_graph(stub_server, monkeypatch):
+    server = stub_server(
+        StubGraphHandler,
+        {"MICROSOFT_GRAPH_API_URL": ""},
+        calls=[],
+        batches=[],
+        expired=set(),
+        delta_pages={
+            # token -> (events, next skiptoken or "delta-..." for the final page)
+            "initial": ([graph_event("a", 9), graph_event("b", 11)], "page-2"),
+            "page-2": ([graph_event("c", 14)], "delta-1"),
+        },
+    )
+    monkeypatch.setattr(settings, "MICROSOFT_GRAPH_PAGE_SIZE", 2)
+    return server
+
+
+@pytest.mark.asyncio
+async def test_delta_sync_follows_pages_and_persists_delta_link(db_session, stub_graph):
+    integration = await seed_integration(db_session, "microsoft")
+
+    result = await sync_calendar(db_session, integration)
+
+    assert result == {"status": "synced", "events_synced": 3, "events_deleted": 0}
+    assert await stored_events(db_session) == {"a": "Meeting", "b": "Meeting", "c": "Meeting"}
+    assert integration.sync_token.endswith("$deltatoken=delta-1")
+    first_path, first_query, prefer = stub_graph.calls[0]
+    assert first_path == "/me/calendarView/delta"
+    assert {"startDateTime", "endDateTime"} <= set(first_query)
+    assert "odata.maxpagesize=2" in prefer and 'outlook.timezone="UTC"' in prefer
+    assert len(stub_graph.calls) == 2
+
+    # The stored delta link returns only what changed
+    stub_graph.delta_pages["delta-1"] = (
+        [graph_event("a", 15, subject="Moved"), {"id": "b", "@removed": {"reason": "deleted"}}],
+        "delta-2",
+    )
+    result = await sync_calendar(db_session, integration)
+
+    assert result == {"status": "synced", "events_synced": 1, "events_deleted": 1}
+    assert await stored_events(db_session) == {"a": "Moved", "c": "Meeting"}
+    assert integration.sync_token.endswith("$deltatoken=delta-2")
+
+    # An expired delta link falls back to a full sync of the window
+    stub_graph.expired.add("delta-2")
+    result = await sync_calendar(db_session, integration)
+
+    assert result["status"] == "resynced"
+    assert await stored_events(db_session) == {"a": "Meeting", "b": "Meeting", "c": "Meeting"}
+    freebusy.clear()
+    await calendar_http.aclose()
+
+
+@pytest.mark.asyncio
+async def test_list_events_selects_fields_and_follows_next_link(stub_graph):
+    events = await MicrosoftCalendarService("access").list_events(
+        datetime(2026, 1, 19), datetime(2026, 1, 20)
+    )
+
+    assert [event["external_id"] for event in events] == ["view-0", "view-1"]
+    assert events[0]["start_time"] == datetime(2026, 1, 19, 9)
+    assert all(query["$select"] == MicrosoftCalendarService.EVENT_FIELDS for _, query, _ in stub_graph.calls)
+    await calendar_http.aclose()
+
+
+@pytest.mark.asyncio
+async def test_push_uses_json_batching(db_session, stub_graph):
+    integration = await seed_integration(db_session, "microsoft")
+    events = [
+        CalendarEvent(
+            user_id=USER_ID,
+            title=f"Block {i}",
+            start_time=datetime(2026, 1, 19, 9, i),
+            end_time=datetime(2026, 1, 19, 9, i + 1),
+            source="microsoft" if i < 5 else "planner",
+            external_id=("missing" if i == 0 else f"existing-{i}") if i < 5 else None,
+        )
+        for i in range(45)
+    ]
+    db_session.add_all(events)
+    await db_session.commit()
+    first_id = events[0].id
+
+    result = await push_events(db_session, integration, events)
+
+    assert [len(batch) for batch in stub_graph.batches] == [20, 20, 5]
+    assert stub_graph.batches[0][1]["method"] == "PATCH"
+    assert stub_graph.batches[0][5] == {
+        "id": "5",
+        "method": "POST",
+        "url": "/me/events",
+        "headers": {"Content-Type": "application/json"},
+        "body": {
+            "subject": "Block 5",
+            "start": {"dateTime": "2026-01-19T09:05:00", "timeZone": "UTC"},
+            "end": {"dateTime": "2026-01-19T09:06:00", "timeZone": "UTC"},
+        },
+    }
+    assert result["events_written"] == 44
+    assert result["errors"] == [{"event_id": first_id, "error": "Not found"}]
+    assert (await stored_events(db_session))["ms-1-5"] == "Block 5"
+    await calendar_http.aclose()
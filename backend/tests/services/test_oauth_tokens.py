@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import partial
+
+import pytest
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.user import UserIntegration
+from app.services.calendar_sync.google import GoogleCalendarService
+from app.services.calendar_sync.http import calendar_http
+from app.services.calendar_sync.sync import google_credentials, sync_calendar
+from app.services.calendar_sync.tokens import OAuthTokenManager
+from tests.helpers import USER_ID, JsonHandler, seed_integration
+
+BURST = 20
+REFRESH_DELAY = 0.1  # Long enough for the whole burst to arrive mid-refresh
+
+
+class StubOAuthHandler(JsonHandler):
+    """Token endpoint plus a Calendar API that only accepts the latest issued token."""
+
+    def do_POST(self):
+        self.read_body()
+        time.sleep(REFRESH_DELAY)
+        with self.server.lock:
+            self.server.refreshes += 1
+            self.server.valid_token = f"fresh-{self.server.refreshes}"
+        self.send_json(200, {"access_token": self.server.valid_token, "expires_in": 3600})
+
+    def do_GET(self):
+        if self.headers["Authorization"] != f"Bearer {self.server.valid_token}":
+            return self.send_json(401, {"error": {"message": "Invalid Credentials"}})
+        self.send_json(200, {"items": [], "nextSyncToken": "sync-1"})
+
+
+@pytest.fixture
+def stub_oauth(stub_server, monkeypatch):
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", "client")
+    return stub_server(
+        StubOAuthHandler,
+        {"GOOGLE_CALENDAR_API_URL": "", "GOOGLE_TOKEN_URL": "/token"},
+        lock=threading.Lock(),
+        refreshes=0,
+        valid_token="valid",
+    )
+
+
+@pytest.fixture
+def database(session_factory):
+    # The burst's sessions run concurrently on the file database; count integration UPDATEs
+    updates = []
+
+    def count_updates(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE user_integrations"):
+            updates.append(statement)
+
+    engine = session_factory.kw["bind"].sync_engine
+    event.listen(engine, "before_cursor_execute", count_updates)
+    yield session_factory, updates
+    event.remove(engine, "before_cursor_execute", count_updates)
+
+
+async def seed(session_factory, access_token, expires_at):
+    async with session_factory() as db:
+        await seed_integration(
+            db, "google", access_token=access_token, refresh_token="refresh", expires_at=expires_at
+        )
+
+
+async def load(session_factory):
+    async with session_factory() as db:
+        return await db.get(UserIntegration, (USER_ID, "google"))
+
+
+@pytest.mark.asyncio
+async def test_burst_of_syncs_refreshes_an_expired_token_once(stub_oauth, database):
+    session_factory, updates = database
+    await seed(session_factory, "expired", datetime.utcnow() - timedelta(minutes=5))
+    tokens = OAuthTokenManager(session_factory=session_factory)
+
+    async def one_sync():
+        async with session_factory() as db:
+            integration = await db.get(UserIntegration, (USER_ID, "google"))
+            service = GoogleCalendarService(
+                google_credentials(integration), tokens=partial(tokens.access_token, integration)
+            )
+            return await sync_calendar(db, integration, service)
+
+    results = await asyncio.gather(*(one_sync() for _ in range(BURST)))
+
+    assert all(result["status"] == "synced" for result in results)
+    assert stub_oauth.refreshes == 1
+    assert tokens.refreshes == 1
+    assert len(updates) - BURST == 1  # One token write-back; the rest store each sync's cursor
+    stored = await load(session_factory)
+    assert stored.access_token == "fresh-1"
+    assert stored.expires_at > datetime.utcnow() + timedelta(minutes=55)
+    await calendar_http.aclose()
+
+
+@pytest.mark.asyncio
+async def test_rejected_token_is_refreshed_once_for_concurrent_callers(stub_oauth, database):
+    session_factory, updates = database
+    # Looks valid locally, but the provider has revoked it
+    await seed(session_factory, "revoked", datetime.utcnow() + timedelta(hours=1))
+    integration = await load(session_factory)
+    tokens = OAuthTokenManager(session_factory=session_factory)
+    services = [
+        GoogleCalendarService(google_credentials(integration), tokens=partial(tokens.access_token, integration))
+        for _ in range(BURST)
+    ]
+
+    results = await asyncio.gather(*(service.list_changes() for service in services))
+
+    assert [token for _, token in results] == ["sync-1"] * BURST
+    assert stub_oauth.refreshes == 1
+    assert len(updates) == 1
+    await calendar_http.aclose()
+
+
+@pytest.mark.asyncio
+async def test_token_is_cached_until_the_refresh_margin(stub_oauth, database):
+    session_factory, updates = database
+    await seed(session_factory, "valid", datetime.utcnow() + timedelta(minutes=10))
+    integration = await load(session_factory)
+
+    relaxed = OAuthTokenManager(session_factory=session_factory, refresh_margin_seconds=300)
+    assert [await relaxed.access_token(integration) for _ in range(3)] == ["valid"] * 3
+    assert relaxed.hits == 2 and stub_oauth.refreshes == 0
+
+    # Expiring within the margin counts as expired
+    eager = OAuthTokenManager(session_factory=session_factory, refresh_margin_seconds=900)
+    assert await eager.access_token(integration) == "fresh-1"
+    assert integration.access_token == "fresh-1"
+    assert len(updates) == 1
+    await calendar_http.aclose()
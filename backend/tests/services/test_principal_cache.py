@@ -0,0 +1,49 @@
+import pytest
+from fastapi import HTTPException
+
+from app import crud
+from app.core import security
+from app.core.principal import Principal, principal_cache
+from app.models.user import User
+
+
+@pytest.fixture(autouse=True)
+def empty_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_principal_is_loaded_once_then_cached(db_session, statements):
+    db_session.add(User(id="u1", email="cached@example.com", subscription_tier="pro"))
+    await db_session.commit()
+    statements.clear()
+
+    first = await security.get_current_principal(db=db_session, user_id="u1")
+    second = await security.get_current_principal(db=db_session, user_id="u1")
+
+    assert statements == ["SELECT"]
+    assert first == second == Principal(id="u1", email="cached@example.com", subscription_tier="pro")
+
+
+@pytest.mark.asyncio
+async def test_user_writes_invalidate_the_principal(db_session):
+    user = User(id="u1", email="tier@example.com")
+    db_session.add(user)
+    await db_session.commit()
+    assert (await security.get_current_principal(db=db_session, user_id="u1")).subscription_tier == "free"
+
+    # Through CRUDUser (targeted UPDATE statement)
+    await crud.user.update(db=db_session, db_obj=user, obj_in={"subscription_tier": "pro"})
+    assert (await security.get_current_principal(db=db_session, user_id="u1")).subscription_tier == "pro"
+
+    # Through an ORM flush
+    user.subscription_tier = "free"
+    await db_session.commit()
+    assert (await security.get_current_principal(db=db_session, user_id="u1")).subscription_tier == "free"
+
+    await crud.user.remove(db=db_session, id="u1")
+    with pytest.raises(HTTPException) as exc:
+        await security.get_current_principal(db=db_session, user_id="u1")
+    assert exc.value.status_code == 404
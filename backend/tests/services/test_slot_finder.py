@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import pytest
+
+from app.services.ai_pipeline.nodes.schedule import schedule_task
+from app.services.ai_pipeline.state import TaskAnalysisState
+from app.services.scheduling.slot_finder import find_free_slots, merge_intervals
+
+# Monday 2026-01-19
+MONDAY = datetime(2026, 1, 19, 8, 0)
+
+
+def test_merge_intervals_merges_overlaps_and_sorts():
+    intervals = [
+        (datetime(2026, 1, 19, 13), datetime(2026, 1, 19, 14)),
+        (datetime(2026, 1, 19, 9), datetime(2026, 1, 19, 10)),
+        (datetime(2026, 1, 19, 9, 30), datetime(2026, 1, 19, 11)),
+        (datetime(2026, 1, 19, 11), datetime(2026, 1, 19, 12)),
+    ]
+
+    assert merge_intervals(intervals) == [
+        (datetime(2026, 1, 19, 9), datetime(2026, 1, 19, 12)),
+        (datetime(2026, 1, 19, 13), datetime(2026, 1, 19, 14)),
+    ]
+
+
+def test_slots_avoid_busy_time_and_stay_in_work_hours():
+    events = [
+        {"start_time": "2026-01-19T09:00:00", "end_time": "2026-01-19T10:30:00"},
+        {"start_time": "2026-01-19T11:00:00Z", "end_time": "2026-01-19T17:00:00Z"},
+    ]
+
+    slots = find_free_slots(events, duration_minutes=60, now=MONDAY, max_slots=3)
+
+    assert slots[0] == (datetime(2026, 1, 19, 17), datetime(2026, 1, 19, 18))
+    assert slots[1] == (datetime(2026, 1, 20, 9), datetime(2026, 1, 20, 10))
+    for start, end in slots:
+        assert 9 <= start.hour and end.hour <= 18
+        assert start.weekday() < 5
+
+
+def test_slots_respect_deadline():
+    deadline = datetime(2026, 1, 19, 12)
+    events = [{"start_time": "2026-01-19T09:00:00", "end_time": "2026-01-19T11:30:00"}]
+
+    assert find_free_slots(events, 60, now=MONDAY, deadline=deadline) == []
+    assert find_free_slots(events, 30, now=MONDAY, deadline=deadline) == [
+        (datetime(2026, 1, 19, 11, 30), datetime(2026, 1, 19, 12)),
+    ]
+
+
+def test_weekend_is_skipped():
+    friday_evening = datetime(2026, 1, 23, 19, 0)
+
+    slots = find_free_slots([], 30, now=friday_evening, max_slots=1)
+
+    assert slots == [(datetime(2026, 1, 26, 9), datetime(2026, 1, 26, 9, 30))]
+
+
+@pytest.mark.asyncio
+async def test_schedule_task_returns_free_candidates():
+    """Options always come from the slot finder, whatever the LLM says."""
+    state = TaskAnalysisState(
+        task_id="t1",
+        user_id="u1",
+        title="Write report",
+        estimated_duration_minutes=60,
+        calendar_events=[],
+    )
+
+    result = await schedule_task(state)
+    options = result["scheduling_options"]
+
+    assert [o["option_number"] for o in options] == [1, 2, 3]
+    for option in options:
+        start = datetime.fromisoformat(option["start_time"])
+        end = datetime.fromisoformat(option["end_time"])
+        assert (end - start).total_seconds() == 3600
@@ -0,0 +1,71 @@
+import time
+from datetime import timedelta
+
+import jwt
+import pytest
+
+from app.core.tokens import TokenVerifier
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    calls = []
+    real_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt, "decode", counting_decode)
+    return calls
+
+
+def test_signature_is_verified_once_per_token(decode_calls):
+    verifier = TokenVerifier(default_key="secret")
+    token = verifier.encode("user-1", timedelta(minutes=5))
+
+    assert [verifier.verify(token) for _ in range(3)] == ["user-1"] * 3
+    assert len(decode_calls) == 1
+    assert verifier.stats()["hits"] == 2
+
+
+def test_cache_entry_expires_with_the_token():
+    verifier = TokenVerifier(default_key="secret", max_ttl_seconds=3600)
+    verifier.verify(verifier.encode("user-1", timedelta(seconds=30)))
+
+    (expires_at, _), = verifier._cache._entries.values()
+    assert expires_at - time.monotonic() <= 30
+
+
+def test_invalid_tokens_are_rejected_and_not_cached(decode_calls):
+    verifier = TokenVerifier(default_key="secret")
+    forged = TokenVerifier(default_key="other").encode("user-1", timedelta(minutes=5))
+    expired = verifier.encode("user-1", timedelta(seconds=-1))
+
+    for _ in range(2):
+        with pytest.raises(jwt.InvalidTokenError):
+            verifier.verify(forged)
+        with pytest.raises(jwt.ExpiredSignatureError):
+            verifier.verify(expired)
+    assert len(decode_calls) == 4
+
+
+def test_key_rotation_keeps_cached_tokens_of_live_keys(decode_calls):
+    verifier = TokenVerifier(default_key="legacy", keys={"k1": "one"}, active_kid="k1")
+    old = verifier.encode("user-1", timedelta(minutes=5))
+    verifier.verify(old)
+
+    # Start signing with k2; tokens signed with k1 stay cached
+    verifier.rotate({"k1": "one", "k2": "two"}, active_kid="k2")
+    new = verifier.encode("user-2", timedelta(minutes=5))
+    assert jwt.get_unverified_header(new)["kid"] == "k2"
+    assert verifier.verify(old) == "user-1"
+    assert verifier.verify(new) == "user-2"
+    assert len(decode_calls) == 2
+
+    # Retire k1: its tokens fail, k2 tokens are still served from cache
+    verifier.rotate({"k2": "two"}, active_kid="k2")
+    with pytest.raises(jwt.InvalidTokenError):
+        verifier.verify(old)
+    assert verifier.verify(new) == "user-2"
+    assert len(decode_calls) == 2
@@ -0,0 +1,59 @@
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.api.v1.endpoints import ai
+from app.services.ai_pipeline.events import InProcessEventBroker, format_sse, make_event
+from app.services.ai_pipeline.graph import HITL_INTERRUPT_BEFORE, get_compiled_app
+
+
+@pytest.mark.asyncio
+async def test_broker_delivers_to_subscribers_only():
+    broker = InProcessEventBroker()
+    subscription = await broker.subscribe("thread-1")
+
+    await broker.publish("thread-1", make_event("thread-1", "u1", "node_started", node="analyze"))
+    await broker.publish("thread-2", make_event("thread-2", "u1", "node_started", node="analyze"))
+
+    event = await subscription.get(timeout=1)
+    assert event["node"] == "analyze"
+    assert event["thread_id"] == "thread-1"
+    assert await subscription.get(timeout=0.01) is None
+
+    await subscription.close()
+    assert broker.subscriber_count("thread-1") == 0
+
+
+def test_format_sse_frame():
+    frame = format_sse(make_event("t", "u", "waiting_input", options=[]))
+
+    assert frame.startswith("event: waiting_input\ndata: {")
+    assert frame.endswith("\n\n")
+
+
+@pytest.mark.asyncio
+async def test_background_run_publishes_node_transitions(monkeypatch):
+    broker = InProcessEventBroker()
+    app = get_compiled_app("hitl", MemorySaver(), HITL_INTERRUPT_BEFORE)
+
+    async def get_test_app():
+        return app
+
+    monkeypatch.setattr(ai, "event_broker", broker)
+    monkeypatch.setattr(ai, "get_hitl_app", get_test_app)
+
+    subscription = await broker.subscribe("thread-1")
+    await ai.run_pipeline_background(
+        {"task_id": "t1", "user_id": "u1", "title": "Write report"}, "thread-1"
+    )
+
+    events = []
+    while (event := await subscription.get(timeout=0.01)) is not None:
+        events.append((event["event"], event.get("node")))
+
+    assert events == [
+        ("node_started", "analyze"),
+        ("node_finished", "analyze"),
+        ("node_started", "schedule"),
+        ("node_finished", "schedule"),
+        ("waiting_input", None),
+    ]